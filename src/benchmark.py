@@ -0,0 +1,208 @@
+import os
+import sys
+import copy
+import glob
+import json
+import time
+import fnmatch
+import getopt
+import platform
+import resource
+import traceback
+import multiprocessing
+
+import generate_configuration
+from model_builder import config_options, create_config
+
+
+# Thumb clusters benchmarked on top of configs/default.json.
+THUMB_STYLES = ['DEFAULT', 'MINI', 'CARBONFET', 'MINIDOX', 'TRACKBALL_ORBYL', 'TRACKBALL_CJ']
+
+# A stage regresses when it takes more than threshold (fraction) longer than in the baseline and at least this
+# many seconds more, short stages are mostly noise.  Likewise for a variant's peak memory.
+NOISE_SECONDS = 0.5
+NOISE_MB = 10
+
+
+def benchmark_variants(engines):
+    # [{'name', 'engine', 'config'}, ...]: configs/default.json, the model_builder release matrix and one
+    # variant of default.json per thumb style, each through every engine.
+    with open(os.path.join(r"..", "configs", "default.json"), mode='r') as fid:
+        default = json.load(fid)
+
+    configurations = [dict(default, config_name='default')]
+    for config in create_config(config_options):
+        configurations.append(dict(generate_configuration.shape_config, **config))
+    for thumb_style in THUMB_STYLES:
+        configurations.append(dict(default, config_name='default_{}TMB'.format(thumb_style), thumb_style=thumb_style))
+
+    variants = []
+    for config in configurations:
+        for engine in engines:
+            variant = copy.deepcopy(config)
+            variant['ENGINE'] = engine
+            variant['save_dir'] = variant['config_name']
+            # Every build starts from scratch in a single process, with nothing else writing reports.
+            variant['jobs'] = 1
+            variant['shape_cache_mb'] = 0
+            variant['profile_report'] = None
+            variant['trace_file'] = None
+            variants.append({'name': config['config_name'], 'engine': engine, 'config': variant})
+    return variants
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kB on Linux and in bytes on macOS.  A high-water mark over the whole process, so only
+    # the variant has one, not each stage.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def record_exports(dactyl_manuform, exports):
+    # Route export_file() through a wrapper noting each part's face and solid count and file size.
+    export_file = dactyl_manuform.export_file
+
+    def recorded(shape, fname):
+        export_file(shape=shape, fname=fname)
+        files = [item for item in glob.glob(glob.escape(fname) + '.*') if not item.endswith('.dxf')]
+        fname = max(files, key=os.path.getmtime) if files else fname
+        exports.append({
+            'file': os.path.basename(fname),
+            'bytes': os.path.getsize(fname) if files else None,
+            'faces': dactyl_manuform.face_count(shape),
+            'solids': dactyl_manuform.solid_count(shape),
+        })
+
+    dactyl_manuform.export_file = recorded
+
+
+def stage_result(stage, seconds, exports):
+    return {'stage': stage, 'seconds': seconds, 'exports': exports}
+
+
+def benchmark_variant(variant):
+    # Runs in a fresh worker process: the bootstrap, then each export of run() as a stage of its own.
+    generate_configuration.run_config = variant['config']
+    # spawn hands this script's options to the worker, they are not for the dactyl_manuform bootstrap.
+    del sys.argv[1:]
+    result = {'variant': variant['name'], 'engine': variant['engine'], 'status': 'ok', 'error': None, 'stages': []}
+
+    exports = []
+    start = time.perf_counter()
+    try:
+        import dactyl_manuform
+        result['stages'].append(stage_result('bootstrap', time.perf_counter() - start, []))
+
+        record_exports(dactyl_manuform, exports)
+        for name, kwargs in dactyl_manuform.run_tasks() + [('export_oled', {})]:
+            stage_start = time.perf_counter()
+            getattr(dactyl_manuform, name)(**kwargs)
+            stage = '{}({})'.format(name, ', '.join('{}={}'.format(key, value) for key, value in sorted(kwargs.items())))
+            result['stages'].append(stage_result(stage, time.perf_counter() - stage_start, exports[:]))
+            del exports[:]
+    except Exception:
+        result['status'] = 'failed'
+        result['error'] = traceback.format_exc()
+
+    result['seconds'] = time.perf_counter() - start
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_benchmarks(variants, processes=1):
+    # One fresh interpreter per variant (spawn, maxtasksperchild=1), as model_builder.build_release().  One
+    # process by default, builds running side by side skew each other's times.
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(processes=min(processes, len(variants)), maxtasksperchild=1) as pool:
+        for result in pool.imap(benchmark_variant, variants):
+            print('{status:>6} {seconds:8.1f}s {peak_rss_mb:8.0f}MB  {engine:<8} {variant}'.format(**result))
+            results.append(result)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    # Regressions against a saved results file: a variant that no longer builds or peaking more than threshold
+    # (and NOISE_MB) higher in memory, or a stage taking more than threshold longer (and NOISE_SECONDS more).
+    previous = {(result['variant'], result['engine']): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['variant'], result['engine']))
+        if old is None:
+            continue
+        label = '{} ({})'.format(result['variant'], result['engine'])
+        if old['status'] == 'ok' and result['status'] != 'ok':
+            regressions.append('{} no longer builds'.format(label))
+            continue
+
+        rss, old_rss = result['peak_rss_mb'], old['peak_rss_mb']
+        if rss > old_rss * (1 + threshold) and rss - old_rss > NOISE_MB:
+            regressions.append('{}: peak RSS {:.0f}MB -> {:.0f}MB'.format(label, old_rss, rss))
+
+        old_stages = {stage['stage']: stage for stage in old['stages']}
+        for stage in result['stages']:
+            old_stage = old_stages.get(stage['stage'])
+            if old_stage is None:
+                continue
+            seconds, old_seconds = stage['seconds'], old_stage['seconds']
+            if seconds > old_seconds * (1 + threshold) and seconds - old_seconds > NOISE_SECONDS:
+                regressions.append('{} {}: {:.1f}s -> {:.1f}s'.format(label, stage['stage'], old_seconds, seconds))
+    return regressions
+
+
+if __name__ == '__main__':
+    # python benchmark.py [--engines solid,cadquery] [--only PATTERN] [--jobs N] [--output FILE]
+    #                     [--baseline FILE] [--threshold 0.1]
+    engines = ['solid', 'cadquery']
+    pattern = None
+    processes = 1
+    output = 'benchmark_results.json'
+    baseline = None
+    threshold = 0.1
+
+    opts, args = getopt.getopt(
+        sys.argv[1:], "", ["engines=", "only=", "jobs=", "output=", "baseline=", "threshold="]
+    )
+    for opt, arg in opts:
+        if opt in ('--engines'):
+            engines = arg.split(',')
+        elif opt in ('--only'):
+            pattern = arg
+        elif opt in ('--jobs'):
+            processes = int(arg)
+        elif opt in ('--output'):
+            output = arg
+        elif opt in ('--baseline'):
+            baseline = arg
+        elif opt in ('--threshold'):
+            threshold = float(arg)
+
+    variants = benchmark_variants(engines)
+    if pattern is not None:
+        variants = [variant for variant in variants if fnmatch.fnmatch(variant['name'], pattern)]
+
+    results = run_benchmarks(variants, processes=processes)
+    with open(output, mode='w') as fid:
+        json.dump({
+            'machine': {
+                'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count(),
+            },
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'threshold': threshold,
+            'results': results,
+        }, fid, indent=4)
+    print('RESULTS WRITTEN TO {}'.format(output))
+
+    failed = [result for result in results if result['status'] != 'ok']
+    for result in failed:
+        print('FAILED {} ({})'.format(result['variant'], result['engine']))
+        print(result['error'])
+
+    if baseline is not None:
+        with open(baseline, mode='r') as fid:
+            regressions = compare(results, json.load(fid), threshold)
+        for regression in regressions:
+            print('REGRESSION {}'.format(regression))
+        print('{} regressions against {}'.format(len(regressions), baseline))
+        if regressions:
+            sys.exit(1)
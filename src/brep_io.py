@@ -0,0 +1,103 @@
+import io
+import os
+
+from OCP.BRep import BRep_Builder
+from OCP.BRepTools import BRepTools
+from OCP.IFSelect import IFSelect_RetDone
+from OCP.Interface import Interface_Static
+from OCP.STEPControl import STEPControl_Reader
+from OCP.TopoDS import TopoDS_Compound, TopoDS_Iterator, TopoDS_Shape
+
+from shape_cache import file_digest
+
+# BRep files and bytes and the STEP parts library on bare TopoDS shapes, for both the occ and the cadquery
+# engine.  Both keep their imported parts in the same cache entries, a part cached by either one is read by both.
+
+
+def compound_items(compound):
+    items = []
+    iterator = TopoDS_Iterator(compound)
+    while iterator.More():
+        items.append(iterator.Value())
+        iterator.Next()
+    return items
+
+
+def make_compound(items):
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    for item in items:
+        builder.Add(compound, item)
+    return compound
+
+
+def write_brep(shape, fname):
+    # Write to a temporary name first so concurrent builds never read a partial file.
+    tmp_name = "{}.{}.tmp".format(fname, os.getpid())
+    BRepTools.Write_s(shape, tmp_name)
+    os.replace(tmp_name, fname)
+
+
+def read_brep(fname):
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, fname, BRep_Builder())
+    return shape
+
+
+def serialize_shape(shape):
+    # BRep bytes for handing a shape between processes.
+    if shape is None:
+        return None
+    stream = io.BytesIO()
+    BRepTools.Write_s(shape, stream)
+    return stream.getvalue()
+
+
+def deserialize_shape(data):
+    if data is None:
+        return None
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, io.BytesIO(data), BRep_Builder())
+    return shape
+
+
+def read_step(fname):
+    Interface_Static.SetCVal_s("xstep.cascade.unit", "MM")
+    reader = STEPControl_Reader()
+    if reader.ReadFile(fname) != IFSelect_RetDone:
+        raise ValueError("STEP File could not be loaded")
+    for i in range(reader.NbRootsForTransfer()):
+        reader.TransferRoot(i + 1)
+    return [reader.Shape(i + 1) for i in range(reader.NbShapes())]
+
+
+# Parts library, every STEP file is parsed at most once per process and once per file content on disk.
+parts_library = {}
+
+
+def load_part(fname, cache_dir):
+    cache_path = os.path.join(cache_dir, 'parts')
+    brep_name = os.path.join(
+        cache_path, "{}-{}.brep".format(os.path.splitext(os.path.basename(fname))[0], file_digest(fname)[:16])
+    )
+
+    if os.path.isfile(brep_name):
+        return compound_items(read_brep(brep_name))
+
+    print("IMPORTING FROM {}".format(fname))
+    items = read_step(fname)
+    try:
+        os.makedirs(cache_path, exist_ok=True)
+        write_brep(make_compound(items), brep_name)
+    except OSError as err:
+        print("UNABLE TO CACHE {}: {}".format(fname, err))
+    return items
+
+
+def import_part(fname, cache_dir):
+    # The shapes of a STEP file.  They are never modified in place, the library copies are shared by every caller.
+    fname = os.path.abspath(fname)
+    if fname not in parts_library:
+        parts_library[fname] = load_part(fname, cache_dir)
+    return parts_library[fname]
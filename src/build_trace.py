@@ -0,0 +1,55 @@
+import functools
+import json
+import os
+import time
+
+
+class BuildTrace:
+    # Timeline of a build as Chrome trace events (chrome://tracing, Perfetto): one complete event per call of a
+    # wrapped function, nested by time, one process per build worker.  Spans shorter than min_duration seconds
+    # are dropped, the key placement math would otherwise bury the geometry.
+    def __init__(self, min_duration=1e-4):
+        self.min_duration = min_duration
+        self.events = []
+
+    def reset(self):
+        self.events = []
+
+    def wrap(self, function, category):
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if elapsed >= self.min_duration:
+                    event = {
+                        'name': function.__name__, 'cat': category, 'ph': 'X',
+                        'ts': start * 1e6, 'dur': elapsed * 1e6, 'pid': os.getpid(), 'tid': 0,
+                    }
+                    # Plain arguments (side='left', ...) tell calls apart, shapes would only bloat the file.
+                    arguments = {
+                        str(key): value for key, value in [*enumerate(args), *kwargs.items()]
+                        if isinstance(value, (str, bool, int, float))
+                    }
+                    if arguments:
+                        event['args'] = arguments
+                    self.events.append(event)
+
+        return traced
+
+    def merge(self, events):
+        # Add the events of a worker process.
+        self.events.extend(events)
+
+    def write(self, fname):
+        # perf_counter() is the system-wide monotonic clock, so the worker timelines line up with the parent's.
+        main_pid = os.getpid()
+        names = [
+            {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+             'args': {'name': 'main' if pid == main_pid else 'worker {}'.format(pid)}}
+            for pid in sorted({event['pid'] for event in self.events} | {main_pid})
+        ]
+        with open(fname, mode='w') as fid:
+            json.dump({'traceEvents': names + self.events, 'displayTimeUnit': 'ms'}, fid)
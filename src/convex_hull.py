@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class PointCloud:
+    # Vertices of a shape that only ever ends up in a hull.  Placed like a shape, but as plain NumPy math,
+    # and turned into a solid only when something other than a hull needs it.
+    __slots__ = ('points',)
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+
+
+def rotation_matrix(angle):
+    # Rotations about x, then y, then z, in degrees, as rotate() applies them.
+    ax, ay, az = np.radians(angle)
+    rx = np.array([[1, 0, 0], [0, np.cos(ax), -np.sin(ax)], [0, np.sin(ax), np.cos(ax)]])
+    ry = np.array([[np.cos(ay), 0, np.sin(ay)], [0, 1, 0], [-np.sin(ay), 0, np.cos(ay)]])
+    rz = np.array([[np.cos(az), -np.sin(az), 0], [np.sin(az), np.cos(az), 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+def clip_points(points, level=0.0):
+    # Points whose hull is the hull of points cut off below z = level: the points on or above the plane and
+    # where the segments between points above and below it cross it.  Empty when nothing is above.
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    above = points[points[:, 2] >= level]
+    below = points[points[:, 2] < level]
+    if len(below) == 0 or len(above) == 0:
+        return above
+    t = (above[:, None, 2] - level) / (above[:, None, 2] - below[None, :, 2])
+    crossings = above[:, None, :] + t[..., None] * (below[None, :, :] - above[:, None, :])
+    crossings = crossings.reshape(-1, 3)
+    crossings[:, 2] = level
+    return np.concatenate([above, crossings])
+
+
+def hull_facets(hull_calc, tol=1e-8):
+    # Qhull's triangles merged back into the planar facets they split, each as a loop of point indices.
+    # Neighbouring triangles merge when their plane equations agree within tol (offsets relative to size).
+    scale = max(1.0, np.abs(hull_calc.points).max())
+    equations = hull_calc.equations / [1, 1, 1, scale]
+    group = list(range(len(hull_calc.simplices)))
+
+    def root(i):
+        while group[i] != i:
+            group[i] = group[group[i]]
+            i = group[i]
+        return i
+
+    for i, neighbors in enumerate(hull_calc.neighbors):
+        for j in neighbors:
+            if np.abs(equations[i] - equations[j]).max() <= tol:
+                group[root(i)] = root(j)
+
+    members = {}
+    for i in range(len(group)):
+        members.setdefault(root(i), []).append(i)
+
+    facets = []
+    for triangles in members.values():
+        if len(triangles) == 1:
+            facets.append(list(hull_calc.simplices[triangles[0]]))
+            continue
+
+        # Edges used by a single triangle of the group are the facet outline.
+        edge_count = {}
+        for i in triangles:
+            a, b, c = hull_calc.simplices[i]
+            for edge in ((a, b), (b, c), (c, a)):
+                edge = tuple(sorted(edge))
+                edge_count[edge] = edge_count.get(edge, 0) + 1
+        neighbors = {}
+        for (a, b), count in edge_count.items():
+            if count == 1:
+                neighbors.setdefault(a, []).append(b)
+                neighbors.setdefault(b, []).append(a)
+
+        loop = []
+        if all(len(items) == 2 for items in neighbors.values()):
+            previous, current = None, next(iter(neighbors))
+            while current not in loop:
+                loop.append(current)
+                a, b = neighbors[current]
+                previous, current = current, (b if a == previous else a)
+
+        if len(loop) == len(neighbors):
+            facets.append(loop)
+        else:
+            # Not a single simple outline, keep the triangles.
+            facets.extend(list(hull_calc.simplices[i]) for i in triangles)
+
+    return facets
@@ -5,8 +5,14 @@ import getopt, sys
 import json
 import os
 import copy
+import functools
+import inspect
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from scipy.spatial import ConvexHull as sphull
+from convex_hull import rotation_matrix
 
 def deg2rad(degrees: float) -> float:
     return degrees * pi / 180
@@ -22,41 +28,66 @@ def rad2deg(rad: float) -> float:
 
 ## IMPORT DEFAULT CONFIG IN CASE NEW PARAMETERS EXIST
 import generate_configuration as cfg
-for item in cfg.shape_config:
-    locals()[item] = cfg.shape_config[item]
-
-if len(sys.argv) <= 1:
-    print("NO CONFIGURATION SPECIFIED, USING run_config.json")
-    with open(os.path.join(r".", 'run_config.json'), mode='r') as fid:
-        data = json.load(fid)
-
-else:
+from keyboard_config import CONFIG_FIELDS, KeyboardConfig, derived_sources
+from shape_cache import global_reads, is_data, value_token, file_tokens, cache_key, read_entry, write_entry
+from dependency_trace import DependencyTracer, global_writes, expand
+from helper_profile import HelperProfile
+from build_trace import BuildTrace
+try:
+    import footprint
+except ImportError:
+    # footprint does its 2D booleans with manifold3d, without it every plate is cut from the 3D walls.
+    footprint = None
+
+data = None
+cli_jobs = None
+cli_deps_manifest = None
+cli_cache_key_check = None
+cli_cache_key_parts = None
+cli_profile = None
+cli_trace = None
+if len(sys.argv) > 1:
     ## CHECK FOR CONFIG FILE AND WRITE TO ANY VARIABLES IN FILE.
-    opts, args = getopt.getopt(sys.argv[1:], "", ["config="])
+    opts, args = getopt.getopt(sys.argv[1:], "", [
+        "config=", "jobs=", "deps-manifest=", "profile=", "trace=", "check-cache-keys=", "parts=",
+    ])
     for opt, arg in opts:
         if opt in ('--config'):
             with open(os.path.join(r"..", "configs", arg + '.json'), mode='r') as fid:
                 data = json.load(fid)
+        elif opt in ('--jobs'):
+            cli_jobs = int(arg)
+        elif opt in ('--deps-manifest'):
+            cli_deps_manifest = arg
+        elif opt in ('--profile'):
+            cli_profile = arg
+        elif opt in ('--trace'):
+            cli_trace = arg
+        elif opt in ('--check-cache-keys'):
+            # JSON {key: value}, e.g. '{"thumb_offsets": [16, -3, 7]}'.
+            cli_cache_key_check = json.loads(arg)
+        elif opt in ('--parts'):
+            cli_cache_key_parts = arg.split(',')
+
+if cfg.run_config is not None:
+    data = cfg.run_config
+
+if data is None:
+    print("NO CONFIGURATION SPECIFIED, USING run_config.json")
+    with open(os.path.join(r".", 'run_config.json'), mode='r') as fid:
+        data = json.load(fid)
 
-for item in data:
-    locals()[item] = data[item]
+# Defaults from shape_config, then the loaded data, plus every derived value, published as module globals.
+config = KeyboardConfig(data)
+if cli_jobs is not None:
+    config.jobs = cli_jobs
+if cli_profile is not None:
+    config.profile_report = cli_profile
+if cli_trace is not None:
+    config.trace_file = cli_trace
+locals().update(config.as_dict())
 
-
-# Really rough setup.  Check for ENGINE, set it not present from configuration.
-try:
-    print('Found Current Engine in Config = {}'.format(ENGINE))
-except Exception:
-    print('Engine Not Found in Config')
-    ENGINE = 'solid'
-    # ENGINE = 'cadquery'
-    print('Setting Current Engine = {}'.format(ENGINE))
-
-if save_dir in ['', None, '.']:
-    save_path = path.join(r"..", "things")
-    parts_path = path.join(r"..", "src", "parts")
-else:
-    save_path = path.join(r"..", "things", save_dir)
-    parts_path = path.join(r"..", r"..", "src", "parts")
+print('Found Current Engine in Config = {}'.format(ENGINE))
 
 ###############################################
 # END EXTREMELY UGLY BOOTSTRAP
@@ -68,9 +99,67 @@ else:
 
 if ENGINE == 'cadquery':
     from helpers_cadquery import *
+elif ENGINE == 'manifold':
+    from helpers_manifold import *
+elif ENGINE == 'occ':
+    from helpers_occ import *
 else:
     from helpers_solid import *
 
+configure_engine(cache_dir=cache_dir, union_mode=union_mode, mesh_format=mesh_format)
+
+
+def load_engine(engine):
+    # The star import above, redone when a later configuration switches engines.
+    import importlib
+    helpers = importlib.import_module(
+        {'cadquery': 'helpers_cadquery', 'manifold': 'helpers_manifold', 'occ': 'helpers_occ'}.get(
+            engine, 'helpers_solid'
+        )
+    )
+    for item in getattr(helpers, '__all__', dir(helpers)):
+        # This module keeps its own debug switches.
+        if not item.startswith('_') and item not in ('debugprint', 'debug_trace'):
+            globals()[item] = getattr(helpers, item)
+    if helper_profile is not None or build_trace is not None:
+        instrument()
+
+
+# Opt-in instrumentation, see helper_profile.py and build_trace.py.
+helper_profile = None
+build_trace = None
+instrumented = {}
+
+
+def instrument():
+    # Wrap every engine helper this module calls for the helper profile and the build trace, and every function
+    # of this module for the trace, whichever of the two are on.  Repeated after an engine switch, functions
+    # already wrapped are left alone.
+    global helper_profile, build_trace
+    if profile_report and helper_profile is None:
+        helper_profile = HelperProfile(face_count)
+    if trace_file and build_trace is None:
+        build_trace = BuildTrace()
+    if helper_profile is not None:
+        helper_profile.face_count = face_count
+
+    for name, value in list(globals().items()):
+        if not inspect.isfunction(value) or value is instrumented.get(name):
+            continue
+        if name in ('configure_engine', 'face_count', 'solid_count'):
+            continue
+        if value.__module__ == face_count.__module__:
+            if build_trace is not None:
+                value = build_trace.wrap(value, 'engine')
+            if helper_profile is not None:
+                # Outermost, it reads the caller off the stack.
+                value = helper_profile.wrap(value)
+        elif build_trace is not None and value.__globals__ is globals():
+            value = build_trace.wrap(value, 'model')
+        else:
+            continue
+        instrumented[name] = globals()[name] = value
+
 ####################################################
 # END HELPER FUNCTIONS
 ####################################################
@@ -84,97 +173,139 @@ def debugprint(info):
         print(info)
 
 
-if oled_mount_type is not None and oled_mount_type != "NONE":
-    for item in oled_configurations[oled_mount_type]:
-        locals()[item] = oled_configurations[oled_mount_type][item]
-
-if nrows > 5:
-    column_style = column_style_gt5
-
-centerrow = nrows - centerrow_offset
-
-lastrow = nrows - 1
-if reduced_outer_cols>0 or reduced_inner_cols>0:
-    cornerrow = lastrow - 1
-else:
-    cornerrow = lastrow
-lastcol = ncols - 1
+teensy_width = 20
+teensy_height = 12
+teensy_length = 33
+teensy2_length = 53
+teensy_pcb_thickness = 2
+teensy_offset_height = 5
+teensy_holder_top_length = 18
+teensy_holder_width = 7 + teensy_pcb_thickness
+teensy_holder_height = 6 + teensy_width
 
 
-# Derived values
-if plate_style in ['NUB', 'HS_NUB']:
-    keyswitch_height = nub_keyswitch_height
-    keyswitch_width = nub_keyswitch_width
-elif plate_style in ['UNDERCUT', 'HS_UNDERCUT', 'NOTCH', 'HS_NOTCH']:
-    keyswitch_height = undercut_keyswitch_height
-    keyswitch_width = undercut_keyswitch_width
-else:
-    keyswitch_height = hole_keyswitch_height
-    keyswitch_width = hole_keyswitch_width
+# save_path = path.join("..", "things", save_dir)
+# Builds of the same config by different engines share save_path and may start together.
+os.makedirs(save_path, exist_ok=True)
 
-if 'HS_' in plate_style:
-    symmetry = "asymmetric"
-    plate_file = path.join(parts_path, r"hot_swap_plate")
-    plate_offset = 0.0
 
-if (trackball_in_wall or ('TRACKBALL' in thumb_style)) and not ball_side == 'both':
-    symmetry = "asymmetric"
+def column_offset(column: int) -> list:
+    if np.ndim(column):
+        # One offset per column index, laid out as [x, y, z] components for the vectorized key transforms.
+        return np.moveaxis(np.asarray(column_offsets, dtype=float)[column], -1, 0)
+    return column_offsets[column]
 
-mount_width = keyswitch_width + 2 * plate_rim
-mount_height = keyswitch_height + 2 * plate_rim
-mount_thickness = plate_thickness
+# column_style='fixed'
 
-if default_1U_cluster and thumb_style=='DEFAULT':
-    double_plate_height = (.7*sa_double_length - mount_height) / 3
-elif thumb_style=='DEFAULT':
-    double_plate_height = (.95*sa_double_length - mount_height) / 3
-else:
-    double_plate_height = (sa_double_length - mount_height) / 3
 
+plate_cache = {}
 
+# Subassemblies built in this run, by function name and arguments, see subassemblies().  Cleared by apply_config().
+subassembly_store = {}
 
-if oled_mount_type is not None and oled_mount_type != "NONE":
-    left_wall_x_offset = oled_left_wall_x_offset_override
-    left_wall_z_offset = oled_left_wall_z_offset_override
-    left_wall_lower_y_offset = oled_left_wall_lower_y_offset
-    left_wall_lower_z_offset = oled_left_wall_lower_z_offset
+# Module level values placed from the key grid, recomputed by apply_config() after a configuration change.
+position_updates = []
+# The globals they set.  Derived from the configuration, so cache keys take them by value, tables included.
+position_globals = set()
 
 
+def position_update(update):
+    position_updates.append(update)
+    position_globals.update(global_writes(update))
+    update()
+    return update
 
-cap_top_height = plate_thickness + sa_profile_key_height
-row_radius = ((mount_height + extra_height) / 2) / (np.sin(alpha / 2)) + cap_top_height
-column_radius = (
-                        ((mount_width + extra_width) / 2) / (np.sin(beta / 2))
-                ) + cap_top_height
-column_x_delta = -1 - column_radius * np.sin(beta)
-column_base_angle = beta * (centercol - 2)
 
+# Globals that never change the geometry, left out of subassembly cache keys.
+cache_neutral_globals = (
+    'jobs', 'cache_dir', 'shape_cache_mb', 'save_dir', 'save_path', 'config_name', 'profile_report', 'trace_file',
+)
 
+subassembly_reads = {}
+
+
+def subassembly_key(function, args, kwargs):
+    # Engine, the source of everything the function reaches, its arguments and the values of the globals it reads.
+    if function not in subassembly_reads:
+        subassembly_reads[function] = global_reads(function)
+    reads, source_digest = subassembly_reads[function]
+
+    # case_walls(side='right') and case_walls('right', skeleton=False) are the same call.
+    arguments = inspect.signature(function).bind(*args, **kwargs)
+    arguments.apply_defaults()
+
+    config_names = set(config.as_dict())
+    values = []
+    for name in sorted(reads):
+        value = globals()[name]
+        if name not in cache_neutral_globals and (name in config_names or name in position_globals or is_data(value)):
+            values.append((name, value_token(value)))
+            # Part files (plate_file, the trackball parts under parts_path) count by their content.
+            files = file_tokens(value)
+            if files:
+                values.append((name + ' files', files))
+
+    return "{}-{}".format(
+        function.__name__,
+        cache_key(ENGINE, union_mode, source_digest, sorted(arguments.arguments.items()), values),
+    )
 
 
-teensy_width = 20
-teensy_height = 12
-teensy_length = 33
-teensy2_length = 53
-teensy_pcb_thickness = 2
-teensy_offset_height = 5
-teensy_holder_top_length = 18
-teensy_holder_width = 7 + teensy_pcb_thickness
-teensy_holder_height = 6 + teensy_width
+def cached_subassembly(function):
+    # Keep results on disk under cache_dir/shapes, so a rebuild only redoes what its changes reach.
+    @functools.wraps(function)
+    def cached(*args, **kwargs):
+        if not shape_cache_mb:
+            return function(*args, **kwargs)
+
+        cache_path = path.join(cache_dir, 'shapes')
+        key = subassembly_key(function, args, kwargs)
+        data = read_entry(cache_path, key)
+        if data is not None:
+            print('{}() loaded from shape cache'.format(function.__name__))
+            result = pickle.loads(data)
+            if isinstance(result, tuple):
+                return tuple(deserialize_shape(item) for item in result)
+            return deserialize_shape(result)
+
+        result = function(*args, **kwargs)
+        if isinstance(result, tuple):
+            data = pickle.dumps(tuple(serialize_shape(item) for item in result))
+        else:
+            data = pickle.dumps(serialize_shape(result))
+        try:
+            write_entry(cache_path, key, data, shape_cache_mb * 1024 * 1024)
+        except OSError as err:
+            print("UNABLE TO CACHE {}(): {}".format(function.__name__, err))
+        return result
 
+    return cached
 
-# save_path = path.join("..", "things", save_dir)
-if not path.isdir(save_path):
-    os.mkdir(save_path)
 
+def plate_cache_key(cylinder_segments=100, side="right"):
+    # Every value single_plate() reads, so a reconfigured run never picks up a stale plate.
+    return (
+        ENGINE, side, cylinder_segments, plate_style,
+        mount_width, mount_height, mount_thickness, plate_thickness,
+        keyswitch_width, keyswitch_height,
+        clip_undercut, clip_thickness, notch_width, undercut_transition,
+        plate_file, plate_offset,
+        plate_holes, tuple(plate_holes_xy_offset), plate_holes_width, plate_holes_height,
+        plate_holes_diameter, plate_holes_depth,
+    )
 
-def column_offset(column: int) -> list:
-    return column_offsets[column]
 
-# column_style='fixed'
+def single_plate(cylinder_segments=100, side="right"):
+    # The plate is identical for every key on a side, build it once and hand out the prototype.
+    # Callers always place it (translate / rotate / key_place), which returns a new shape.
+    key = plate_cache_key(cylinder_segments=cylinder_segments, side=side)
+    if key not in plate_cache:
+        debugprint('single_plate() cache miss {}'.format(side))
+        plate_cache[key] = make_single_plate(cylinder_segments=cylinder_segments, side=side)
+    return plate_cache[key]
 
 
-def single_plate(cylinder_segments=100, side="right"):
+def make_single_plate(cylinder_segments=100, side="right"):
 
     if plate_style in ['NUB', 'HS_NUB']:
         tb_border = (mount_height-keyswitch_height)/2
@@ -213,31 +344,34 @@ def single_plate(cylinder_segments=100, side="right"):
 
     if plate_style in ['UNDERCUT', 'HS_UNDERCUT', 'NOTCH', 'HS_NOTCH']:
         if plate_style in ['UNDERCUT', 'HS_UNDERCUT']:
-            undercut = box(
+            undercuts = [box(
                 keyswitch_width + 2 * clip_undercut,
                 keyswitch_height + 2 * clip_undercut,
                 mount_thickness
-            )
+            )]
 
         if plate_style in ['NOTCH', 'HS_NOTCH']:
-            undercut = box(
-                notch_width,
-                keyswitch_height + 2 * clip_undercut,
-                mount_thickness
-            )
-            undercut = union([undercut,
+            undercuts = [
+                box(
+                    notch_width,
+                    keyswitch_height + 2 * clip_undercut,
+                    mount_thickness
+                ),
                 box(
                     keyswitch_width + 2 * clip_undercut,
                     notch_width,
                     mount_thickness
-                )
-            ])
+                ),
+            ]
 
-        undercut = translate(undercut, (0.0, 0.0, -clip_thickness + mount_thickness / 2.0))
+        undercuts = [translate(undercut, (0.0, 0.0, -clip_thickness + mount_thickness / 2.0)) for undercut in undercuts]
 
-        if ENGINE=='cadquery' and undercut_transition > 0:
-            undercut = undercut.faces("+Z").chamfer(undercut_transition, clip_undercut)
+        if ENGINE in ['cadquery', 'manifold', 'occ'] and undercut_transition > 0:
+            # Box by box: the chamfer of the notch cross mixed up the two lengths from edge to edge,
+            # and the manifold engine only chamfers convex shapes.
+            undercuts = [chamfer_top(undercut, undercut_transition, clip_undercut) for undercut in undercuts]
 
+        undercut = union(undercuts)
         plate = difference(plate, [undercut])
 
     if plate_file is not None:
@@ -471,11 +605,15 @@ def apply_key_geometry(
         rotate_y_fn,
         column,
         row,
-        column_style=column_style,
+        column_style=None,
 ):
 
     debugprint('apply_key_geometry()')
 
+    if column_style is None:
+        # Read at call time, apply_config() may have switched it since this was defined.
+        column_style = globals()['column_style']
+
     column_angle = beta * (centercol - column)
 
     if column_style == "orthographic":
@@ -490,11 +628,12 @@ def apply_key_geometry(
         shape = translate_fn(shape, column_offset(column))
 
     elif column_style == "fixed":
-        shape = rotate_y_fn(shape, fixed_angles[column])
-        shape = translate_fn(shape, [fixed_x[column], 0, fixed_z[column]])
-        shape = translate_fn(shape, [0, 0, -(row_radius + fixed_z[column])])
+        column_fixed_z = np.take(fixed_z, column)
+        shape = rotate_y_fn(shape, np.take(fixed_angles, column))
+        shape = translate_fn(shape, [np.take(fixed_x, column), 0, column_fixed_z])
+        shape = translate_fn(shape, [0, 0, -(row_radius + column_fixed_z)])
         shape = rotate_x_fn(shape, alpha * (centerrow - row))
-        shape = translate_fn(shape, [0, 0, row_radius + fixed_z[column]])
+        shape = translate_fn(shape, [0, 0, row_radius + column_fixed_z])
         shape = rotate_y_fn(shape, fixed_tenting)
         shape = translate_fn(shape, [0, column_offset(column)[1], 0])
 
@@ -523,9 +662,105 @@ def y_rot(shape, angle):
     return rotate(shape, [0, rad2deg(angle), 0])
 
 
+def translation_matrix(xyz):
+    # Components may be arrays, the result then holds one 4x4 matrix per element.
+    x, y, z = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in xyz])
+    t_matrix = np.zeros(x.shape + (4, 4))
+    t_matrix[...] = np.eye(4)
+    t_matrix[..., 0, 3] = x
+    t_matrix[..., 1, 3] = y
+    t_matrix[..., 2, 3] = z
+    return t_matrix
+
+
+def x_rotation_matrix(angle):
+    angle = np.asarray(angle, dtype=float)
+    t_matrix = np.zeros(angle.shape + (4, 4))
+    t_matrix[...] = np.eye(4)
+    t_matrix[..., 1, 1] = np.cos(angle)
+    t_matrix[..., 1, 2] = -np.sin(angle)
+    t_matrix[..., 2, 1] = np.sin(angle)
+    t_matrix[..., 2, 2] = np.cos(angle)
+    return t_matrix
+
+
+def y_rotation_matrix(angle):
+    angle = np.asarray(angle, dtype=float)
+    t_matrix = np.zeros(angle.shape + (4, 4))
+    t_matrix[...] = np.eye(4)
+    t_matrix[..., 0, 0] = np.cos(angle)
+    t_matrix[..., 0, 2] = np.sin(angle)
+    t_matrix[..., 2, 0] = -np.sin(angle)
+    t_matrix[..., 2, 2] = np.cos(angle)
+    return t_matrix
+
+
+def rotation_transform(angle):
+    # rotate(shape, angle) as a 4x4 matrix.
+    t_matrix = np.eye(4)
+    t_matrix[:3, :3] = rotation_matrix(angle)
+    return t_matrix
+
+
+def matrix_translate(t_matrix, xyz):
+    return np.matmul(translation_matrix(xyz), t_matrix)
+
+
+def matrix_x_rot(t_matrix, angle):
+    return np.matmul(x_rotation_matrix(angle), t_matrix)
+
+
+def matrix_y_rot(t_matrix, angle):
+    return np.matmul(y_rotation_matrix(angle), t_matrix)
+
+
+def key_transforms(columns, rows):
+    # apply_key_geometry() on identity matrices, broadcast over every (column, row) pair at once.
+    columns, rows = np.broadcast_arrays(np.asarray(columns), np.asarray(rows))
+    identity = np.broadcast_to(np.eye(4), columns.shape + (4, 4))
+    return apply_key_geometry(identity, matrix_translate, matrix_x_rot, matrix_y_rot, columns, rows)
+
+
+@position_update
+def update_key_transform_table():
+    global key_transform_table
+    key_transform_table = key_transforms(*np.meshgrid(np.arange(ncols), np.arange(nrows), indexing='ij'))
+
+
+def key_transform(column, row):
+    # Homogeneous placement matrix for a key, looked up from the precomputed grid where possible.
+    if (
+            isinstance(column, (int, np.integer)) and isinstance(row, (int, np.integer))
+            and 0 <= column < ncols and 0 <= row < nrows
+    ):
+        return key_transform_table[column, row]
+    return key_transforms(column, row)
+
+
+def key_positions(points, columns, rows):
+    # Batched key_position(): points is (N, 3) or a single point, columns / rows are scalars or length N.
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    columns, rows = np.atleast_1d(columns), np.atleast_1d(rows)
+    count = max(len(points), len(columns), len(rows))
+    points = np.broadcast_to(points, (count, 3))
+    columns = np.broadcast_to(columns, (count,))
+    rows = np.broadcast_to(rows, (count,))
+
+    on_grid = (
+            np.issubdtype(columns.dtype, np.integer) and np.issubdtype(rows.dtype, np.integer)
+            and np.all((0 <= columns) & (columns < ncols)) and np.all((0 <= rows) & (rows < nrows))
+    )
+    if on_grid:
+        transforms = key_transform_table[columns, rows]
+    else:
+        transforms = key_transforms(columns, rows)
+
+    return np.einsum('nij,nj->ni', transforms[:, :3, :3], points) + transforms[:, :3, 3]
+
+
 def key_place(shape, column, row):
     debugprint('key_place()')
-    return apply_key_geometry(shape, translate, x_rot, y_rot, column, row)
+    return transform(shape, key_transform(column, row))
 
 
 def add_translate(shape, xyz):
@@ -538,19 +773,18 @@ def add_translate(shape, xyz):
 
 def key_position(position, column, row):
     debugprint('key_position()')
-    return apply_key_geometry(
-        position, add_translate, rotate_around_x, rotate_around_y, column, row
-    )
+    return list(key_positions(position, column, row)[0])
 
 
+@cached_subassembly
 def key_holes(side="right"):
     debugprint('key_holes()')
-    # hole = single_plate()
+    hole = single_plate(side=side)
     holes = []
     for column in range(ncols):
         for row in range(nrows):
             if (reduced_inner_cols <= column < (ncols - reduced_outer_cols)) or (not row == lastrow):
-                holes.append(key_place(single_plate(side=side), column, row))
+                holes.append(key_place(hole, column, row))
 
     shape = union(holes)
 
@@ -592,7 +826,7 @@ def caps(cap_type="MX"):
 
 def web_post():
     debugprint('web_post()')
-    post = box(post_size, post_size, web_thickness)
+    post = box_points(post_size, post_size, web_thickness)
     post = translate(post, (0, 0, plate_thickness - (web_thickness / 2)))
     return post
 
@@ -631,6 +865,7 @@ def web_post_br(wide=False):
 
 
 
+@cached_subassembly
 def connectors():
     debugprint('connectors()')
     hulls = []
@@ -700,93 +935,129 @@ def connectors():
 ############
 
 
-def thumborigin():
-    # debugprint('thumborigin()')
+@position_update
+def update_thumb_origin():
+    global thumb_origin
 
     corner = cornerrow if reduced_inner_cols > 0 else lastrow
-    origin = key_position([mount_width / 2, -(mount_height / 2), 0], 1, corner)
+    thumb_origin = key_position([mount_width / 2, -(mount_height / 2), 0], 1, corner)
 
-    for i in range(len(origin)):
-        origin[i] = origin[i] + thumb_offsets[i]
+    for i in range(len(thumb_origin)):
+        thumb_origin[i] = thumb_origin[i] + thumb_offsets[i]
 
     if thumb_style == 'MINIDOX':
-        origin[1] = origin[1] - .4*(minidox_Usize-1)*sa_length
+        thumb_origin[1] = thumb_origin[1] - .4*(minidox_Usize-1)*sa_length
 
-    return origin
 
-
-def default_thumb_tl_place(shape):
+def thumborigin():
+    # debugprint('thumborigin()')
+    # A copy, callers add their offsets to it in place.
+    return list(thumb_origin)
+
+
+# Rotation (degrees, about x, then y, then z) and offset from thumborigin() of each thumb cluster key.
+THUMB_KEY_POSES = {
+    'default_tl': ([7.5, -18, 10], [-32.5, -14.5, -2.5]),
+    'default_tr': ([10, -15, 10], [-12, -16, 3]),
+    'default_mr': ([-6, -34, 48], [-29, -40, -13]),
+    'default_ml': ([6, -34, 40], [-51, -25, -12]),
+    'default_br': ([-16, -33, 54], [-37.8, -55.3, -25.3]),
+    'default_bl': ([-4, -35, 52], [-56.3, -43.3, -23.5]),
+    'mini_tr_index': ([-25, 25, 0], [-12.5, -10, 2]),
+    'mini_tr': ([14, -15, 10], [-15, -10, 5]),
+    'mini_tl': ([10, -23, 25], [-35, -16, -2]),
+    'mini_mr': ([10, -23, 25], [-23, -34, -6]),
+    'mini_br': ([6, -34, 35], [-39, -43, -16]),
+    'mini_bl': ([6, -32, 35], [-51, -25, -11.5]),
+    'minidox_tl': ([10, -23, 25], [-35, -16, -2]),
+    'minidox_tr': ([14, -15, 10], [-15, -10, 5]),
+    'minidox_ml': ([6, -34, 40], [-53, -26, -12]),
+    'carbonfet_tl': ([10, -24, 10], [-13, -9.8, 4]),
+    'carbonfet_tr': ([6, -25, 10], [-7.5, -29.5, 0]),
+    'carbonfet_ml': ([8, -31, 14], [-30.5, -17, -6]),
+    'carbonfet_mr': ([4, -31, 14], [-22.2, -41, -10.3]),
+    'carbonfet_br': ([2, -37, 18], [-37, -46.4, -22]),
+    'carbonfet_bl': ([6, -37, 18], [-47, -23, -19]),
+    'tbcj_tr': ([10, -15, 10], [-12, -16, 3]),
+    'tbcj_tl': ([7.5, -18, 10], [-32.5, -14.5, -2.5]),
+    'tbcj_ml': ([6, -34, 40], [-51, -25, -12]),
+    'tbcj_bl': ([-4, -35, 52], [-56.3, -43.3, -23.5]),
+    'tbcj': ([0, 0, 0], [-15, -60, -12]),
+}
+
+
+@position_update
+def update_thumb_transform_table():
+    # Each pose of THUMB_KEY_POSES as one 4x4 matrix, instead of a rotate() and two translate() per shape.
+    global thumb_transform_table
+    thumb_transform_table = {
+        key: np.matmul(translation_matrix(np.add(thumb_origin, offset)), rotation_transform(angle))
+        for key, (angle, offset) in THUMB_KEY_POSES.items()
+    }
+
+
+def thumb_place(shape, key, rotation=0):
+    # shape turned about z by rotation degrees and placed on thumb cluster key, in one transform().
+    t_matrix = thumb_transform_table[key]
+    if rotation:
+        t_matrix = np.matmul(t_matrix, rotation_transform([0, 0, rotation]))
+    return transform(shape, t_matrix)
+
+
+def default_thumb_tl_place(shape, rotation=0):
     debugprint('thumb_tl_place()')
-    shape = rotate(shape, [7.5, -18, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-32.5, -14.5, -2.5])
-    return shape
+    return thumb_place(shape, 'default_tl', rotation)
 
 
-def default_thumb_tr_place(shape):
+def default_thumb_tr_place(shape, rotation=0):
     debugprint('thumb_tr_place()')
-    shape = rotate(shape, [10, -15, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-12, -16, 3])
-    return shape
+    return thumb_place(shape, 'default_tr', rotation)
 
-def default_thumb_mr_place(shape):
+def default_thumb_mr_place(shape, rotation=0):
     debugprint('thumb_mr_place()')
-    shape = rotate(shape, [-6, -34, 48])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-29, -40, -13])
-    return shape
+    return thumb_place(shape, 'default_mr', rotation)
 
 
-def default_thumb_ml_place(shape):
+def default_thumb_ml_place(shape, rotation=0):
     debugprint('thumb_ml_place()')
-    shape = rotate(shape, [6, -34, 40])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-51, -25, -12])
-    return shape
+    return thumb_place(shape, 'default_ml', rotation)
 
 
-def default_thumb_br_place(shape):
+def default_thumb_br_place(shape, rotation=0):
     debugprint('thumb_br_place()')
-    shape = rotate(shape, [-16, -33, 54])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-37.8, -55.3, -25.3])
-    return shape
+    return thumb_place(shape, 'default_br', rotation)
 
 
-def default_thumb_bl_place(shape):
+def default_thumb_bl_place(shape, rotation=0):
     debugprint('thumb_bl_place()')
-    shape = rotate(shape, [-4, -35, 52])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-56.3, -43.3, -23.5])
-    return shape
+    return thumb_place(shape, 'default_bl', rotation)
 
 
 def default_thumb_1x_layout(shape, cap=False):
     debugprint('thumb_1x_layout()')
     if cap:
         shape_list = [
-            default_thumb_mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-            default_thumb_ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation])),
-            default_thumb_br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
-            default_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
+            default_thumb_mr_place(shape, thumb_plate_mr_rotation),
+            default_thumb_ml_place(shape, thumb_plate_ml_rotation),
+            default_thumb_br_place(shape, thumb_plate_br_rotation),
+            default_thumb_bl_place(shape, thumb_plate_bl_rotation),
         ]
 
         if default_1U_cluster:
-            shape_list.append(default_thumb_tr_place(rotate(rotate(shape, (0, 0, 90)), [0, 0, thumb_plate_tr_rotation])))
-            shape_list.append(default_thumb_tr_place(rotate(rotate(shape, (0, 0, 90)), [0, 0, thumb_plate_tr_rotation])))
-            shape_list.append(default_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])))
+            shape_list.append(default_thumb_tr_place(shape, 90 + thumb_plate_tr_rotation))
+            shape_list.append(default_thumb_tr_place(shape, 90 + thumb_plate_tr_rotation))
+            shape_list.append(default_thumb_tl_place(shape, thumb_plate_tl_rotation))
         shapes = add(shape_list)
 
     else:
         shape_list = [
-                default_thumb_mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-                default_thumb_ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation])),
-                default_thumb_br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
-                default_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
+                default_thumb_mr_place(shape, thumb_plate_mr_rotation),
+                default_thumb_ml_place(shape, thumb_plate_ml_rotation),
+                default_thumb_br_place(shape, thumb_plate_br_rotation),
+                default_thumb_bl_place(shape, thumb_plate_bl_rotation),
             ]
         if default_1U_cluster:
-            shape_list.append(default_thumb_tr_place(rotate(rotate(shape, (0, 0, 90)), [0, 0, thumb_plate_tr_rotation])))
+            shape_list.append(default_thumb_tr_place(shape, 90 + thumb_plate_tr_rotation))
         shapes = union(shape_list)
     return shapes
 
@@ -800,13 +1071,13 @@ def default_thumb_15x_layout(shape, cap=False, plate=True):
     if plate:
         if cap:
             shape = rotate(shape, (0, 0, 90))
-            cap_list = [default_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation]))]
-            cap_list.append(default_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])))
+            cap_list = [default_thumb_tl_place(shape, thumb_plate_tl_rotation)]
+            cap_list.append(default_thumb_tr_place(shape, thumb_plate_tr_rotation))
             return add(cap_list)
         else:
-            shape_list = [default_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation]))]
+            shape_list = [default_thumb_tl_place(shape, thumb_plate_tl_rotation)]
             if not default_1U_cluster:
-                shape_list.append(default_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])))
+                shape_list.append(default_thumb_tr_place(shape, thumb_plate_tr_rotation))
             return union(shape_list)
     else:
         if cap:
@@ -897,6 +1168,7 @@ def thumbcaps(side='right', style_override=None):
         return default_thumbcaps()
 
 
+@cached_subassembly
 def thumb(side="right", style_override=None):
     if style_override is None:
         _thumb_style = thumb_style
@@ -923,6 +1195,7 @@ def thumb(side="right", style_override=None):
         return default_thumb(side)
 
 
+@cached_subassembly
 def thumb_connectors(side='right', style_override=None):
     if style_override is None:
         _thumb_style = thumb_style
@@ -977,7 +1250,7 @@ def thumb_pcb_plate_cutouts(side='right', style_override=None):
 def default_thumbcaps():
     t1 = default_thumb_1x_layout(keycap(1), cap=True)
     if not default_1U_cluster:
-        t1.add(default_thumb_15x_layout(keycap(1.5), cap=True))
+        t1 = add([t1, default_thumb_15x_layout(keycap(1.5), cap=True)])
     return t1
 
 
@@ -1186,65 +1459,45 @@ def default_thumb_connectors():
 ############################
 
 
-def mini_thumb_tr_place(shape):
-    if mini_index_key:
-        shape = rotate(shape, [-25, 25, 0])
-        shape = translate(shape, thumborigin())
-        shape = translate(shape, [-12.5, -10, 2])
-    else:
-        shape = rotate(shape, [14, -15, 10])
-        shape = translate(shape, thumborigin())
-        shape = translate(shape, [-15, -10, 5])
-    return shape
+def mini_thumb_tr_place(shape, rotation=0):
+    return thumb_place(shape, 'mini_tr_index' if mini_index_key else 'mini_tr', rotation)
 
 
-def mini_thumb_tl_place(shape):
-    shape = rotate(shape, [10, -23, 25])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-35, -16, -2])
-    return shape
+def mini_thumb_tl_place(shape, rotation=0):
+    return thumb_place(shape, 'mini_tl', rotation)
 
 
-def mini_thumb_mr_place(shape):
-    shape = rotate(shape, [10, -23, 25])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-23, -34, -6])
-    return shape
+def mini_thumb_mr_place(shape, rotation=0):
+    return thumb_place(shape, 'mini_mr', rotation)
 
 
-def mini_thumb_br_place(shape):
-    shape = rotate(shape, [6, -34, 35])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-39, -43, -16])
-    return shape
+def mini_thumb_br_place(shape, rotation=0):
+    return thumb_place(shape, 'mini_br', rotation)
 
 
-def mini_thumb_bl_place(shape):
-    shape = rotate(shape, [6, -32, 35])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-51, -25, -11.5])
-    return shape
+def mini_thumb_bl_place(shape, rotation=0):
+    return thumb_place(shape, 'mini_bl', rotation)
 
 
 def mini_thumb_1x_layout(shape):
     return union([
     #return add([
-        mini_thumb_mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-        mini_thumb_br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
-        mini_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])),
-        mini_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
+        mini_thumb_mr_place(shape, thumb_plate_mr_rotation),
+        mini_thumb_br_place(shape, thumb_plate_br_rotation),
+        mini_thumb_tl_place(shape, thumb_plate_tl_rotation),
+        mini_thumb_bl_place(shape, thumb_plate_bl_rotation),
     ])
 
 
 def mini_thumb_15x_layout(shape):
-    return union([mini_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation]))])
-    #return add([mini_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation]))])
+    return union([mini_thumb_tr_place(shape, thumb_plate_tr_rotation)])
+    #return add([mini_thumb_tr_place(shape, thumb_plate_tr_rotation)])
 
 
 def mini_thumbcaps():
     t1 = mini_thumb_1x_layout(keycap(1))
     t15 = mini_thumb_15x_layout(rotate(keycap(1), [0, 0, rad2deg(pi / 2)]))
-    return t1.add(t15)
+    return add([t1, t15])
 
 
 def mini_thumb(side="right"):
@@ -1387,39 +1640,30 @@ def mini_thumb_connectors():
 # MINIDOX (3-key) THUMB CLUSTER
 ############################
 
-def minidox_thumb_tl_place(shape):
-    shape = rotate(shape, [10, -23, 25])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-35, -16, -2])
-    return shape
+def minidox_thumb_tl_place(shape, rotation=0):
+    return thumb_place(shape, 'minidox_tl', rotation)
 
-def minidox_thumb_tr_place(shape):
-    shape = rotate(shape, [14, -15, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-15, -10, 5])
-    return shape
+def minidox_thumb_tr_place(shape, rotation=0):
+    return thumb_place(shape, 'minidox_tr', rotation)
 
-def minidox_thumb_ml_place(shape):
-    shape = rotate(shape, [6, -34, 40])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-53, -26, -12])
-    return shape
+def minidox_thumb_ml_place(shape, rotation=0):
+    return thumb_place(shape, 'minidox_ml', rotation)
 
 def minidox_thumb_1x_layout(shape):
     return union([
     #return add([
-        minidox_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-        minidox_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])),
-        minidox_thumb_ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation])),
+        minidox_thumb_tr_place(shape, thumb_plate_tr_rotation),
+        minidox_thumb_tl_place(shape, thumb_plate_tl_rotation),
+        minidox_thumb_ml_place(shape, thumb_plate_ml_rotation),
     ])
 
 
 def minidox_thumb_fx_layout(shape):
     return union([
     #return add([
-        minidox_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-        minidox_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])),
-        minidox_thumb_ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation])),
+        minidox_thumb_tr_place(shape, thumb_plate_tr_rotation),
+        minidox_thumb_tl_place(shape, thumb_plate_tl_rotation),
+        minidox_thumb_ml_place(shape, thumb_plate_ml_rotation),
     ])
 
 def minidox_thumbcaps():
@@ -1529,50 +1773,32 @@ def minidox_thumb_connectors():
 ############################
 
 
-def carbonfet_thumb_tl_place(shape):
-    shape = rotate(shape, [10, -24, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-13, -9.8, 4])
-    return shape
+def carbonfet_thumb_tl_place(shape, rotation=0):
+    return thumb_place(shape, 'carbonfet_tl', rotation)
 
-def carbonfet_thumb_tr_place(shape):
-    shape = rotate(shape, [6, -25, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-7.5, -29.5, 0])
-    return shape
+def carbonfet_thumb_tr_place(shape, rotation=0):
+    return thumb_place(shape, 'carbonfet_tr', rotation)
 
-def carbonfet_thumb_ml_place(shape):
-    shape = rotate(shape, [8, -31, 14])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-30.5, -17, -6])
-    return shape
+def carbonfet_thumb_ml_place(shape, rotation=0):
+    return thumb_place(shape, 'carbonfet_ml', rotation)
 
-def carbonfet_thumb_mr_place(shape):
-    shape = rotate(shape, [4, -31, 14])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-22.2, -41, -10.3])
-    return shape
+def carbonfet_thumb_mr_place(shape, rotation=0):
+    return thumb_place(shape, 'carbonfet_mr', rotation)
 
-def carbonfet_thumb_br_place(shape):
-    shape = rotate(shape, [2, -37, 18])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-37, -46.4, -22])
-    return shape
+def carbonfet_thumb_br_place(shape, rotation=0):
+    return thumb_place(shape, 'carbonfet_br', rotation)
 
-def carbonfet_thumb_bl_place(shape):
-    shape = rotate(shape, [6, -37, 18])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-47, -23, -19])
-    return shape
+def carbonfet_thumb_bl_place(shape, rotation=0):
+    return thumb_place(shape, 'carbonfet_bl', rotation)
 
 
 def carbonfet_thumb_1x_layout(shape):
     return union([
     #return add([
-        carbonfet_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-        carbonfet_thumb_mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-        carbonfet_thumb_br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
-        carbonfet_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])),
+        carbonfet_thumb_tr_place(shape, thumb_plate_tr_rotation),
+        carbonfet_thumb_mr_place(shape, thumb_plate_mr_rotation),
+        carbonfet_thumb_br_place(shape, thumb_plate_br_rotation),
+        carbonfet_thumb_tl_place(shape, thumb_plate_tl_rotation),
     ])
 
 
@@ -1580,8 +1806,8 @@ def carbonfet_thumb_15x_layout(shape, plate=True):
     if plate:
         return union([
         #return add([
-            carbonfet_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
-            carbonfet_thumb_ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation]))
+            carbonfet_thumb_bl_place(shape, thumb_plate_bl_rotation),
+            carbonfet_thumb_ml_place(shape, thumb_plate_ml_rotation)
         ])
     else:
         return union([
@@ -1594,7 +1820,7 @@ def carbonfet_thumb_15x_layout(shape, plate=True):
 def carbonfet_thumbcaps():
     t1 = carbonfet_thumb_1x_layout(keycap(1))
     t15 = carbonfet_thumb_15x_layout(rotate(keycap(1.5), [0, 0, rad2deg(pi / 2)]))
-    return t1.add(t15)
+    return add([t1, t15])
 
 
 def carbonfet_thumb(side="right"):
@@ -1769,68 +1995,58 @@ def tbjs_thumb_position_rotation():
     return pos, rot
 
 
-def tbjs_place(shape):
+# Turn about z before and after each key of the ring is moved out to tbjs_key_diameter, and its index in
+# tbjs_key_rotation_offsets / tbjs_key_translation_offsets.
+TBJS_KEY_TURNS = {'tl': (0, -80, 0), 'mr': (0, -130, 1), 'br': (180, -180, 2), 'bl': (180, -230, 3)}
+
+
+@position_update
+def update_tbjs_transform_table():
+    # tbjs_place() and the key placements around the ball as 4x4 matrices, added to thumb_transform_table.
+    global thumb_transform_table
     pos, rot = tbjs_thumb_position_rotation()
-    shape = rotate(shape, rot)
-    shape = translate(shape, pos)
-    return shape
+    place = np.matmul(translation_matrix(pos), rotation_transform(rot))
+    table = dict(thumb_transform_table, tbjs=place)
+
+    for key, (turn, ring_turn, index) in TBJS_KEY_TURNS.items():
+        t_off = tbjs_key_translation_offsets[index]
+        t_matrix = np.matmul(rotation_transform(tbjs_key_rotation_offsets[index]), rotation_transform([0, 0, turn]))
+        t_matrix = np.matmul(translation_matrix((t_off[0], t_off[1]+tbjs_key_diameter/2, t_off[2])), t_matrix)
+        t_matrix = np.matmul(rotation_transform([0, 0, ring_turn]), t_matrix)
+        table['tbjs_' + key] = np.matmul(place, t_matrix)
+    thumb_transform_table = table
 
 
-def tbjs_thumb_tl_place(shape):
+def tbjs_place(shape):
+    return thumb_place(shape, 'tbjs')
+
+
+def tbjs_thumb_tl_place(shape, rotation=0):
     debugprint('thumb_tr_place()')
     # Modifying to make a "ring" of keys
-    shape = rotate(shape, [0, 0, 0])
-    t_off = tbjs_key_translation_offsets[0]
-    shape = rotate(shape, tbjs_key_rotation_offsets[0])
-    shape = translate(shape, (t_off[0], t_off[1]+tbjs_key_diameter/2, t_off[2]))
-    shape = rotate(shape, [0,0,-80])
-    shape = tbjs_place(shape)
+    return thumb_place(shape, 'tbjs_tl', rotation)
 
-    return shape
-
-def tbjs_thumb_mr_place(shape):
+def tbjs_thumb_mr_place(shape, rotation=0):
     debugprint('thumb_mr_place()')
-    shape = rotate(shape, [0, 0, 0])
-    shape = rotate(shape, tbjs_key_rotation_offsets[1])
-    t_off = tbjs_key_translation_offsets[1]
-    shape = translate(shape, (t_off[0], t_off[1]+tbjs_key_diameter/2, t_off[2]))
-    shape = rotate(shape, [0,0,-130])
-    shape = tbjs_place(shape)
+    return thumb_place(shape, 'tbjs_mr', rotation)
 
-    return shape
-
-def tbjs_thumb_br_place(shape):
+def tbjs_thumb_br_place(shape, rotation=0):
     debugprint('thumb_br_place()')
-
-    shape = rotate(shape, [0, 0, 180])
-    shape = rotate(shape, tbjs_key_rotation_offsets[2])
-    t_off = tbjs_key_translation_offsets[2]
-    shape = translate(shape, (t_off[0], t_off[1]+tbjs_key_diameter/2, t_off[2]))
-    shape = rotate(shape, [0,0,-180])
-    shape = tbjs_place(shape)
-
-    return shape
+    return thumb_place(shape, 'tbjs_br', rotation)
 
 
-def tbjs_thumb_bl_place(shape):
+def tbjs_thumb_bl_place(shape, rotation=0):
     debugprint('thumb_bl_place()')
-    shape = rotate(shape, [0, 0, 180])
-    shape = rotate(shape, tbjs_key_rotation_offsets[3])
-    t_off = tbjs_key_translation_offsets[3]
-    shape = translate(shape, (t_off[0], t_off[1]+tbjs_key_diameter/2, t_off[2]))
-    shape = rotate(shape, [0,0,-230])
-    shape = tbjs_place(shape)
-
-    return shape
+    return thumb_place(shape, 'tbjs_bl', rotation)
 
 
 def tbjs_thumb_1x_layout(shape):
     return union([
     #return add([
-        tbjs_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-        tbjs_thumb_mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-        tbjs_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
-        tbjs_thumb_br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
+        tbjs_thumb_tl_place(shape, thumb_plate_tr_rotation),
+        tbjs_thumb_mr_place(shape, thumb_plate_mr_rotation),
+        tbjs_thumb_bl_place(shape, thumb_plate_bl_rotation),
+        tbjs_thumb_br_place(shape, thumb_plate_br_rotation),
     ])
 
 def tbjs_thumb_pcb_plate_cutouts(side="right"):
@@ -1839,10 +2055,10 @@ def tbjs_thumb_pcb_plate_cutouts(side="right"):
 
 def tbjs_thumb_fx_layout(shape):
     return [
-        tbjs_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-        tbjs_thumb_mr_place(rotate(shape, [0, 0, thumb_plate_mr_rotation])),
-        tbjs_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
-        tbjs_thumb_br_place(rotate(shape, [0, 0, thumb_plate_br_rotation])),
+        tbjs_thumb_tl_place(shape, thumb_plate_tr_rotation),
+        tbjs_thumb_mr_place(shape, thumb_plate_mr_rotation),
+        tbjs_thumb_bl_place(shape, thumb_plate_bl_rotation),
+        tbjs_thumb_br_place(shape, thumb_plate_br_rotation),
     ]
 
 def trackball_layout(shape):
@@ -2026,37 +2242,25 @@ def tbjs_thumb_connectors():
 
 # single_plate = the switch shape
 
-def tbcj_thumb_tr_place(shape):
-    shape = rotate(shape, [10, -15, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-12, -16, 3])
-    return shape
+def tbcj_thumb_tr_place(shape, rotation=0):
+    return thumb_place(shape, 'tbcj_tr', rotation)
 
-def tbcj_thumb_tl_place(shape):
-    shape = rotate(shape, [7.5, -18, 10])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-32.5, -14.5, -2.5])
-    return shape
+def tbcj_thumb_tl_place(shape, rotation=0):
+    return thumb_place(shape, 'tbcj_tl', rotation)
 
-def tbcj_thumb_ml_place(shape):
-    shape = rotate(shape, [6, -34, 40])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-51, -25, -12])
-    return shape
+def tbcj_thumb_ml_place(shape, rotation=0):
+    return thumb_place(shape, 'tbcj_ml', rotation)
 
-def tbcj_thumb_bl_place(shape):
-    shape = rotate(shape, [-4, -35, 52])
-    shape = translate(shape, thumborigin())
-    shape = translate(shape, [-56.3, -43.3, -23.5])
-    return shape
+def tbcj_thumb_bl_place(shape, rotation=0):
+    return thumb_place(shape, 'tbcj_bl', rotation)
 
 def tbcj_thumb_layout(shape):
     return union([
     #return add([
-            tbcj_thumb_tr_place(rotate(shape, [0, 0, thumb_plate_tr_rotation])),
-            tbcj_thumb_tl_place(rotate(shape, [0, 0, thumb_plate_tl_rotation])),
-            tbcj_thumb_ml_place(rotate(shape, [0, 0, thumb_plate_ml_rotation])),
-            tbcj_thumb_bl_place(rotate(shape, [0, 0, thumb_plate_bl_rotation])),
+            tbcj_thumb_tr_place(shape, thumb_plate_tr_rotation),
+            tbcj_thumb_tl_place(shape, thumb_plate_tl_rotation),
+            tbcj_thumb_ml_place(shape, thumb_plate_ml_rotation),
+            tbcj_thumb_bl_place(shape, thumb_plate_bl_rotation),
             ])
 
 
@@ -2118,10 +2322,7 @@ def tbcj_thumb_position_rotation():
 
 
 def tbcj_place(shape):
-    loc = np.array([-15, -60, -12]) + thumborigin()
-    shape = translate(shape, loc)
-    shape = rotate(shape, (0, 0, 0))
-    return shape
+    return thumb_place(shape, 'tbcj')
 
 def tbcj_thumb(side="right"):
     t = tbcj_thumb_layout(single_plate(side=side))
@@ -2368,7 +2569,7 @@ def wall_brace(place1, dx1, dy1, post1, place2, dx2, dy2, post2, back=False, ske
     if not skeleton or skel_bottom:
         hulls.append(place2(translate(post2, wall_locate3(dx2, dy2, back))))
 
-    shape1 = hull_from_shapes(hulls)
+    shape1 = floor_hull(hulls)
 
     hulls = []
     if not skeleton:
@@ -2408,84 +2609,84 @@ def key_wall_brace(x1, y1, dx1, dy1, post1, x2, y2, dx2, dy2, post2, back=False,
 def back_wall(skeleton=False):
     print("back_wall()")
     x = 0
-    shape = None
-    shape = union([shape, key_wall_brace(
+    shapes = []
+    shapes.append(key_wall_brace(
         x, 0, 0, 1, web_post_tl(), x, 0, 0, 1, web_post_tr(), back=True,
-    )])
+    ))
     for i in range(ncols - 1):
         x = i + 1
-        shape = union([shape, key_wall_brace(
+        shapes.append(key_wall_brace(
             x, 0, 0, 1, web_post_tl(), x, 0, 0, 1, web_post_tr(), back=True,
-        )])
+        ))
 
         skelly = skeleton and not x==1
-        shape = union([shape, key_wall_brace(
+        shapes.append(key_wall_brace(
             x, 0, 0, 1, web_post_tl(), x - 1, 0, 0, 1, web_post_tr(), back=True,
             skeleton=skelly, skel_bottom=True,
-        )])
+        ))
 
-    shape = union([shape, key_wall_brace(
+    shapes.append(key_wall_brace(
         lastcol, 0, 0, 1, web_post_tr(), lastcol, 0, 1, 0, web_post_tr(), back=True,
         skeleton=skeleton, skel_bottom=True,
-    )])
+    ))
     if not skeleton:
-        shape = union([shape,
+        shapes.append(
             key_wall_brace(
                 lastcol, 0, 0, 1, web_post_tr(), lastcol, 0, 1, 0, web_post_tr()
             )
-        ])
-    return shape
+        )
+    return union(shapes)
 
 
 def right_wall(skeleton=False):
     print("right_wall()")
     y = 0
 
-    shape = None
+    shapes = []
 
     corner = cornerrow if reduced_outer_cols > 0 else lastrow
 
-    shape = union([shape, key_wall_brace(
+    shapes.append(key_wall_brace(
         lastcol, y, 1, 0, web_post_tr(), lastcol, y, 1, 0, web_post_br(),
         skeleton=skeleton,
-    )])
+    ))
 
     for i in range(corner):
         y = i + 1
-        shape = union([shape, key_wall_brace(
+        shapes.append(key_wall_brace(
             lastcol, y - 1, 1, 0, web_post_br(), lastcol, y, 1, 0, web_post_tr(),
             skeleton=skeleton,
-        )])
+        ))
 
-        shape = union([shape, key_wall_brace(
+        shapes.append(key_wall_brace(
             lastcol, y, 1, 0, web_post_tr(), lastcol, y, 1, 0, web_post_br(),
             skeleton=skeleton,
-        )])
+        ))
         #STRANGE PARTIAL OFFSET
 
-    shape = union([
-        shape,
+    shapes.append(
         key_wall_brace(
             lastcol, corner, 0, -1, web_post_br(), lastcol, corner, 1, 0, web_post_br(),
             skeleton=skeleton
-        ),
-    ])
+        )
+    )
 
-    return shape
+    return union(shapes)
 
 
 def left_wall(side='right', skeleton=False):
     print('left_wall()')
-    shape = union([wall_brace(
+    shapes = []
+    shapes.append(wall_brace(
         (lambda sh: key_place(sh, 0, 0)), 0, 1, web_post_tl(),
         (lambda sh: left_key_place(sh, 0, 1, side=side)), 0, 1, web_post(),
-    )])
+    ))
 
-    shape = union([shape, wall_brace(
+    shapes.append(wall_brace(
         (lambda sh: left_key_place(sh, 0, 1, side=side)), 0, 1, web_post(),
         (lambda sh: left_key_place(sh, 0, 1, side=side)), -1, 0, web_post(),
         skeleton=skeleton,
-    )])
+    ))
 
     corner = cornerrow if reduced_inner_cols > 0 else lastrow
 
@@ -2497,7 +2698,7 @@ def left_wall(side='right', skeleton=False):
             (lambda sh: left_key_place(sh, y, -1, low_corner=low, side=side)), -1, 0, web_post(),
         skeleton=skeleton and (y < (corner)),
         )
-        shape = union([shape, temp_shape1])
+        shapes.append(temp_shape1)
 
         temp_shape2 = hull_from_shapes((
             key_place(web_post_tl(), 0, y),
@@ -2506,7 +2707,7 @@ def left_wall(side='right', skeleton=False):
             left_key_place(web_post(), y, -1, low_corner=low, side=side),
         ))
 
-        shape = union([shape, temp_shape2])
+        shapes.append(temp_shape2)
 
     for i in range(corner):
         y = i + 1
@@ -2516,7 +2717,7 @@ def left_wall(side='right', skeleton=False):
             (lambda sh: left_key_place(sh, y, 1, side=side)), -1, 0, web_post(),
             skeleton=skeleton and (y < (corner)),
         )
-        shape = union([shape, temp_shape1])
+        shapes.append(temp_shape1)
 
         temp_shape2 = hull_from_shapes((
             key_place(web_post_tl(), 0, y),
@@ -2525,14 +2726,14 @@ def left_wall(side='right', skeleton=False):
             left_key_place(web_post(), y - 1, -1, side=side),
         ))
 
-        shape = union([shape, temp_shape2])
+        shapes.append(temp_shape2)
 
-    return shape
+    return union(shapes)
 
 
 def front_wall(skeleton=False):
     print('front_wall()')
-    shape = None
+    shapes = []
 
     # shape = union([shape,key_wall_brace(
     #     3, lastrow, 0, -1, web_post_bl(), 3, lastrow, 0.5, -1, web_post_br()
@@ -2568,54 +2769,55 @@ def front_wall(skeleton=False):
         if x < (offset_col - 1):
             print("pre-offset")
             if x > 3:
-                shape = union([shape, key_wall_brace(
+                shapes.append(key_wall_brace(
                     x-1, lastrow, 0, -1, web_post_br(), x, lastrow, 0, -1, web_post_bl()
-                )])
-            shape = union([shape, key_wall_brace(
+                ))
+            shapes.append(key_wall_brace(
                 x, lastrow, 0, -1, web_post_bl(), x, lastrow, 0, -1, web_post_br()
-            )])
+            ))
         elif x < (offset_col):
             print("offset setup")
             if x > 3:
-                shape = union([shape, key_wall_brace(
+                shapes.append(key_wall_brace(
                     x-1, lastrow, 0, -1, web_post_br(), x, lastrow, 0, -1, web_post_bl()
-                )])
-            shape = union([shape, key_wall_brace(
+                ))
+            shapes.append(key_wall_brace(
                 x, lastrow, 0, -1, web_post_bl(), x, lastrow, 0.5, -1, web_post_br()
-            )])
+            ))
 
         elif x == (offset_col):
             print("offset")
-            shape = union([shape, key_wall_brace(
+            shapes.append(key_wall_brace(
                 x - 1, lastrow, 0.5, -1, web_post_br(), x, cornerrow, .5, -1, web_post_bl()
-            )])
-            shape = union([shape, key_wall_brace(
+            ))
+            shapes.append(key_wall_brace(
                 x, cornerrow, .5, -1, web_post_bl(), x, cornerrow, 0, -1, web_post_br()
-            )])
+            ))
 
         elif x == (offset_col + 1):
             print("offset completion")
-            shape = union([shape, key_wall_brace(
+            shapes.append(key_wall_brace(
                 x, cornerrow, 0, -1, web_post_bl(), x - 1, cornerrow, 0, -1, web_post_br()
-            )])
-            shape = union([shape, key_wall_brace(
+            ))
+            shapes.append(key_wall_brace(
                 x, cornerrow, 0, -1, web_post_bl(), x, cornerrow, 0, -1, web_post_br()
-            )])
+            ))
 
 
         else:
             print("post offset")
-            shape = union([shape, key_wall_brace(
+            shapes.append(key_wall_brace(
                 x, cornerrow, 0, -1, web_post_bl(), x - 1, corner, 0, -1, web_post_br()
-            )])
-            shape = union([shape, key_wall_brace(
+            ))
+            shapes.append(key_wall_brace(
                 x, cornerrow, 0, -1, web_post_bl(), x, corner, 0, -1, web_post_br()
-            )])
+            ))
 
 
-    return shape
+    return union(shapes)
 
 
+@cached_subassembly
 def thumb_walls(side='right', style_override=None, skeleton=False):
     if style_override is None:
         _thumb_style = thumb_style
@@ -2641,6 +2843,7 @@ def thumb_walls(side='right', style_override=None, skeleton=False):
     else:
         return default_thumb_walls(skeleton=skeleton)
 
+@cached_subassembly
 def thumb_connection(side='right', style_override=None, skeleton=False):
     if style_override is None:
         _thumb_style = thumb_style
@@ -2669,46 +2872,47 @@ def thumb_connection(side='right', style_override=None, skeleton=False):
 def default_thumb_walls(skeleton=False):
     print('thumb_walls()')
     # thumb, walls
+    shapes = []
     if default_1U_cluster:
-        shape = union([wall_brace(default_thumb_mr_place, 0, -1, web_post_br(), default_thumb_tr_place, 0, -1, web_post_br())])
+        shapes.append(wall_brace(default_thumb_mr_place, 0, -1, web_post_br(), default_thumb_tr_place, 0, -1, web_post_br()))
     else:
-        shape = union([wall_brace(default_thumb_mr_place, 0, -1, web_post_br(), default_thumb_tr_place, 0, -1, thumb_post_br())])
-    shape = union([shape, wall_brace(default_thumb_mr_place, 0, -1, web_post_br(), default_thumb_mr_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(default_thumb_br_place, 0, -1, web_post_br(), default_thumb_br_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(default_thumb_ml_place, -0.3, 1, web_post_tr(), default_thumb_ml_place, 0, 1, web_post_tl())])
-    shape = union([shape, wall_brace(default_thumb_bl_place, 0, 1, web_post_tr(), default_thumb_bl_place, 0, 1, web_post_tl())])
-    shape = union([shape, wall_brace(default_thumb_br_place, -1, 0, web_post_tl(), default_thumb_br_place, -1, 0, web_post_bl())])
-    shape = union([shape, wall_brace(default_thumb_bl_place, -1, 0, web_post_tl(), default_thumb_bl_place, -1, 0, web_post_bl())])
+        shapes.append(wall_brace(default_thumb_mr_place, 0, -1, web_post_br(), default_thumb_tr_place, 0, -1, thumb_post_br()))
+    shapes.append(wall_brace(default_thumb_mr_place, 0, -1, web_post_br(), default_thumb_mr_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(default_thumb_br_place, 0, -1, web_post_br(), default_thumb_br_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(default_thumb_ml_place, -0.3, 1, web_post_tr(), default_thumb_ml_place, 0, 1, web_post_tl()))
+    shapes.append(wall_brace(default_thumb_bl_place, 0, 1, web_post_tr(), default_thumb_bl_place, 0, 1, web_post_tl()))
+    shapes.append(wall_brace(default_thumb_br_place, -1, 0, web_post_tl(), default_thumb_br_place, -1, 0, web_post_bl()))
+    shapes.append(wall_brace(default_thumb_bl_place, -1, 0, web_post_tl(), default_thumb_bl_place, -1, 0, web_post_bl()))
     # thumb, corners
-    shape = union([shape, wall_brace(default_thumb_br_place, -1, 0, web_post_bl(), default_thumb_br_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(default_thumb_bl_place, -1, 0, web_post_tl(), default_thumb_bl_place, 0, 1, web_post_tl())])
+    shapes.append(wall_brace(default_thumb_br_place, -1, 0, web_post_bl(), default_thumb_br_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(default_thumb_bl_place, -1, 0, web_post_tl(), default_thumb_bl_place, 0, 1, web_post_tl()))
     # thumb, tweeners
-    shape = union([shape, wall_brace(default_thumb_mr_place, 0, -1, web_post_bl(), default_thumb_br_place, 0, -1, web_post_br())])
-    shape = union([shape, wall_brace(default_thumb_ml_place, 0, 1, web_post_tl(), default_thumb_bl_place, 0, 1, web_post_tr())])
-    shape = union([shape, wall_brace(default_thumb_bl_place, -1, 0, web_post_bl(), default_thumb_br_place, -1, 0, web_post_tl())])
+    shapes.append(wall_brace(default_thumb_mr_place, 0, -1, web_post_bl(), default_thumb_br_place, 0, -1, web_post_br()))
+    shapes.append(wall_brace(default_thumb_ml_place, 0, 1, web_post_tl(), default_thumb_bl_place, 0, 1, web_post_tr()))
+    shapes.append(wall_brace(default_thumb_bl_place, -1, 0, web_post_bl(), default_thumb_br_place, -1, 0, web_post_tl()))
     if default_1U_cluster:
-        shape = union([shape, wall_brace(default_thumb_tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
+        shapes.append(wall_brace(default_thumb_tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl()))
     else:
-        shape = union([shape, wall_brace(default_thumb_tr_place, 0, -1, thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
+        shapes.append(wall_brace(default_thumb_tr_place, 0, -1, thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl()))
 
-    return shape
+    return union(shapes)
 
 
 def default_thumb_connection(side='right', skeleton=False):
     print('thumb_connection()')
     # clunky bit on the top left thumb connection  (normal connectors don't work well)
-    shape = None
-    shape = union([shape, bottom_hull(
+    shapes = []
+    shapes.append(bottom_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             default_thumb_ml_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
             default_thumb_ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
             [
                 left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
                 left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -2717,27 +2921,27 @@ def default_thumb_connection(side='right', skeleton=False):
                 default_thumb_tl_place(thumb_post_tl()),
             ]
         )
-    ])  # )
+    )  # )
 
-    shape = union([shape, hull_from_shapes(
+    shapes.append(floor_hull(
         [
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             default_thumb_tl_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape, hull_from_shapes(
+    shapes.append(hull_from_shapes(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             key_place(web_post_bl(), 0, cornerrow),
             default_thumb_tl_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape, hull_from_shapes(
+    shapes.append(floor_hull(
         [
             default_thumb_ml_place(web_post_tr()),
             default_thumb_ml_place(translate(web_post_tr(), wall_locate1(-0.3, 1))),
@@ -2745,9 +2949,9 @@ def default_thumb_connection(side='right', skeleton=False):
             default_thumb_ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
             default_thumb_tl_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    return shape
+    return union(shapes)
 
 
 def tbjs_thumb_connection(side='right', skeleton=False):
@@ -2796,60 +3000,62 @@ def tbjs_thumb_connection(side='right', skeleton=False):
 def tbjs_thumb_walls(skeleton=False):
     print('thumb_walls()')
     # thumb, walls
-    shape = wall_brace(
+    shapes = []
+    shapes.append(wall_brace(
         tbjs_thumb_mr_place, .5, 1, tbjs_thumb_post_tr(),
         (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl(),
-    )
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_thumb_mr_place, .5, 1, tbjs_thumb_post_tr(),
         tbjs_thumb_br_place, 0, -1, tbjs_thumb_post_br(),
-    )])
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_thumb_br_place, 0, -1, tbjs_thumb_post_br(),
         tbjs_thumb_br_place, 0, -1, tbjs_thumb_post_bl(),
-    )])
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_thumb_br_place, 0, -1, tbjs_thumb_post_bl(),
         tbjs_thumb_bl_place, 0, -1, tbjs_thumb_post_br(),
-    )])
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_thumb_bl_place, 0, -1, tbjs_thumb_post_br(),
         tbjs_thumb_bl_place, -1, -1, tbjs_thumb_post_bl(),
-    )])
+    ))
 
-    shape = union([shape, wall_brace(
+    shapes.append(wall_brace(
         tbjs_place, -1.5, 0, tbjs_post_tl(),
         (lambda sh: left_key_place(sh, cornerrow, -1, side=ball_side, low_corner=True)), -1, 0, web_post(),
-    )])
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_place, -1.5, 0, tbjs_post_tl(),
         tbjs_place, -1, 0, tbjs_post_l(),
-    )])
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_place, -1, 0, tbjs_post_l(),
         tbjs_thumb_bl_place, -1, 0, tbjs_thumb_post_tl(),
-    )])
-    shape = union([shape, wall_brace(
+    ))
+    shapes.append(wall_brace(
         tbjs_thumb_bl_place, -1, 0, tbjs_thumb_post_tl(),
         tbjs_thumb_bl_place, -1, -1, tbjs_thumb_post_bl(),
-    )])
+    ))
 
-    return shape
+    return union(shapes)
 
 
 def tbcj_thumb_connection(side='right', skeleton=False):
     # clunky bit on the top left thumb connection  (normal connectors don't work well)
-    shape = union([bottom_hull(
+    shapes = []
+    shapes.append(bottom_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             default_thumb_ml_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
             default_thumb_ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
             [
                 left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
                 left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -2858,27 +3064,27 @@ def tbcj_thumb_connection(side='right', skeleton=False):
                 default_thumb_tl_place(web_post_tl()),
             ]
         )
-    ])  # )
+    )  # )
 
-    shape = union([shape, hull_from_shapes(
+    shapes.append(floor_hull(
         [
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             default_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape, hull_from_shapes(
+    shapes.append(hull_from_shapes(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             key_place(web_post_bl(), 0, cornerrow),
             default_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape, hull_from_shapes(
+    shapes.append(floor_hull(
         [
             default_thumb_ml_place(web_post_tr()),
             default_thumb_ml_place(translate(web_post_tr(), wall_locate1(-0.3, 1))),
@@ -2886,16 +3092,17 @@ def tbcj_thumb_connection(side='right', skeleton=False):
             default_thumb_ml_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
             default_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    return shape
+    return union(shapes)
 
 def tbcj_thumb_walls(skeleton=False):
-    shape = union([wall_brace(tbcj_thumb_ml_place, -0.3, 1, web_post_tr(), tbcj_thumb_ml_place, 0, 1, web_post_tl())])
-    shape = union([shape, wall_brace(tbcj_thumb_bl_place, 0, 1, web_post_tr(), tbcj_thumb_bl_place, 0, 1, web_post_tl())])
-    shape = union([shape, wall_brace(tbcj_thumb_bl_place, -1, 0, web_post_tl(), tbcj_thumb_bl_place, -1, 0, web_post_bl())])
-    shape = union([shape, wall_brace(tbcj_thumb_bl_place, -1, 0, web_post_tl(), tbcj_thumb_bl_place, 0, 1, web_post_tl())])
-    shape = union([shape, wall_brace(tbcj_thumb_ml_place, 0, 1, web_post_tl(), tbcj_thumb_bl_place, 0, 1, web_post_tr())])
+    shapes = []
+    shapes.append(wall_brace(tbcj_thumb_ml_place, -0.3, 1, web_post_tr(), tbcj_thumb_ml_place, 0, 1, web_post_tl()))
+    shapes.append(wall_brace(tbcj_thumb_bl_place, 0, 1, web_post_tr(), tbcj_thumb_bl_place, 0, 1, web_post_tl()))
+    shapes.append(wall_brace(tbcj_thumb_bl_place, -1, 0, web_post_tl(), tbcj_thumb_bl_place, -1, 0, web_post_bl()))
+    shapes.append(wall_brace(tbcj_thumb_bl_place, -1, 0, web_post_tl(), tbcj_thumb_bl_place, 0, 1, web_post_tl()))
+    shapes.append(wall_brace(tbcj_thumb_ml_place, 0, 1, web_post_tl(), tbcj_thumb_bl_place, 0, 1, web_post_tr()))
 
     corner = box(1,1,tbcj_thickness)
 
@@ -2912,42 +3119,44 @@ def tbcj_thumb_walls(skeleton=False):
         (pa, dxa, dya, sa) = points[i]
         (pb, dxb, dyb, sb) = points[i + 1]
 
-        shape = union([shape, wall_brace(pa, dxa, dya, sa, pb, dxb, dyb, sb)])
+        shapes.append(wall_brace(pa, dxa, dya, sa, pb, dxb, dyb, sb))
 
-    return shape
+    return union(shapes)
 
 
 def mini_thumb_walls(skeleton=False):
     # thumb, walls
-    shape = union([wall_brace(mini_thumb_mr_place, 0, -1, web_post_br(), mini_thumb_tr_place, 0, -1, mini_thumb_post_br())])
-    shape = union([shape, wall_brace(mini_thumb_mr_place, 0, -1, web_post_br(), mini_thumb_mr_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(mini_thumb_br_place, 0, -1, web_post_br(), mini_thumb_br_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(mini_thumb_bl_place, 0, 1, web_post_tr(), mini_thumb_bl_place, 0, 1, web_post_tl())])
-    shape = union([shape, wall_brace(mini_thumb_br_place, -1, 0, web_post_tl(), mini_thumb_br_place, -1, 0, web_post_bl())])
-    shape = union([shape, wall_brace(mini_thumb_bl_place, -1, 0, web_post_tl(), mini_thumb_bl_place, -1, 0, web_post_bl())])
+    shapes = []
+    shapes.append(wall_brace(mini_thumb_mr_place, 0, -1, web_post_br(), mini_thumb_tr_place, 0, -1, mini_thumb_post_br()))
+    shapes.append(wall_brace(mini_thumb_mr_place, 0, -1, web_post_br(), mini_thumb_mr_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(mini_thumb_br_place, 0, -1, web_post_br(), mini_thumb_br_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(mini_thumb_bl_place, 0, 1, web_post_tr(), mini_thumb_bl_place, 0, 1, web_post_tl()))
+    shapes.append(wall_brace(mini_thumb_br_place, -1, 0, web_post_tl(), mini_thumb_br_place, -1, 0, web_post_bl()))
+    shapes.append(wall_brace(mini_thumb_bl_place, -1, 0, web_post_tl(), mini_thumb_bl_place, -1, 0, web_post_bl()))
     # thumb, corners
-    shape = union([shape, wall_brace(mini_thumb_br_place, -1, 0, web_post_bl(), mini_thumb_br_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(mini_thumb_bl_place, -1, 0, web_post_tl(), mini_thumb_bl_place, 0, 1, web_post_tl())])
+    shapes.append(wall_brace(mini_thumb_br_place, -1, 0, web_post_bl(), mini_thumb_br_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(mini_thumb_bl_place, -1, 0, web_post_tl(), mini_thumb_bl_place, 0, 1, web_post_tl()))
     # thumb, tweeners
-    shape = union([shape, wall_brace(mini_thumb_mr_place, 0, -1, web_post_bl(), mini_thumb_br_place, 0, -1, web_post_br())])
-    shape = union([shape, wall_brace(mini_thumb_bl_place, -1, 0, web_post_bl(), mini_thumb_br_place, -1, 0, web_post_tl())])
-    shape = union([shape, wall_brace(mini_thumb_tr_place, 0, -1, mini_thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
+    shapes.append(wall_brace(mini_thumb_mr_place, 0, -1, web_post_bl(), mini_thumb_br_place, 0, -1, web_post_br()))
+    shapes.append(wall_brace(mini_thumb_bl_place, -1, 0, web_post_bl(), mini_thumb_br_place, -1, 0, web_post_tl()))
+    shapes.append(wall_brace(mini_thumb_tr_place, 0, -1, mini_thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl()))
 
-    return shape
+    return union(shapes)
 
 def mini_thumb_connection(side='right', skeleton=False):
     # clunky bit on the top left thumb connection  (normal connectors don't work well)
-    shape = union([bottom_hull(
+    shapes = []
+    shapes.append(bottom_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             mini_thumb_bl_place(translate(web_post_tr(), wall_locate2(-0.3, 1))),
             mini_thumb_bl_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -2955,10 +3164,10 @@ def mini_thumb_connection(side='right', skeleton=False):
             mini_thumb_bl_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
             mini_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -2966,9 +3175,9 @@ def mini_thumb_connection(side='right', skeleton=False):
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             mini_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
+    shapes.append(
         hull_from_shapes(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
@@ -2976,10 +3185,10 @@ def mini_thumb_connection(side='right', skeleton=False):
             key_place(web_post_bl(), 0, cornerrow),
             mini_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             mini_thumb_bl_place(web_post_tr()),
             mini_thumb_bl_place(translate(web_post_tr(), wall_locate1(-0.3, 1))),
@@ -2987,42 +3196,44 @@ def mini_thumb_connection(side='right', skeleton=False):
             mini_thumb_bl_place(translate(web_post_tr(), wall_locate3(-0.3, 1))),
             mini_thumb_tl_place(web_post_tl()),
         ]
-    )])
+    ))
 
-    return shape
+    return union(shapes)
 
 def minidox_thumb_walls(skeleton=False):
 
     # thumb, walls
-    shape = union([wall_brace(minidox_thumb_tr_place, 0, -1, minidox_thumb_post_br(), minidox_thumb_tr_place, 0, -1, minidox_thumb_post_bl())])
-    shape = union([shape, wall_brace(minidox_thumb_tr_place, 0, -1, minidox_thumb_post_bl(), minidox_thumb_tl_place, 0, -1, minidox_thumb_post_br())])
-    shape = union([shape, wall_brace(minidox_thumb_tl_place, 0, -1, minidox_thumb_post_br(), minidox_thumb_tl_place, 0, -1, minidox_thumb_post_bl())])
-    shape = union([shape, wall_brace(minidox_thumb_tl_place, 0, -1, minidox_thumb_post_bl(), minidox_thumb_ml_place, -1, -1, minidox_thumb_post_br())])
-    shape = union([shape, wall_brace(minidox_thumb_ml_place, -1, -1, minidox_thumb_post_br(), minidox_thumb_ml_place, 0, -1, minidox_thumb_post_bl())])
-    shape = union([shape, wall_brace(minidox_thumb_ml_place, 0, -1, minidox_thumb_post_bl(), minidox_thumb_ml_place, -1, 0, minidox_thumb_post_bl())])
+    shapes = []
+    shapes.append(wall_brace(minidox_thumb_tr_place, 0, -1, minidox_thumb_post_br(), minidox_thumb_tr_place, 0, -1, minidox_thumb_post_bl()))
+    shapes.append(wall_brace(minidox_thumb_tr_place, 0, -1, minidox_thumb_post_bl(), minidox_thumb_tl_place, 0, -1, minidox_thumb_post_br()))
+    shapes.append(wall_brace(minidox_thumb_tl_place, 0, -1, minidox_thumb_post_br(), minidox_thumb_tl_place, 0, -1, minidox_thumb_post_bl()))
+    shapes.append(wall_brace(minidox_thumb_tl_place, 0, -1, minidox_thumb_post_bl(), minidox_thumb_ml_place, -1, -1, minidox_thumb_post_br()))
+    shapes.append(wall_brace(minidox_thumb_ml_place, -1, -1, minidox_thumb_post_br(), minidox_thumb_ml_place, 0, -1, minidox_thumb_post_bl()))
+    shapes.append(wall_brace(minidox_thumb_ml_place, 0, -1, minidox_thumb_post_bl(), minidox_thumb_ml_place, -1, 0, minidox_thumb_post_bl()))
     # thumb, corners
-    shape = union([shape, wall_brace(minidox_thumb_ml_place, -1, 0, minidox_thumb_post_bl(), minidox_thumb_ml_place, -1, 0, minidox_thumb_post_tl())])
-    shape = union([shape, wall_brace(minidox_thumb_ml_place, -1, 0, minidox_thumb_post_tl(), minidox_thumb_ml_place, 0, 1, minidox_thumb_post_tl())])
+    shapes.append(wall_brace(minidox_thumb_ml_place, -1, 0, minidox_thumb_post_bl(), minidox_thumb_ml_place, -1, 0, minidox_thumb_post_tl()))
+    shapes.append(wall_brace(minidox_thumb_ml_place, -1, 0, minidox_thumb_post_tl(), minidox_thumb_ml_place, 0, 1, minidox_thumb_post_tl()))
     # thumb, tweeners
-    shape = union([shape, wall_brace(minidox_thumb_ml_place, 0, 1, minidox_thumb_post_tr(), minidox_thumb_ml_place, 0, 1, minidox_thumb_post_tl())])
-    shape = union([shape, wall_brace(minidox_thumb_tr_place, 0, -1, minidox_thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
+    shapes.append(wall_brace(minidox_thumb_ml_place, 0, 1, minidox_thumb_post_tr(), minidox_thumb_ml_place, 0, 1, minidox_thumb_post_tl()))
+    shapes.append(wall_brace(minidox_thumb_tr_place, 0, -1, minidox_thumb_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl()))
 
 
-    return shape
+    return union(shapes)
 
 def minidox_thumb_connection(side='right', skeleton=False):
     # clunky bit on the top left thumb connection  (normal connectors don't work well)
-    shape = union([bottom_hull(
+    shapes = []
+    shapes.append(bottom_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             minidox_thumb_ml_place(translate(minidox_thumb_post_tr(), wall_locate2(-0.3, 1))),
             minidox_thumb_ml_place(translate(minidox_thumb_post_tr(), wall_locate3(-0.3, 1))),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -3030,10 +3241,10 @@ def minidox_thumb_connection(side='right', skeleton=False):
             minidox_thumb_ml_place(translate(minidox_thumb_post_tr(), wall_locate3(-0.3, 1))),
             minidox_thumb_tl_place(minidox_thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -3041,9 +3252,9 @@ def minidox_thumb_connection(side='right', skeleton=False):
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             minidox_thumb_tl_place(minidox_thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
+    shapes.append(
         hull_from_shapes(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
@@ -3051,10 +3262,10 @@ def minidox_thumb_connection(side='right', skeleton=False):
             key_place(web_post_bl(), 0, cornerrow),
             minidox_thumb_tl_place(minidox_thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             minidox_thumb_ml_place(minidox_thumb_post_tr()),
             minidox_thumb_ml_place(translate(minidox_thumb_post_tr(), wall_locate1(0, 1))),
@@ -3062,42 +3273,44 @@ def minidox_thumb_connection(side='right', skeleton=False):
             minidox_thumb_ml_place(translate(minidox_thumb_post_tr(), wall_locate3(0, 1))),
             minidox_thumb_tl_place(minidox_thumb_post_tl()),
         ]
-    )])
+    ))
 
-    return shape
+    return union(shapes)
 
 
 
 def carbonfet_thumb_walls(skeleton=False):
     # thumb, walls
-    shape = union([wall_brace(carbonfet_thumb_mr_place, 0, -1, web_post_br(), carbonfet_thumb_tr_place, 0, -1, web_post_br())])
-    shape = union([shape, wall_brace(carbonfet_thumb_mr_place, 0, -1, web_post_br(), carbonfet_thumb_mr_place, 0, -1.15, web_post_bl())])
-    shape = union([shape, wall_brace(carbonfet_thumb_br_place, 0, -1, web_post_br(), carbonfet_thumb_br_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(carbonfet_thumb_bl_place, -.3, 1, thumb_post_tr(), carbonfet_thumb_bl_place, 0, 1, thumb_post_tl())])
-    shape = union([shape, wall_brace(carbonfet_thumb_br_place, -1, 0, web_post_tl(), carbonfet_thumb_br_place, -1, 0, web_post_bl())])
-    shape = union([shape, wall_brace(carbonfet_thumb_bl_place, -1, 0, thumb_post_tl(), carbonfet_thumb_bl_place, -1, 0, web_post_bl())])
+    shapes = []
+    shapes.append(wall_brace(carbonfet_thumb_mr_place, 0, -1, web_post_br(), carbonfet_thumb_tr_place, 0, -1, web_post_br()))
+    shapes.append(wall_brace(carbonfet_thumb_mr_place, 0, -1, web_post_br(), carbonfet_thumb_mr_place, 0, -1.15, web_post_bl()))
+    shapes.append(wall_brace(carbonfet_thumb_br_place, 0, -1, web_post_br(), carbonfet_thumb_br_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(carbonfet_thumb_bl_place, -.3, 1, thumb_post_tr(), carbonfet_thumb_bl_place, 0, 1, thumb_post_tl()))
+    shapes.append(wall_brace(carbonfet_thumb_br_place, -1, 0, web_post_tl(), carbonfet_thumb_br_place, -1, 0, web_post_bl()))
+    shapes.append(wall_brace(carbonfet_thumb_bl_place, -1, 0, thumb_post_tl(), carbonfet_thumb_bl_place, -1, 0, web_post_bl()))
     # thumb, corners
-    shape = union([shape, wall_brace(carbonfet_thumb_br_place, -1, 0, web_post_bl(), carbonfet_thumb_br_place, 0, -1, web_post_bl())])
-    shape = union([shape, wall_brace(carbonfet_thumb_bl_place, -1, 0, thumb_post_tl(), carbonfet_thumb_bl_place, 0, 1, thumb_post_tl())])
+    shapes.append(wall_brace(carbonfet_thumb_br_place, -1, 0, web_post_bl(), carbonfet_thumb_br_place, 0, -1, web_post_bl()))
+    shapes.append(wall_brace(carbonfet_thumb_bl_place, -1, 0, thumb_post_tl(), carbonfet_thumb_bl_place, 0, 1, thumb_post_tl()))
     # thumb, tweeners
-    shape = union([shape, wall_brace(carbonfet_thumb_mr_place, 0, -1.15, web_post_bl(), carbonfet_thumb_br_place, 0, -1, web_post_br())])
-    shape = union([shape, wall_brace(carbonfet_thumb_bl_place, -1, 0, web_post_bl(), carbonfet_thumb_br_place, -1, 0, web_post_tl())])
-    shape = union([shape, wall_brace(carbonfet_thumb_tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl())])
-    return shape
+    shapes.append(wall_brace(carbonfet_thumb_mr_place, 0, -1.15, web_post_bl(), carbonfet_thumb_br_place, 0, -1, web_post_br()))
+    shapes.append(wall_brace(carbonfet_thumb_bl_place, -1, 0, web_post_bl(), carbonfet_thumb_br_place, -1, 0, web_post_tl()))
+    shapes.append(wall_brace(carbonfet_thumb_tr_place, 0, -1, web_post_br(), (lambda sh: key_place(sh, 3, lastrow)), 0, -1, web_post_bl()))
+    return union(shapes)
 
 def carbonfet_thumb_connection(side='right', skeleton=False):
     # clunky bit on the top left thumb connection  (normal connectors don't work well)
-    shape = bottom_hull(
+    shapes = []
+    shapes.append(bottom_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             carbonfet_thumb_bl_place(translate(thumb_post_tr(), wall_locate2(-0.3, 1))),
             carbonfet_thumb_bl_place(translate(thumb_post_tr(), wall_locate3(-0.3, 1))),
         ]
-    )
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             left_key_place(translate(web_post(), wall_locate2(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -3105,10 +3318,10 @@ def carbonfet_thumb_connection(side='right', skeleton=False):
             carbonfet_thumb_bl_place(translate(thumb_post_tr(), wall_locate3(-0.3, 1))),
             carbonfet_thumb_ml_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
             left_key_place(translate(web_post(), wall_locate1(-1, 0)), cornerrow, -1, low_corner=True, side=side),
@@ -3116,9 +3329,9 @@ def carbonfet_thumb_connection(side='right', skeleton=False):
             left_key_place(translate(web_post(), wall_locate3(-1, 0)), cornerrow, -1, low_corner=True, side=side),
             carbonfet_thumb_ml_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
+    shapes.append(
         hull_from_shapes(
         [
             left_key_place(web_post(), cornerrow, -1, low_corner=True, side=side),
@@ -3126,10 +3339,10 @@ def carbonfet_thumb_connection(side='right', skeleton=False):
             key_place(web_post_bl(), 0, cornerrow),
             carbonfet_thumb_ml_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    shape = union([shape,
-        hull_from_shapes(
+    shapes.append(
+        floor_hull(
         [
             carbonfet_thumb_bl_place(thumb_post_tr()),
             carbonfet_thumb_bl_place(translate(thumb_post_tr(), wall_locate1(-0.3, 1))),
@@ -3137,10 +3350,11 @@ def carbonfet_thumb_connection(side='right', skeleton=False):
             carbonfet_thumb_bl_place(translate(thumb_post_tr(), wall_locate3(-0.3, 1))),
             carbonfet_thumb_ml_place(thumb_post_tl()),
         ]
-    )])
+    ))
 
-    return shape
+    return union(shapes)
 
+@cached_subassembly
 def case_walls(side='right', skeleton=False):
     print('case_walls()')
     return (
@@ -3155,18 +3369,21 @@ def case_walls(side='right', skeleton=False):
     )
 
 
-rj9_start = list(
-    np.array([0, -3, 0])
-    + np.array(
-        key_position(
-            list(np.array(wall_locate3(0, 1)) + np.array([0, (mount_height / 2), 0])),
-            0,
-            0,
+@position_update
+def update_rj9_position():
+    global rj9_start, rj9_position
+    rj9_start = list(
+        np.array([0, -3, 0])
+        + np.array(
+            key_position(
+                list(np.array(wall_locate3(0, 1)) + np.array([0, (mount_height / 2), 0])),
+                0,
+                0,
+            )
         )
     )
-)
 
-rj9_position = (rj9_start[0], rj9_start[1], 11)
+    rj9_position = (rj9_start[0], rj9_start[1], 11)
 
 
 def rj9_cube():
@@ -3190,9 +3407,14 @@ def rj9_holder():
     return shape
 
 
-usb_holder_position = key_position(
-    list(np.array(wall_locate2(0, 1)) + np.array([0, (mount_height / 2), 0])), 1, 0
-)
+@position_update
+def update_usb_holder_position():
+    global usb_holder_position
+    usb_holder_position = key_position(
+        list(np.array(wall_locate2(0, 1)) + np.array([0, (mount_height / 2), 0])), 1, 0
+    )
+
+
 usb_holder_size = [6.5, 10.0, 13.6]
 usb_holder_thickness = 4
 
@@ -3227,17 +3449,20 @@ def usb_holder_hole():
     return shape
 
 
-external_start = list(
-    # np.array([0, -3, 0])
-    np.array([external_holder_width / 2, 0, 0])
-    + np.array(
-        key_position(
-            list(np.array(wall_locate3(0, 1)) + np.array([0, (mount_height / 2), 0])),
-            0,
-            0,
+@position_update
+def update_external_start():
+    global external_start
+    external_start = list(
+        # np.array([0, -3, 0])
+        np.array([external_holder_width / 2, 0, 0])
+        + np.array(
+            key_position(
+                list(np.array(wall_locate3(0, 1)) + np.array([0, (mount_height / 2), 0])),
+                0,
+                0,
+            )
         )
     )
-)
 
 def external_mount_hole():
     print('external_mount_hole()')
@@ -3256,14 +3481,17 @@ def external_mount_hole():
 
 
 
-pcb_mount_ref_position = key_position(
-    #TRRS POSITION IS REFERENCE BY CONVENIENCE
-    list(np.array(wall_locate3(0, 1)) + np.array([0, (mount_height / 2), 0])), 0, 0
-)
+@position_update
+def update_pcb_mount_ref_position():
+    global pcb_mount_ref_position
+    pcb_mount_ref_position = key_position(
+        #TRRS POSITION IS REFERENCE BY CONVENIENCE
+        list(np.array(wall_locate3(0, 1)) + np.array([0, (mount_height / 2), 0])), 0, 0
+    )
 
-pcb_mount_ref_position[0] = pcb_mount_ref_position[0] + pcb_mount_ref_offset[0]
-pcb_mount_ref_position[1] = pcb_mount_ref_position[1] + pcb_mount_ref_offset[1]
-pcb_mount_ref_position[2] = 0.0 + pcb_mount_ref_offset[2]
+    pcb_mount_ref_position[0] = pcb_mount_ref_position[0] + pcb_mount_ref_offset[0]
+    pcb_mount_ref_position[1] = pcb_mount_ref_position[1] + pcb_mount_ref_offset[1]
+    pcb_mount_ref_position[2] = 0.0 + pcb_mount_ref_offset[2]
 
 def pcb_usb_hole():
     debugprint('pcb_holder()')
@@ -3284,11 +3512,14 @@ def pcb_usb_hole():
 
 
 
-pcb_holder_position = copy.deepcopy(pcb_mount_ref_position)
-pcb_holder_position[0] = pcb_holder_position[0] + pcb_holder_offset[0]
-pcb_holder_position[1] = pcb_holder_position[1] + pcb_holder_offset[1]
-pcb_holder_position[2] = pcb_holder_position[2] + pcb_holder_offset[2]
-pcb_holder_thickness = pcb_holder_size[2]
+@position_update
+def update_pcb_holder_position():
+    global pcb_holder_position, pcb_holder_thickness
+    pcb_holder_position = copy.deepcopy(pcb_mount_ref_position)
+    pcb_holder_position[0] = pcb_holder_position[0] + pcb_holder_offset[0]
+    pcb_holder_position[1] = pcb_holder_position[1] + pcb_holder_offset[1]
+    pcb_holder_position[2] = pcb_holder_position[2] + pcb_holder_offset[2]
+    pcb_holder_thickness = pcb_holder_size[2]
 
 def pcb_holder():
     debugprint('pcb_holder()')
@@ -3339,8 +3570,11 @@ def trrs_hole():
     )
     return shape
 
-pcb_screw_position = copy.deepcopy(pcb_mount_ref_position)
-pcb_screw_position[1] = pcb_screw_position[1] + pcb_screw_y_offset
+@position_update
+def update_pcb_screw_position():
+    global pcb_screw_position
+    pcb_screw_position = copy.deepcopy(pcb_mount_ref_position)
+    pcb_screw_position[1] = pcb_screw_position[1] + pcb_screw_y_offset
 
 def pcb_screw_hole():
     debugprint('pcb_screw_hole()')
@@ -3354,24 +3588,26 @@ def pcb_screw_hole():
     return holes
 
 
-if oled_center_row is not None:
-    base_pt1 = key_position(
-        list(np.array([-mount_width/2, 0, 0]) + np.array([0, (mount_height / 2), 0])), 0, oled_center_row-1
-    )
-    base_pt2 = key_position(
-        list(np.array([-mount_width/2, 0, 0]) + np.array([0, (mount_height / 2), 0])), 0, oled_center_row+1
-    )
-    base_pt0 = key_position(
-        list(np.array([-mount_width / 2, 0, 0]) + np.array([0, (mount_height / 2), 0])), 0, oled_center_row
+def left_edge_positions(center_row):
+    # Top left corner of column 0 for the rows above, below and at center_row, in one batch.
+    return key_positions(
+        [-mount_width / 2, mount_height / 2, 0], 0, [center_row - 1, center_row + 1, center_row]
     )
 
-    oled_mount_location_xyz = (np.array(base_pt1)+np.array(base_pt2))/2. + np.array(((-left_wall_x_offset/2), 0, 0)) + np.array(oled_translation_offset)
-    oled_mount_location_xyz[2] = (oled_mount_location_xyz[2] + base_pt0[2])/2
 
-    angle_x = np.arctan2(base_pt1[2] - base_pt2[2], base_pt1[1] - base_pt2[1])
-    angle_z = np.arctan2(base_pt1[0] - base_pt2[0], base_pt1[1] - base_pt2[1])
+@position_update
+def update_oled_mount_position():
+    global oled_mount_location_xyz, oled_mount_rotation_xyz
+    if oled_center_row is not None:
+        base_pt1, base_pt2, base_pt0 = left_edge_positions(oled_center_row)
+
+        oled_mount_location_xyz = (np.array(base_pt1)+np.array(base_pt2))/2. + np.array(((-left_wall_x_offset/2), 0, 0)) + np.array(oled_translation_offset)
+        oled_mount_location_xyz[2] = (oled_mount_location_xyz[2] + base_pt0[2])/2
+
+        angle_x = np.arctan2(base_pt1[2] - base_pt2[2], base_pt1[1] - base_pt2[1])
+        angle_z = np.arctan2(base_pt1[0] - base_pt2[0], base_pt1[1] - base_pt2[1])
 
-    oled_mount_rotation_xyz = (rad2deg(angle_x), 0, -rad2deg(angle_z)) + np.array(oled_rotation_offset)
+        oled_mount_rotation_xyz = (rad2deg(angle_x), 0, -rad2deg(angle_z)) + np.array(oled_rotation_offset)
 
 
 
@@ -3426,18 +3662,7 @@ def generate_trackball_in_cluster():
 
 
 def tbiw_position_rotation():
-    base_pt1 = key_position(
-        list(np.array([-mount_width/2, 0, 0]) + np.array([0, (mount_height / 2), 0])),
-        0, cornerrow - tbiw_ball_center_row - 1
-    )
-    base_pt2 = key_position(
-        list(np.array([-mount_width/2, 0, 0]) + np.array([0, (mount_height / 2), 0])),
-        0, cornerrow - tbiw_ball_center_row + 1
-    )
-    base_pt0 = key_position(
-        list(np.array([-mount_width / 2, 0, 0]) + np.array([0, (mount_height / 2), 0])),
-        0, cornerrow - tbiw_ball_center_row
-    )
+    base_pt1, base_pt2, base_pt0 = left_edge_positions(cornerrow - tbiw_ball_center_row)
 
     left_wall_x_offset = tbiw_left_wall_x_offset_override
 
@@ -3474,15 +3699,7 @@ def oled_position_rotation(side='right'):
         _oled_rotation_offset = oled_rotation_offset
 
     if _oled_center_row is not None:
-        base_pt1 = key_position(
-            list(np.array([-mount_width/2, 0, 0]) + np.array([0, (mount_height / 2), 0])), 0, _oled_center_row-1
-        )
-        base_pt2 = key_position(
-            list(np.array([-mount_width/2, 0, 0]) + np.array([0, (mount_height / 2), 0])), 0, _oled_center_row+1
-        )
-        base_pt0 = key_position(
-            list(np.array([-mount_width / 2, 0, 0]) + np.array([0, (mount_height / 2), 0])), 0, _oled_center_row
-        )
+        base_pt1, base_pt2, base_pt0 = left_edge_positions(_oled_center_row)
 
         if trackball_in_wall and (side == ball_side or ball_side == 'both'):
             _left_wall_x_offset = tbiw_left_wall_x_offset_override
@@ -3503,6 +3720,7 @@ def oled_position_rotation(side='right'):
 
     return oled_mount_location_xyz, oled_mount_rotation_xyz
 
+@cached_subassembly
 def oled_sliding_mount_frame(side='right'):
     mount_ext_width = oled_mount_width + 2 * oled_mount_rim
     mount_ext_height = (
@@ -3601,6 +3819,7 @@ def oled_sliding_mount_frame(side='right'):
     return hole, shape
 
 
+@cached_subassembly
 def oled_clip_mount_frame(side='right'):
     mount_ext_width = oled_mount_width + 2 * oled_mount_rim
     mount_ext_height = (
@@ -3725,6 +3944,7 @@ def oled_clip():
     return shape
 
 
+@cached_subassembly
 def oled_undercut_mount_frame(side='right'):
     mount_ext_width = oled_mount_width + 2 * oled_mount_rim
     mount_ext_height = oled_mount_height + 2 * oled_mount_rim
@@ -3767,8 +3987,7 @@ def oled_undercut_mount_frame(side='right'):
 
 def teensy_holder():
     print('teensy_holder()')
-    teensy_top_xy = key_position(wall_locate3(-1, 0), 0, centerrow - 1)
-    teensy_bot_xy = key_position(wall_locate3(-1, 0), 0, centerrow + 1)
+    teensy_top_xy, teensy_bot_xy = key_positions(wall_locate3(-1, 0), 0, [centerrow - 1, centerrow + 1])
     teensy_holder_length = teensy_top_xy[1] - teensy_bot_xy[1]
     teensy_holder_offset = -teensy_holder_length / 2
     teensy_holder_top_offset = (teensy_holder_top_length / 2) - teensy_holder_length
@@ -3824,13 +4043,9 @@ def screw_insert_shape(bottom_radius, top_radius, height):
     return shape
 
 
-def screw_insert(column, row, bottom_radius, top_radius, height, side='right'):
-    debugprint('screw_insert()')
-    shift_right = column == lastcol
-    shift_left = column == 0
-    shift_up = (not (shift_right or shift_left)) and (row == 0)
-    shift_down = (not (shift_right or shift_left)) and (row >= lastrow)
-
+def screw_insert_positions(locations, side='right'):
+    debugprint('screw_insert_positions()')
+    # Insert positions for a list of (column, row), the key relative ones are placed in one key_positions() batch.
     if screws_offset == 'INSIDE':
         # debugprint('Shift Inside')
         shift_left_adjust = wall_base_x_thickness
@@ -3852,30 +4067,41 @@ def screw_insert(column, row, bottom_radius, top_radius, height, side='right'):
         shift_down_adjust = 0
         shift_up_adjust = 0
 
-    if shift_up:
-        position = key_position(
-            list(np.array(wall_locate2(0, 1)) + np.array([0, (mount_height / 2) + shift_up_adjust, 0])),
-            column,
-            row,
-        )
-    elif shift_down:
-        position = key_position(
-            list(np.array(wall_locate2(0, -1)) - np.array([0, (mount_height / 2) + shift_down_adjust, 0])),
-            column,
-            row,
-        )
-    elif shift_left:
-        position = list(
-            np.array(left_key_position(row, 0, side=side)) + np.array(wall_locate3(-1, 0)) + np.array((shift_left_adjust,0,0))
-        )
-    else:
-        position = key_position(
-            list(np.array(wall_locate2(1, 0)) + np.array([(mount_height / 2), 0, 0]) + np.array((shift_right_adjust,0,0))
-                 ),
-            column,
-            row,
-        )
+    positions = [None] * len(locations)
+    points, columns, rows, slots = [], [], [], []
+    for index, (column, row) in enumerate(locations):
+        shift_right = column == lastcol
+        shift_left = column == 0
+        shift_up = (not (shift_right or shift_left)) and (row == 0)
+        shift_down = (not (shift_right or shift_left)) and (row >= lastrow)
+
+        if shift_up:
+            point = np.array(wall_locate2(0, 1)) + np.array([0, (mount_height / 2) + shift_up_adjust, 0])
+        elif shift_down:
+            point = np.array(wall_locate2(0, -1)) - np.array([0, (mount_height / 2) + shift_down_adjust, 0])
+        elif shift_left:
+            positions[index] = list(
+                np.array(left_key_position(row, 0, side=side)) + np.array(wall_locate3(-1, 0)) + np.array((shift_left_adjust,0,0))
+            )
+            continue
+        else:
+            point = np.array(wall_locate2(1, 0)) + np.array([(mount_height / 2), 0, 0]) + np.array((shift_right_adjust,0,0))
 
+        points.append(point)
+        columns.append(column)
+        rows.append(row)
+        slots.append(index)
+
+    if points:
+        for index, position in zip(slots, key_positions(points, columns, rows)):
+            positions[index] = list(position)
+
+    return positions
+
+
+def screw_insert(column, row, bottom_radius, top_radius, height, side='right'):
+    debugprint('screw_insert()')
+    position = screw_insert_positions([(column, row)], side=side)[0]
 
     shape = screw_insert_shape(bottom_radius, top_radius, height)
     shape = translate(shape, [position[0], position[1], height / 2])
@@ -3888,6 +4114,14 @@ def thumb_screw_insert(bottom_radius, top_radius, height, offset=None, side='rig
     if offset is None:
         offset = 0.0
 
+    for position in thumb_screw_insert_positions(side=side):
+        shapes.append(translate(shape, [position[0], position[1], height / 2 + offset]))
+
+    return shapes
+
+
+def thumb_screw_insert_positions(side='right'):
+    # [x, y] of each thumb cluster screw insert.
     origin = thumborigin()
 
     if ('TRACKBALL' in thumb_style) and not (side == ball_side or ball_side == 'both'):
@@ -3932,26 +4166,31 @@ def thumb_screw_insert(bottom_radius, top_radius, height, offset=None, side='rig
         else:
             xypositions = copy.deepcopy(default_thumb_screw_xy_locations)
 
+    positions = []
     for xyposition in xypositions:
         position = list(np.array(origin) + np.array([*xyposition, -origin[2]]))
-        shapes.append(translate(shape, [position[0], position[1], height / 2 + offset]))
+        positions.append(position[:2])
 
-    return shapes
+    return positions
 
 def screw_insert_all_shapes(bottom_radius, top_radius, height, offset=0, side='right'):
     print('screw_insert_all_shapes()')
-    shape = (
-        translate(screw_insert(0, 0, bottom_radius, top_radius, height, side=side), (0, 0, offset)),
-        translate(screw_insert(0, cornerrow, bottom_radius, top_radius, height, side=side), (0, left_wall_lower_y_offset, offset)),
-        translate(screw_insert(3, lastrow, bottom_radius, top_radius, height, side=side), (0, 0, offset)),
-        translate(screw_insert(3, 0, bottom_radius, top_radius, height, side=side), (0,0, offset)),
-        translate(screw_insert(lastcol, 0, bottom_radius, top_radius, height, side=side), (0, 0, offset)),
-        translate(screw_insert(lastcol, cornerrow, bottom_radius, top_radius, height, side=side), (0, 0, offset)),
-        # translate(screw_insert_thumb(bottom_radius, top_radius, height), (0, 0, offset)),
+    insert = screw_insert_shape(bottom_radius, top_radius, height)
+    shape = tuple(
+        translate(insert, [position[0], position[1], height / 2 + offset])
+        for position in screw_insert_all_positions(side=side)
     )
 
     return shape
 
+
+def screw_insert_all_positions(side='right'):
+    # [x, y] of each case screw insert.
+    locations = [(0, 0), (0, cornerrow), (3, lastrow), (3, 0), (lastcol, 0), (lastcol, cornerrow)]
+    offsets = [(0, 0), (0, left_wall_lower_y_offset), (0, 0), (0, 0), (0, 0), (0, 0)]
+    positions = screw_insert_positions(locations, side=side)
+    return [[position[0] + dx, position[1] + dy] for position, (dx, dy) in zip(positions, offsets)]
+
 def thumb_screw_insert_holes(side='right'):
     return thumb_screw_insert(
         screw_insert_bottom_radius, screw_insert_top_radius, screw_insert_height+.02, offset=-.01, side=side
@@ -4023,65 +4262,177 @@ def wire_posts():
     return shape
 
 
-def model_side(side="right"):
-    print('model_right()')
-    #shape = add([key_holes(side=side)])
-    shape = union([key_holes(side=side)])
-    if debug_exports:
-        export_file(shape=shape, fname=path.join(r"..", "things", r"debug_key_plates"))
-    connector_shape = connectors()
-    shape = union([shape, connector_shape])
+def pool_context():
+    # fork hands the configured module straight to the workers, spawn re-runs the bootstrap from sys.argv.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def worker_stats():
+    # Helper profile stats and trace events a worker hands back to its parent, None for each one that is off.
+    # A forked worker starts from a copy of the parent's, so those are dropped first.
+    stats = (
+        None if helper_profile is None else helper_profile.stats,
+        None if build_trace is None else build_trace.events,
+    )
+    if helper_profile is not None:
+        helper_profile.reset()
+    if build_trace is not None:
+        build_trace.reset()
+    return stats
+
+
+def merge_worker_stats(stats):
+    profile_stats, trace_events = stats
+    if profile_stats is not None:
+        helper_profile.merge(profile_stats)
+    if trace_events is not None:
+        build_trace.merge(trace_events)
+
+
+def build_subassembly(name, kwargs):
+    # Worker side of build_subassemblies(), the shape goes back to the parent as serialized BRep.
+    worker_stats()
+    shape = serialize_shape(globals()[name](**kwargs))
+    return shape, worker_stats()
+
+
+def subassembly_store_key(name, kwargs):
+    # thumb_walls(side='right') and thumb_walls(side='right', skeleton=False) are the same part.
+    arguments = inspect.signature(globals()[name]).bind(**kwargs)
+    arguments.apply_defaults()
+    return name, tuple(sorted(arguments.arguments.items()))
+
+
+def subassemblies(requests):
+    # [(function name, kwargs), ...] independent parts.  Parts built earlier in this run come from
+    # subassembly_store, so baseplate() reuses what model_side() built for the same side.
+    if subassembly_store is None:
+        return build_subassemblies(requests)
+
+    keys = [subassembly_store_key(name, kwargs) for name, kwargs in requests]
+    missing = {key: request for key, request in zip(keys, requests) if key not in subassembly_store}
+    for key in keys:
+        if key not in missing:
+            debugprint('{}() reused from this run'.format(key[0]))
+    subassembly_store.update(zip(missing, build_subassemblies(list(missing.values()))))
+    return [subassembly_store[key] for key in keys]
+
+
+def build_subassemblies(requests):
+    # Build [(function name, kwargs), ...] independent parts, in a process pool when jobs > 1.
+    if jobs <= 1 or len(requests) < 2:
+        return [globals()[name](**kwargs) for name, kwargs in requests]
+
+    print('subassemblies() using {} workers'.format(min(jobs, len(requests))))
+    with ProcessPoolExecutor(max_workers=min(jobs, len(requests)), mp_context=pool_context()) as pool:
+        futures = [pool.submit(build_subassembly, name, kwargs) for name, kwargs in requests]
+        shapes = []
+        for future in futures:
+            shape, stats = future.result()
+            merge_worker_stats(stats)
+            shapes.append(deserialize_shape(shape))
+        return shapes
+
+
+def plates_only_asymmetry():
+    # True when the halves differ in nothing but their key plates: the left half is then the right half's walls,
+    # webs, thumb section and fixtures with left-handed plates.  A trackball sits on one side or cuts into the
+    # plates around it, and PCB cutouts off the switch axis are mirrored along with the plate.
+    if 'TRACKBALL' in thumb_style or trackball_in_wall:
+        return False
+    return not (plate_pcb_clear and plate_pcb_offset[0] != 0)
+
+
+def side_sections(side="right", plates=True):
+    # The case and thumb section of model_side() before their last cuts:
+    # (main_shape, main_cuts, thumb_section, thumb_cuts, opening_cuts, ball).  With plates=False the key
+    # plates and thumb plates are left out.  opening_cuts are the cuts main_shape had between its key plates
+    # going in and main_cuts, ball the cluster trackball or None.
+    requests = [
+        ('key_holes', dict(side=side)),
+        ('connectors', dict()),
+        ('case_walls', dict(side=side, skeleton=skeletal)),
+        ('thumb', dict(side=side)),
+        ('thumb_connectors', dict(side=side)),
+        ('thumb_walls', dict(side=side, skeleton=skeletal)),
+        ('thumb_connection', dict(side=side, skeleton=skeletal)),
+    ]
+    if not plates:
+        requests = [(name, kwargs) for name, kwargs in requests if name not in ['key_holes', 'thumb']]
+    parts = dict(zip([name for name, kwargs in requests], subassemblies(requests)))
+    connector_shape, walls_shape = parts['connectors'], parts['case_walls']
+    thumb_connector_shape, thumb_wall_shape = parts['thumb_connectors'], parts['thumb_walls']
+    thumb_connection_shape = parts['thumb_connection']
+
+    if plates:
+        #shape = add([key_holes(side=side)])
+        shape = union([parts['key_holes']])
+        if debug_exports:
+            export_file(shape=shape, fname=path.join(r"..", "things", r"debug_key_plates"))
+        shape = union([shape, connector_shape])
+    else:
+        shape = union([connector_shape])
     if debug_exports:
         export_file(shape=shape, fname=path.join(r"..", "things", r"debug_connector_shape"))
-    walls_shape = case_walls(side=side, skeleton=skeletal)
     if debug_exports:
         export_file(shape=walls_shape, fname=path.join(r"..", "things", r"debug_walls_shape"))
 
     s2 = union([walls_shape])
     s2 = union([s2, *screw_insert_outers(side=side)])
 
+    # Cuts are collected and made in one difference() wherever no union comes in between.
+    cuts = []
+
     if controller_mount_type in ['RJ9_USB_TEENSY', 'USB_TEENSY']:
         s2 = union([s2, teensy_holder()])
 
     if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL', 'USB_WALL', 'USB_TEENSY']:
         s2 = union([s2, usb_holder()])
-        s2 = difference(s2, [usb_holder_hole()])
+        cuts.append(usb_holder_hole())
 
     if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL']:
-        s2 = difference(s2, [rj9_space()])
+        cuts.append(rj9_space())
 
     if controller_mount_type in ['EXTERNAL']:
-        s2 = difference(s2, [external_mount_hole()])
+        cuts.append(external_mount_hole())
 
     if controller_mount_type in ['PCB_MOUNT']:
-        s2 = difference(s2, [pcb_usb_hole()])
-        s2 = difference(s2, [trrs_hole()])
+        cuts.append(pcb_usb_hole())
+        cuts.append(trrs_hole())
+        # The holder goes in after the USB / TRRS openings and before the remaining cuts.
+        s2 = difference(s2, cuts)
         s2 = union([s2, pcb_holder()])
-        s2 = difference(s2, [wall_thinner()])
-        s2 = difference(s2, pcb_screw_hole())
+        cuts = [wall_thinner(), *pcb_screw_hole()]
 
     if controller_mount_type in [None, 'None']:
         0 # do nothing, only here to expressly state inaction.
 
-    s2 = difference(s2, [union(screw_insert_holes(side=side))])
+    cuts.extend(screw_insert_holes(side=side))
+    s2 = difference(s2, cuts)
     shape = union([shape, s2])
 
     if controller_mount_type in ['RJ9_USB_TEENSY', 'RJ9_USB_WALL']:
         shape = union([shape, rj9_holder()])
 
+    opening_cuts = []
     if oled_mount_type == "UNDERCUT":
         hole, frame = oled_undercut_mount_frame(side=side)
         shape = difference(shape, [hole])
+        opening_cuts.append(hole)
         shape = union([shape, frame])
 
     elif oled_mount_type == "SLIDING":
         hole, frame = oled_sliding_mount_frame(side=side)
         shape = difference(shape, [hole])
+        opening_cuts.append(hole)
         shape = union([shape, frame])
 
     elif oled_mount_type == "CLIP":
         hole, frame = oled_clip_mount_frame(side=side)
         shape = difference(shape, [hole])
+        opening_cuts.append(hole)
         shape = union([shape, frame])
 
     if trackball_in_wall and (side == ball_side or ball_side == 'both') and separable_thumb:
@@ -4099,38 +4450,38 @@ def model_side(side="right"):
         if show_caps:
             shape = add([shape, ball])
 
-    if plate_pcb_clear:
-        shape = difference(shape, [plate_pcb_cutouts(side=side)])
-
     main_shape = shape
+    main_cuts = []
+    if plate_pcb_clear:
+        main_cuts.extend(plate_pcb_cutouts(side=side))
 
     #BUILD THUMB
 
-    thumb_shape = thumb(side=side)
-    if debug_exports:
-        export_file(shape=thumb_shape, fname=path.join(r"..", "things", r"debug_thumb_shape"))
-    thumb_connector_shape = thumb_connectors(side=side)
+    if debug_exports and plates:
+        export_file(shape=parts['thumb'], fname=path.join(r"..", "things", r"debug_thumb_shape"))
     if debug_exports:
         export_file(shape=thumb_connector_shape, fname=path.join(r"..", "things", r"debug_thumb_connector_shape"))
 
-    thumb_wall_shape = thumb_walls(side=side, skeleton=skeletal)
     thumb_wall_shape = union([thumb_wall_shape, *thumb_screw_insert_outers(side=side)])
-    thumb_connection_shape = thumb_connection(side=side, skeleton=skeletal)
 
 
+    thumb_shapes = [thumb_connector_shape, thumb_wall_shape, thumb_connection_shape]
+    if plates:
+        thumb_shapes.insert(0, parts['thumb'])
+
     if debug_exports:
-        thumb_test = union([thumb_shape, thumb_connector_shape, thumb_wall_shape, thumb_connection_shape])
+        thumb_test = union(thumb_shapes)
         export_file(shape=thumb_test, fname=path.join(r"..", "things", r"debug_thumb_test_{}_shape".format(side)))
 
-    thumb_section = union([thumb_shape, thumb_connector_shape, thumb_wall_shape, thumb_connection_shape])
-    thumb_section = difference(thumb_section, [union(thumb_screw_insert_holes(side=side))])
+    thumb_section = union(thumb_shapes)
+    thumb_cuts = list(thumb_screw_insert_holes(side=side))
 
-    has_trackball = False
+    ball = None
     if ('TRACKBALL' in thumb_style) and (side == ball_side or ball_side == 'both'):
         print("Has Trackball")
         tbprecut, tb, tbcutout, sensor, ball = generate_trackball_in_cluster()
-        has_trackball = True
-        thumb_section = difference(thumb_section, [tbprecut])
+        thumb_section = difference(thumb_section, [*thumb_cuts, tbprecut])
+        thumb_cuts = []
         if debug_exports:
             export_file(shape=thumb_section, fname=path.join(r"..", "things", r"debug_thumb_test_1_shape".format(side)))
         thumb_section = union([thumb_section, tb])
@@ -4144,12 +4495,44 @@ def model_side(side="right"):
             export_file(shape=thumb_section, fname=path.join(r"..", "things", r"debug_thumb_test_4_shape".format(side)))
 
     if plate_pcb_clear:
-        thumb_section = difference(thumb_section, [thumb_pcb_plate_cutouts(side=side)])
+        thumb_cuts.append(thumb_pcb_plate_cutouts(side=side))
+
+    return main_shape, main_cuts, thumb_section, thumb_cuts, opening_cuts, ball
+
+
+def plateless_sections():
+    # side_sections(plates=False) cut and clipped, built once per run and shared by both halves of a build
+    # whose halves differ only in their plates.  The plates get the same cuts when they go in.
+    key = ('plateless_sections', ())
+    if subassembly_store is not None and key in subassembly_store:
+        debugprint('plateless_sections() reused from this run')
+        return subassembly_store[key]
+
+    main_shape, main_cuts, thumb_section, thumb_cuts, opening_cuts, ball = side_sections(plates=False)
+    sections = (
+        clip_below(difference(main_shape, main_cuts)), opening_cuts + main_cuts,
+        clip_below(difference(thumb_section, thumb_cuts)), thumb_cuts,
+    )
+    if subassembly_store is not None:
+        subassembly_store[key] = sections
+    return sections
+
+
+@cached_subassembly
+def model_side(side="right"):
+    print('model_right()')
+    if symmetry == "asymmetric" and plates_only_asymmetry():
+        # (walls + plates) - cuts is (walls - cuts) + (plates - cuts): only the plates are built per side.
+        main_shape, main_cuts, thumb_section, thumb_cuts = plateless_sections()
+        main_shape = union([main_shape, clip_below(difference(key_holes(side=side), main_cuts))])
+        thumb_section = union([thumb_section, clip_below(difference(thumb(side=side), thumb_cuts))])
+        ball = None
+    else:
+        main_shape, main_cuts, thumb_section, thumb_cuts, opening_cuts, ball = side_sections(side=side)
+        main_shape = clip_below(difference(main_shape, main_cuts))
+        thumb_section = clip_below(difference(thumb_section, thumb_cuts))
+    has_trackball = ball is not None
 
-    block = box(350, 350, 40)
-    block = translate(block, (0, 0, -20))
-    main_shape = difference(main_shape, [block])
-    thumb_section = difference(thumb_section, [block])
     if debug_exports:
         export_file(shape=thumb_section, fname=path.join(r"..", "things", r"debug_thumb_test_5_shape".format(side)))
 
@@ -4197,23 +4580,98 @@ def model_side(side="right"):
     return main_shape, thumb_section
 
 
+def section_baseplate(shape):
+    # The plate the cadquery branch of baseplate() builds, from the outlines of the cut through the walls at
+    # z = 0 instead of B-rep wires.  Used by the engines without cadquery's wire selectors.
+    outlines = section_outlines(shape, 0.0)
+    return outline_baseplate(outlines, [outline_points(outline) for outline in outlines])
+
+
+def footprint_baseplate(side='right'):
+    # The same plate from outlines worked out in 2D: the cut through every hull of the walls and thumb cluster
+    # at z = 0, joined with the screw insert outers and less the screw holes, as baseplate() cuts them.  The
+    # 3D walls are never built.
+    thumb_pieces = footprint.floor_pieces(globals(), [
+        ('thumb_walls', dict(side=side, skeleton=skeletal)),
+        ('thumb_connectors', dict(side=side)),
+        ('thumb_connection', dict(side=side, skeleton=skeletal)),
+    ], shape_points)
+    wall_pieces = footprint.floor_pieces(globals(), [('case_walls', dict(side=side))], shape_points)
+
+    thumb_positions = thumb_screw_insert_positions(side=side)
+    positions = screw_insert_all_positions(side=side)
+    thumb_area = footprint.floor_area(
+        thumb_pieces,
+        footprint.circles(thumb_positions, screw_insert_outer_radius),
+        footprint.circles(thumb_positions, screw_insert_bottom_radius),
+    )
+    area = footprint.floor_area(
+        wall_pieces,
+        [*footprint.circles(positions, screw_insert_outer_radius), thumb_area],
+        footprint.circles(positions + thumb_positions, screw_hole_diameter / 2.),
+    )
+
+    polygons = footprint.outlines(area)
+    outlines = []
+    for polygon in polygons:
+        points = [(float(x), float(y), 0.0) for x, y in polygon]
+        outlines.append(polyline(points + points[:1]))
+    return outline_baseplate(outlines, polygons)
+
+
+def polygon_area(polygon):
+    # Shoelace formula for an (N, 2) outline.
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(x @ np.roll(y, -1) - y @ np.roll(x, -1))
+
+
+def outline_baseplate(outlines, polygons):
+    # Rim and inner plate from the outlines of the wall base, polygons are the same outlines as (N, 2) arrays.
+    outer_index = int(np.argmin([polygon[:, 0].min() for polygon in polygons]))
+    # The inside of the walls is the largest outline after the outer one, the screw holes are smaller.
+    areas = [polygon_area(polygon) for polygon in polygons]
+    inner_index = max((i for i in range(len(polygons)) if i != outer_index), key=lambda i: areas[i])
+    holes = [i for i in range(len(polygons)) if i not in [inner_index, outer_index]]
+
+    inner_shape = extrude_poly(outlines[inner_index], height=base_thickness)
+    inner_shape = translate(inner_shape, (0, 0, -base_rim_thickness))
+
+    shape = extrude_poly(
+        outlines[outer_index], [*[outlines[i] for i in holes], outlines[inner_index]], height=base_rim_thickness
+    )
+    hole_shapes = []
+    for hole in holes:
+        loc = polygons[hole].mean(axis=0)
+        hole_shapes.append(translate(cylinder(screw_cbore_diameter/2.0, screw_cbore_depth), (loc[0], loc[1], 0)))
+    shape = difference(shape, hole_shapes)
+    shape = translate(shape, (0, 0, -base_rim_thickness))
+    return union([shape, inner_shape])
+
+
 # NEEDS TO BE SPECIAL FOR CADQUERY
 #def baseplate(main_shape, base_shape, wedge_angle=None, side='right'):
 def baseplate(wedge_angle=None, side='right'):
-    if ENGINE == 'cadquery':
+    if ENGINE in ['cadquery', 'manifold', 'occ']:
         # shape = mod_r
-
-
-        thumb_shape = thumb(side=side)
-        thumb_wall_shape = thumb_walls(side=side, skeleton=skeletal)
+        if baseplate_outline == 'FOOTPRINT' and wedge_angle is None:
+            if footprint is not None:
+                return footprint_baseplate(side=side)
+            print('manifold3d NOT INSTALLED, CUTTING THE PLATE FROM THE WALLS')
+
+
+        thumb_shape, thumb_wall_shape, thumb_connector_shape, thumb_connection_shape, walls_shape = subassemblies([
+            ('thumb', dict(side=side)),
+            ('thumb_walls', dict(side=side, skeleton=skeletal)),
+            ('thumb_connectors', dict(side=side)),
+            ('thumb_connection', dict(side=side, skeleton=skeletal)),
+            ('case_walls', dict(side=side)),
+        ])
         thumb_wall_shape = union([thumb_wall_shape, *thumb_screw_insert_outers(side=side)])
-        thumb_connector_shape = thumb_connectors(side=side)
-        thumb_connection_shape = thumb_connection(side=side, skeleton=skeletal)
         thumb_section = union([thumb_shape, thumb_connector_shape, thumb_wall_shape, thumb_connection_shape])
         thumb_section = difference(thumb_section, [union(thumb_screw_insert_holes(side=side))])
 
         shape = union([
-            case_walls(side=side),
+            walls_shape,
             *screw_insert_outers(side=side),
             thumb_section
         ])
@@ -4231,6 +4689,9 @@ def baseplate(wedge_angle=None, side='right'):
 
         shape = translate(shape, (0, 0, -0.0001))
 
+        if ENGINE in ['manifold', 'occ']:
+            return section_baseplate(shape)
+
         square = cq.Workplane('XY').rect(1000, 1000)
         for wire in square.wires().objects:
             plane = cq.Workplane('XY').add(cq.Face.makeFromWires(wire))
@@ -4305,37 +4766,51 @@ def baseplate(wedge_angle=None, side='right'):
 
         return sl.projection(cut=True)(shape)
 
-def run():
-
-    mod_r, tmb_r = model_side(side="right")
-    export_file(shape=mod_r, fname=path.join(save_path, config_name + r"_right"))
-    export_file(shape=tmb_r, fname=path.join(save_path, config_name + r"_thumb_right"))
-
-    #base = baseplate(mod_r, tmb_r, side='right')
-    base = baseplate(side='right')
-    export_file(shape=base, fname=path.join(save_path, config_name + r"_right_plate"))
-    export_dxf(shape=base, fname=path.join(save_path, config_name + r"_right_plate"))
-
-    if symmetry == "asymmetric":
-        mod_l, tmb_l = model_side(side="left")
-        export_file(shape=mod_l, fname=path.join(save_path, config_name + r"_left"))
-        export_file(shape=tmb_l, fname=path.join(save_path, config_name + r"_thumb_left"))
+def export_side(side='right'):
+    mod, tmb = model_side(side=side)
+    export_file(shape=mod, fname=path.join(save_path, config_name + r"_" + side))
+    export_file(shape=tmb, fname=path.join(save_path, config_name + r"_thumb_" + side))
 
-        #base_l = mirror(baseplate(mod_l, tmb_l, side='left'), 'YZ')
-        base_l = mirror(baseplate(side='left'), 'YZ')
-        export_file(shape=base_l, fname=path.join(save_path, config_name + r"_left_plate"))
-        export_dxf(shape=base_l, fname=path.join(save_path, config_name + r"_left_plate"))
+    if symmetry != "asymmetric":
+        export_file(shape=mirror(mod, 'YZ'), fname=path.join(save_path, config_name + r"_left"))
+    elif side == 'right' and plates_only_asymmetry():
+        # The left half is built from this one's walls and thumb section, see model_side().
+        export_side(side='left')
 
-    else:
-        export_file(shape=mirror(mod_r, 'YZ'), fname=path.join(save_path, config_name + r"_left"))
 
+def export_baseplate(side='right'):
+    #base = baseplate(mod_r, tmb_r, side='right')
+    base = baseplate(side=side)
+    if side == 'left':
+        base = mirror(base, 'YZ')
+    export_file(shape=base, fname=path.join(save_path, config_name + r"_" + side + r"_plate"))
+    export_dxf(shape=base, fname=path.join(save_path, config_name + r"_" + side + r"_plate"))
+
+    # The plate follows the walls, the halves' plates only differ when their walls do.
+    if symmetry != "asymmetric" or (side == 'right' and plates_only_asymmetry()):
         lbase = mirror(base, 'YZ')
         export_file(shape=lbase, fname=path.join(save_path, config_name + r"_left_plate"))
         export_dxf(shape=lbase, fname=path.join(save_path, config_name + r"_left_plate"))
 
 
+def run_task(name, kwargs):
+    # Worker side of run(), each task writes its own files.  Workers never open a pool of their own.
+    global jobs
+    jobs = 1
+    worker_stats()
+    globals()[name](**kwargs)
+    return name, kwargs, worker_stats()
+
+
+def run_tasks():
+    # The side and plate exports of run() as [(function name, kwargs), ...], independent of each other.
+    tasks = [('export_side', dict(side='right')), ('export_baseplate', dict(side='right'))]
+    if symmetry == "asymmetric" and not plates_only_asymmetry():
+        tasks.extend([('export_side', dict(side='left')), ('export_baseplate', dict(side='left'))])
+    return tasks
 
 
+def export_oled():
     if oled_mount_type == 'UNDERCUT':
         export_file(shape=oled_undercut_mount_frame()[1], fname=path.join(save_path, config_name + r"_oled_undercut_test"))
 
@@ -4351,7 +4826,157 @@ def run():
         export_file(shape=union((oled_clip_mount_frame()[1], oled_clip())),
                             fname=path.join(save_path, config_name + r"_oled_clip_assy_test"))
 
+
+def run():
+    tasks = run_tasks()
+
+    if jobs <= 1:
+        for name, kwargs in tasks:
+            globals()[name](**kwargs)
+    else:
+        print('run() using {} workers'.format(min(jobs, len(tasks))))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), mp_context=pool_context()) as pool:
+            futures = [pool.submit(run_task, name, kwargs) for name, kwargs in tasks]
+            for future in as_completed(futures):
+                name, kwargs, stats = future.result()
+                merge_worker_stats(stats)
+                print('{}(side={}) finished'.format(name, kwargs['side']))
+
+    export_oled()
+
+    if helper_profile is not None:
+        helper_profile.write(profile_report)
+        print('HELPER PROFILE WRITTEN TO {}.json / .txt'.format(profile_report))
+    if build_trace is not None:
+        build_trace.write(trace_file)
+        print('BUILD TRACE WRITTEN TO {}'.format(trace_file))
+
 # base = baseplate()
 # export_file(shape=base, fname=path.join(save_path, config_name + r"_plate"))
+
+
+def apply_config(new_config):
+    # Switch this module to another KeyboardConfig: globals, engine and every position derived from them.
+    # The model functions read module globals, so only one configuration is active per interpreter at a time.
+    global config
+    config = new_config
+    if config.ENGINE != ENGINE:
+        load_engine(config.ENGINE)
+    globals().update(config.as_dict())
+    subassembly_store.clear()
+    configure_engine(cache_dir=cache_dir, union_mode=union_mode, mesh_format=mesh_format)
+    if profile_report or trace_file:
+        instrument()
+
+    os.makedirs(save_path, exist_ok=True)
+
+    for update in position_updates:
+        update()
+
+
+BUILD_PARTS = ('right', 'thumb_right', 'right_plate', 'left', 'thumb_left', 'left_plate')
+
+
+def build(new_config=None, parts=None, export=False):
+    # Build parts of one keyboard in this interpreter, returns {part: shape}.  Successive calls with
+    # different configurations reuse the loaded engine, parts library and plate cache.
+    if new_config is not None:
+        apply_config(new_config)
+    if parts is None:
+        parts = BUILD_PARTS
+
+    sides = {}
+    shapes = {}
+    for part in parts:
+        if part not in BUILD_PARTS:
+            raise ValueError('Unknown part {}, expected one of {}'.format(part, BUILD_PARTS))
+        side = 'left' if 'left' in part else 'right'
+        mirrored = side == 'left' and symmetry != "asymmetric"
+
+        if part.endswith('_plate'):
+            mirrored = mirrored or (side == 'left' and plates_only_asymmetry())
+            shape = baseplate(side='right' if mirrored else side)
+            if side == 'left':
+                shape = mirror(shape, 'YZ')
+        else:
+            model_key = 'right' if mirrored else side
+            if model_key not in sides:
+                sides[model_key] = model_side(side=model_key)
+            shape = sides[model_key][1 if part.startswith('thumb_') else 0]
+            if mirrored:
+                shape = mirror(shape, 'YZ')
+        shapes[part] = shape
+
+        if export:
+            export_file(shape=shape, fname=path.join(save_path, config_name + r"_" + part))
+            if part.endswith('_plate'):
+                export_dxf(shape=shape, fname=path.join(save_path, config_name + r"_" + part))
+
+    return shapes
+
+
+def dependency_manifest(parts=None):
+    # Build parts once with instrumented copies of this module's functions and record, for each function, the
+    # configuration keys it read directly or through its callees.  Positions and derived values count as the
+    # keys they were computed from.
+    tracer = DependencyTracer(globals(), set(config.as_dict()) | position_globals)
+    dict.__setitem__(tracer.globals, 'jobs', 1)
+    # Every function is traced building its own parts, not picking up another's.
+    dict.__setitem__(tracer.globals, 'subassembly_store', None)
+    # The footprint pass runs the walls on stubbed copies of this module's functions, which would bypass the
+    # tracer.  The plate cut from the walls reads everything the footprint does.
+    dict.__setitem__(tracer.globals, 'baseplate_outline', 'SECTION')
+
+    sources = derived_sources()
+    for update in position_updates:
+        tracer.call(update.__name__)
+        for name in global_writes(update):
+            sources[name] = expand(tracer.reads[update.__name__], sources)
+
+    tracer.call('build', parts=parts)
+
+    return {
+        'config_name': config_name,
+        'ENGINE': ENGINE,
+        'functions': {name: sorted(expand(reads, sources)) for name, reads in sorted(tracer.reads.items())},
+    }
+
+
+# Cached parts check_cache_keys() looks at by default, everything a move of the thumb cluster reaches.
+CACHE_KEY_PARTS = ('thumb', 'thumb_walls', 'thumb_connectors', 'thumb_connection', 'model_side')
+
+
+def check_cache_keys(changes, parts=CACHE_KEY_PARTS):
+    # Those of parts whose shape cache key stays the same when the configuration changes by changes
+    # ({key: value}).  For parts the change reaches, a rebuild would load them stale from the shape cache.
+    # The configuration is restored afterwards.
+    old_config = config
+    keys = {name: subassembly_key(inspect.unwrap(globals()[name]), (), {}) for name in parts}
+    values = dict(old_config.extras, **{item: getattr(old_config, item) for item in CONFIG_FIELDS})
+    apply_config(KeyboardConfig(dict(values, **changes)))
+    try:
+        return [name for name in parts if subassembly_key(inspect.unwrap(globals()[name]), (), {}) == keys[name]]
+    finally:
+        apply_config(old_config)
+
+
+if profile_report or trace_file:
+    instrument()
+
+
 if __name__ == '__main__':
-    run()
+    if cli_deps_manifest is not None:
+        manifest = dependency_manifest()
+        with open(cli_deps_manifest, mode='w') as fid:
+            json.dump(manifest, fid, indent=4)
+        print('DEPENDENCY MANIFEST WRITTEN TO {}'.format(cli_deps_manifest))
+    elif cli_cache_key_check is not None:
+        parts = CACHE_KEY_PARTS if cli_cache_key_parts is None else cli_cache_key_parts
+        stale = check_cache_keys(cli_cache_key_check, parts)
+        for name in stale:
+            print('STALE CACHE KEY {}() after {}'.format(name, cli_cache_key_check))
+        print('{} of {} cached parts keep their key'.format(len(stale), len(parts)))
+        if stale:
+            sys.exit(1)
+    else:
+        run()
@@ -0,0 +1,84 @@
+import dis
+import inspect
+import json
+import sys
+import types
+
+
+class TracingGlobals(dict):
+    # Globals of the instrumented function copies.  LOAD_GLOBAL goes through __getitem__ for dict subclasses,
+    # and so does globals()[name].
+    def __init__(self, namespace, tracer):
+        super().__init__(namespace)
+        self.tracer = tracer
+
+    def __getitem__(self, name):
+        if name in self.tracer.names and self.tracer.stack:
+            self.tracer.stack[-1].add(name)
+        return dict.__getitem__(self, name)
+
+
+class DependencyTracer:
+    # Globals from names read by each function of a module, counting everything its callees read.
+    def __init__(self, namespace, names):
+        self.names = set(names)
+        self.stack = []
+        self.reads = {}
+        self.globals = TracingGlobals(namespace, self)
+        for name, value in namespace.items():
+            if isinstance(value, types.FunctionType) and value.__globals__ is namespace:
+                self.globals[name] = self.instrument(name, inspect.unwrap(value))
+
+    def instrument(self, name, function):
+        # Unwrapped, so cached subassemblies are built, and traced, rather than loaded.
+        copy = types.FunctionType(
+            function.__code__, self.globals, function.__name__, function.__defaults__, function.__closure__
+        )
+        copy.__kwdefaults__ = function.__kwdefaults__
+
+        def traced(*args, **kwargs):
+            self.stack.append(set())
+            try:
+                return copy(*args, **kwargs)
+            finally:
+                reads = self.stack.pop()
+                self.reads.setdefault(name, set()).update(reads)
+                if self.stack:
+                    self.stack[-1].update(reads)
+
+        return traced
+
+    def call(self, name, *args, **kwargs):
+        return self.globals[name](*args, **kwargs)
+
+
+def global_writes(function):
+    # Module globals a function assigns with a global statement.
+    return {
+        instruction.argval for instruction in dis.get_instructions(inspect.unwrap(function))
+        if instruction.opname == 'STORE_GLOBAL'
+    }
+
+
+def expand(names, sources):
+    # Configuration keys behind a set of names, through the values derived from them.
+    keys = set()
+    for name in names:
+        keys |= sources.get(name, {name})
+    return keys
+
+
+def stale_functions(manifest, old_config, new_config):
+    # Functions whose recorded keys differ between two configurations, i.e. what a change needs to rebuild.
+    changed = {key for key in set(old_config) | set(new_config) if old_config.get(key) != new_config.get(key)}
+    return sorted(name for name, keys in manifest['functions'].items() if changed & set(keys))
+
+
+if __name__ == '__main__':
+    # python dependency_trace.py MANIFEST OLD_CONFIG NEW_CONFIG, lists the functions to rebuild.
+    loaded = []
+    for fname in sys.argv[1:4]:
+        with open(fname, mode='r') as fid:
+            loaded.append(json.load(fid))
+    for name in stale_functions(*loaded):
+        print(name)
@@ -0,0 +1,88 @@
+import inspect
+import types
+
+import numpy as np
+import manifold3d as mf
+
+from convex_hull import clip_points
+
+
+# Sides of the polygons standing in for the round screw inserts and holes.
+CIRCLE_SEGMENTS = 32
+
+
+def hull_slice(points, level=0.0):
+    # Points whose 2D hull is the cut through the 3D hull of points at z = level.
+    points = clip_points(points, level)
+    return points[points[:, 2] == level][:, :2]
+
+
+def floor_pieces(namespace, calls, shape_points, level=0.0):
+    # Run [(function name, kwargs), ...] of a module on copies of its functions with the solid operations
+    # stubbed out, and return the cut at z = level through every hull they make, as points to take the 2D hull
+    # of.  That is everything the walls stand on, without building the walls.
+    pieces = []
+
+    def record(points):
+        piece = hull_slice(points, level)
+        if len(piece) > 2:
+            pieces.append(piece)
+
+    def hull_from_shapes(shapes, points=None):
+        vertices = [shape_points(shape) for shape in shapes]
+        if points is not None:
+            vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+        record(np.concatenate(vertices))
+
+    def triangle_hulls(shapes):
+        for i in range(len(shapes) - 2):
+            hull_from_shapes(shapes[i: (i + 3)])
+
+    def bottom_hull(p, height=0.001):
+        points = np.concatenate([shape_points(item) for item in p])
+        projected = points.copy()
+        projected[:, 2] = -10
+        record(np.concatenate([points, projected]))
+
+    def nothing(*args, **kwargs):
+        return None
+
+    copies = dict(namespace)
+    for name, value in namespace.items():
+        # Unwrapped, so neither the shape cache nor a profiler sees the stubbed results.
+        function = inspect.unwrap(value) if isinstance(value, types.FunctionType) else value
+        if isinstance(function, types.FunctionType) and function.__globals__ is namespace:
+            copy = types.FunctionType(
+                function.__code__, copies, function.__name__, function.__defaults__, function.__closure__
+            )
+            copy.__kwdefaults__ = function.__kwdefaults__
+            copies[name] = copy
+    copies.update(
+        bottom_hull=bottom_hull, hull_from_shapes=hull_from_shapes, floor_hull=hull_from_shapes,
+        triangle_hulls=triangle_hulls, union=nothing, add=nothing, difference=nothing,
+    )
+
+    for name, kwargs in calls:
+        copies[name](**kwargs)
+    return pieces
+
+
+def circles(positions, radius):
+    return [
+        mf.CrossSection.circle(radius, CIRCLE_SEGMENTS).translate((float(x), float(y)))
+        for x, y in positions
+    ]
+
+
+def floor_area(pieces, outers=(), holes=()):
+    # The union of the hulls of pieces and the outers, less the holes.  outers and holes are CrossSections.
+    areas = [mf.CrossSection.hull_points(np.ascontiguousarray(piece)) for piece in pieces]
+    section = mf.CrossSection.batch_boolean([*areas, *outers], mf.OpType.Add)
+    if holes:
+        section = section - mf.CrossSection.batch_boolean(list(holes), mf.OpType.Add)
+    return section
+
+
+def outlines(section):
+    # Outer outlines and holes of a CrossSection as (N, 2) arrays.
+    return [np.asarray(polygon) for polygon in section.to_polygons()]
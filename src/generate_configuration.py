@@ -12,7 +12,26 @@ shape_config = {
 
     'ENGINE': 'solid',  # 'solid' = solid python / OpenSCAD, 'cadquery' = cadquery / OpenCascade
     # 'ENGINE': 'cadquery',  # 'solid' = solid python / OpenSCAD, 'cadquery' = cadquery / OpenCascade
-
+    # 'ENGINE': 'manifold',  # 'manifold' = manifold3d meshes, STL / 3MF straight out, no CAD files
+    # 'ENGINE': 'occ',  # 'occ' = OpenCascade through OCP directly, same STEP files as cadquery without Workplanes
+    # Mesh file written by the manifold engine, 'stl' or '3mf'.
+    'mesh_format': 'stl',
+
+    # Parts library and build caches, relative to the src directory.  Safe to delete at any time.
+    'cache_dir': '.cache',
+    # Size cap in MB for built subassemblies kept under cache_dir/shapes, least recently used go first.  0 = off.
+    'shape_cache_mb': 512,
+    # How union() combines a list of shapes:
+    #   'NARY' = one boolean over every shape, 'TREE' = balanced pairwise unions, 'FOLD' = one shape at a time
+    'union_mode': 'NARY',
+    # Worker processes for independent subassemblies, 1 builds everything in this process.  Also set by --jobs N.
+    'jobs': 1,
+    # Profile the engine helpers and write <profile_report>.json and .txt at the end of run(), None = off.
+    # Also set by --profile FILE.
+    'profile_report': None,
+    # Chrome trace-event timeline of the build (chrome://tracing, Perfetto), written at the end of run(), None = off.
+    # Also set by --trace FILE.
+    'trace_file': None,
 
     ######################
     ## Shape parameters ##
@@ -34,6 +53,7 @@ shape_config = {
     'tenting_angle':  pi / 12.0,  # or, change this for more precise tenting control
 
     # symmetry states if it is a symmetric or asymmetric bui.  If asymmetric it doubles the generation time.
+    # Halves differing only in their key plates (e.g. HS_* plates, no trackball) share the rest of the build.
     'symmetry':  "symmetric",  # "asymmetric" or "symmetric"
 
     'column_style_gt5':  "orthographic",
@@ -423,6 +443,9 @@ shape_config = {
     'base_rim_thickness': 5.0,  # thickness on the outer frame with screws
     'screw_cbore_diameter': 6.0,
     'screw_cbore_depth': 2.5,
+    # 'FOOTPRINT' = plate outline worked out in 2D from the base of the walls (needs manifold3d),
+    # 'SECTION' = cut through the 3D walls and thumb cluster.
+    'baseplate_outline': 'FOOTPRINT',
 
     # Offset is from the top inner corner of the top inner key.
 
@@ -473,6 +496,11 @@ shape_config = {
     ## END CONFIGURATION SECTION
     ####################################
 
+# Set by a caller (e.g. model_builder.build_variant) before importing dactyl_manuform to hand over a config
+# in memory.  Takes precedence over --config and run_config.json.
+run_config = None
+
+
 def save_config():
     # Check to see if the user has specified an alternate config
     opts, args = getopt.getopt(sys.argv[1:], "", ["config=", "update="])
@@ -0,0 +1,110 @@
+import functools
+import json
+import sys
+import time
+
+
+def accumulate(stats, key, values):
+    # values: calls, cumulative time, self time, faces in, faces out.  Face counts stay None until one is known.
+    entry = stats.setdefault(key, [0, 0.0, 0.0, None, None])
+    for i, value in enumerate(values):
+        if value is not None:
+            entry[i] = value if entry[i] is None else entry[i] + value
+
+
+def rows(stats, names):
+    # Report rows, most self time first.
+    return [
+        dict(zip(names + ('calls', 'cumulative', 'self', 'faces_in', 'faces_out'), key + tuple(values)))
+        for key, values in sorted(stats.items(), key=lambda item: -item[1][2])
+    ]
+
+
+class HelperProfile:
+    # Call counts, times and face counts of the engine helpers, per helper and per calling function.
+    # Self time leaves out nested profiled calls.  Face counts come from the engine's face_count(), None where
+    # the engine has none.
+    def __init__(self, face_count):
+        self.face_count = face_count
+        self.stack = []
+        self.stats = {}
+
+    def reset(self):
+        self.stats = {}
+
+    def faces(self, values):
+        total = None
+        for value in values:
+            if isinstance(value, (list, tuple)):
+                count = self.faces(value)
+            else:
+                count = self.face_count(value)
+            if count is not None:
+                total = (total or 0) + count
+        return total
+
+    def wrap(self, function):
+        @functools.wraps(function)
+        def profiled(*args, **kwargs):
+            # Comprehensions and lambdas have frames of their own, the caller is the function around them.
+            frame = sys._getframe(1)
+            while frame.f_back is not None and frame.f_code.co_name.startswith('<'):
+                frame = frame.f_back
+            caller = frame.f_code.co_name
+
+            outer_start = time.perf_counter()
+            faces_in = self.faces(args + tuple(kwargs.values()))
+            self.stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self.stack.pop()
+            faces_out = self.faces((result,))
+            if self.stack:
+                # Counting faces is part of the caller's time, not of this call's.
+                self.stack[-1] += time.perf_counter() - outer_start
+
+            self.record(function.__name__, caller, [1, elapsed, elapsed - nested, faces_in, faces_out])
+            return result
+
+        return profiled
+
+    def record(self, helper, caller, values):
+        accumulate(self.stats, (helper, caller), values)
+
+    def merge(self, stats):
+        # Add the stats of a worker process.
+        for key, values in stats.items():
+            accumulate(self.stats, key, values)
+
+    def report(self):
+        helpers = {}
+        for (helper, caller), values in self.stats.items():
+            accumulate(helpers, (helper,), values)
+        return {'helpers': rows(helpers, ('helper',)), 'callers': rows(self.stats, ('helper', 'caller'))}
+
+    def table(self):
+        lines = []
+        header = '{:<20} {:<32} {:>8} {:>11} {:>11} {:>11} {:>11}'
+        line = '{:<20} {:<32} {:>8} {:>11.3f} {:>11.3f} {:>11} {:>11}'
+        report = self.report()
+        for title, items in (('BY HELPER', report['helpers']), ('BY HELPER AND CALLER', report['callers'])):
+            lines.append(title)
+            lines.append(header.format('helper', 'caller', 'calls', 'cumul. s', 'self s', 'faces in', 'faces out'))
+            for row in items:
+                lines.append(line.format(
+                    row['helper'], row.get('caller', ''), row['calls'], row['cumulative'], row['self'],
+                    '-' if row['faces_in'] is None else row['faces_in'],
+                    '-' if row['faces_out'] is None else row['faces_out'],
+                ))
+            lines.append('')
+        return '\n'.join(lines)
+
+    def write(self, fname):
+        # fname without extension, as for export_file(): fname.json and fname.txt.
+        with open(fname + '.json', mode='w') as fid:
+            json.dump(self.report(), fid, indent=4)
+        with open(fname + '.txt', mode='w') as fid:
+            fid.write(self.table())
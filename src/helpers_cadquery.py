@@ -1,10 +1,28 @@
 import cadquery as cq
 from scipy.spatial import ConvexHull as sphull
 import numpy as np
+import os
+
+import brep_io
+from convex_hull import PointCloud, clip_points, hull_facets, rotation_matrix
+
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeFace, BRepBuilderAPI_Transform
+from OCP.BRepPrimAPI import BRepPrimAPI_MakeHalfSpace
+from OCP.gp import gp_Dir, gp_Pln, gp_Pnt, gp_Trsf
 
 
 debug_trace = False
 
+engine_options = {
+    'cache_dir': os.path.join('.', '.cache'),  # on-disk BRep copies of imported parts
+    'union_mode': 'NARY',  # 'NARY' = single general fuse, 'TREE' = pairwise reduction, 'FOLD' = one at a time
+}
+
+
+def configure_engine(**options):
+    engine_options.update(options)
+
+
 def debugprint(info):
     if debug_trace:
         print(info)
@@ -14,6 +32,40 @@ def box(width, height, depth):
     return cq.Workplane("XY").box(width, height, depth)
 
 
+def box_points(width, height, depth):
+    # The 8 corners of box(width, height, depth).
+    corners = np.array(np.meshgrid([-.5, .5], [-.5, .5], [-.5, .5], indexing='ij')).reshape(3, -1).T
+    return PointCloud(corners * (width, height, depth))
+
+
+def solid_shape(shape):
+    if isinstance(shape, PointCloud):
+        return hull_from_points(shape.points)
+    return shape
+
+
+def shape_points(shape):
+    if isinstance(shape, PointCloud):
+        return shape.points
+    return np.array([vert.toTuple() for vert in shape.vertices().objects]).reshape(-1, 3)
+
+
+def face_count(shape):
+    if isinstance(shape, cq.Workplane):
+        return sum(len(item.Faces()) for item in shape.vals() if isinstance(item, cq.Shape))
+    if isinstance(shape, cq.Shape):
+        return len(shape.Faces())
+    return None
+
+
+def solid_count(shape):
+    if isinstance(shape, cq.Workplane):
+        return sum(len(item.Solids()) for item in shape.vals() if isinstance(item, cq.Shape))
+    if isinstance(shape, cq.Shape):
+        return len(shape.Solids())
+    return None
+
+
 def cylinder(radius, height, segments=100):
     shape = cq.Workplane("XY").union(cq.Solid.makeCylinder(radius=radius, height=height))
     shape = translate(shape, (0, 0, -height/2))
@@ -32,6 +84,8 @@ def cone(r1, r2, height):
 def rotate(shape, angle):
     if shape is None:
         return None
+    if isinstance(shape, PointCloud):
+        return PointCloud(shape.points @ rotation_matrix(angle).T)
     origin = (0, 0, 0)
     shape = shape.rotate(axisStartPoint=origin, axisEndPoint=(1, 0, 0), angleDegrees=angle[0])
     shape = shape.rotate(axisStartPoint=origin, axisEndPoint=(0, 1, 0), angleDegrees=angle[1])
@@ -42,23 +96,78 @@ def rotate(shape, angle):
 def translate(shape, vector):
     if shape is None:
         return None
+    if isinstance(shape, PointCloud):
+        return PointCloud(shape.points + np.asarray(vector, dtype=float))
     return shape.translate(tuple(vector))
 
 
+def transform(shape, matrix):
+    # One BRepBuilderAPI_Transform per shape for a full 4x4 rigid placement, instead of a chain of moves.
+    if shape is None:
+        return None
+    if isinstance(shape, PointCloud):
+        matrix = np.asarray(matrix, dtype=float)
+        return PointCloud(shape.points @ matrix[:3, :3].T + matrix[:3, 3])
+    trsf = gp_Trsf()
+    trsf.SetValues(*[float(value) for value in np.asarray(matrix)[:3, :4].flatten()])
+    return shape.newObject([
+        cq.Shape.cast(BRepBuilderAPI_Transform(item.wrapped, trsf, True).Shape())
+        if isinstance(item, cq.Shape) else item
+        for item in shape.objects
+    ])
+
+
 def mirror(shape, plane=None):
     debugprint('mirror()')
+    if isinstance(shape, PointCloud):
+        return PointCloud(shape.points * [(-1, 1, 1), (1, -1, 1), (1, 1, -1)][['YZ', 'XZ', 'XY'].index(plane or 'XY')])
     return shape.mirror(mirrorPlane=plane)
 
 
-def union(shapes):
+def fuse_all(shapes):
+    # All operands in one BRepAlgoAPI_Fuse, the same call Workplane.union() makes for a single operand.
+    tools = []
+    for item in shapes[1:]:
+        solids = item.solids().vals()
+        if len(solids) < 1:
+            raise ValueError("Workplane object must have at least one solid on the stack to union!")
+        tools.extend(solids)
+    if shapes[0].solids().size() > 0:
+        fused = shapes[0].findSolid().fuse(*tools)
+    elif tools:
+        # Nothing to fuse into yet (triangle_hulls() starts from an empty workplane).
+        fused = tools[0].fuse(*tools[1:]) if len(tools) > 1 else tools[0]
+    else:
+        return shapes[0]
+    return shapes[0].newObject([fused.clean()])
+
+
+def union(shapes, mode=None):
     debugprint('union()')
-    shape = None
-    for item in shapes:
-        if item is not None:
-            if shape is None:
-                shape = item
-            else:
-                shape = shape.union(item)
+    shapes = [solid_shape(item) for item in shapes if item is not None]
+    if len(shapes) == 0:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+
+    if mode is None:
+        mode = engine_options['union_mode']
+
+    if mode == 'NARY':
+        return fuse_all(shapes)
+
+    if mode == 'TREE':
+        # Balanced pairwise reduction, each boolean works on operands of similar size.
+        while len(shapes) > 1:
+            shapes = [
+                shapes[i].union(shapes[i + 1]) if i + 1 < len(shapes) else shapes[i]
+                for i in range(0, len(shapes), 2)
+            ]
+        return shapes[0]
+
+    shape = shapes[0]
+    for item in shapes[1:]:
+        shape = shape.union(item)
     return shape
 
 
@@ -67,27 +176,80 @@ def add(shapes):
     shape = None
     for item in shapes:
         if item is not None:
+            item = solid_shape(item)
             if shape is None:
                 shape = item
             else:
-                shape = shape.add(item)
+                # Workplane.add() appends to the workplane it is called on, which may be a shared part.
+                items = item.vals() if isinstance(item, cq.Workplane) else [item]
+                shape = shape.newObject([*shape.vals(), *items])
     return shape
 
 
+# Running totals for difference(), 'culled' counts tools dropped because their bounding box misses the target.
+difference_stats = {'calls': 0, 'tools': 0, 'culled': 0}
+
+
+def boxes_overlap(box1, box2, tol=1e-3):
+    return (
+        box1.xmin - tol <= box2.xmax and box2.xmin - tol <= box1.xmax
+        and box1.ymin - tol <= box2.ymax and box2.ymin - tol <= box1.ymax
+        and box1.zmin - tol <= box2.zmax and box2.zmin - tol <= box1.zmax
+    )
+
+
 def difference(shape, shapes):
     debugprint('difference()')
+    shape = solid_shape(shape)
+    tools = []
     for item in shapes:
-        if item is not None:
-            shape = shape.cut(item)
-    return shape
+        item = solid_shape(item)
+        if isinstance(item, cq.Workplane):
+            tools.extend(val for val in item.vals() if isinstance(val, cq.Shape))
+        elif item is not None:
+            tools.append(item)
+    if len(tools) == 0:
+        return shape
+
+    target = shape.findSolid()
+    target_box = target.BoundingBox()
+    kept = [tool for tool in tools if boxes_overlap(target_box, tool.BoundingBox())]
+
+    difference_stats['calls'] += 1
+    difference_stats['tools'] += len(tools)
+    difference_stats['culled'] += len(tools) - len(kept)
+    debugprint('difference() {} tools, {} culled'.format(len(tools), len(tools) - len(kept)))
+
+    if len(kept) == 0:
+        return shape
+    # Every tool in one BRepAlgoAPI_Cut, the target is only rebuilt once.
+    return shape.newObject([target.cut(*kept).clean()])
+
+
+def clip_below(shape, height=0.0):
+    # shape without what lies below z = height.  Nothing to do when it is all above, walls built with
+    # floor_hull() and bottom_hull() stop at the floor already.
+    if shape is None:
+        return None
+    shape = solid_shape(shape)
+    target = shape.findSolid()
+    if target.BoundingBox().zmin >= height - 1e-6:
+        return shape
+    face = BRepBuilderAPI_MakeFace(gp_Pln(gp_Pnt(0, 0, height), gp_Dir(0, 0, 1))).Face()
+    below = cq.Solid(BRepPrimAPI_MakeHalfSpace(face, gp_Pnt(0, 0, height - 1)).Solid())
+    return shape.newObject([target.cut(below).clean()])
 
 
 def intersect(shape1, shape2):
     if shape2 is not None:
-        return shape1.intersect(shape2)
+        return solid_shape(shape1).intersect(solid_shape(shape2))
     else:
         return shape1
 
+def chamfer_top(shape, length, length2=None):
+    return shape.faces("+Z").chamfer(length, length2)
+
+
 def face_from_points(points):
     # debugprint('face_from_points()')
     edges = []
@@ -110,16 +272,13 @@ def face_from_points(points):
 def hull_from_points(points):
     # debugprint('hull_from_points()')
     hull_calc = sphull(points)
-    n_faces = len(hull_calc.simplices)
 
     faces = []
-    for i in range(n_faces):
-        face_items = hull_calc.simplices[i]
-        fpnts = []
-        for item in face_items:
-            fpnts.append(points[item])
+    for facet in hull_facets(hull_calc):
+        fpnts = [hull_calc.points[item] for item in facet]
         faces.append(face_from_points(fpnts))
 
+    # makeShell() sews the faces, neighbouring facets share their edges.
     shape = cq.Solid.makeSolid(cq.Shell.makeShell(faces))
     shape = cq.Workplane('XY').union(shape)
     return shape
@@ -127,16 +286,11 @@ def hull_from_points(points):
 
 def hull_from_shapes(shapes, points=None):
     # debugprint('hull_from_shapes()')
-    vertices = []
-    for shape in shapes:
-        verts = shape.vertices()
-        for vert in verts.objects:
-            vertices.append(np.array(vert.toTuple()))
+    vertices = [shape_points(shape) for shape in shapes]
     if points is not None:
-        for point in points:
-            vertices.append(np.array(point))
+        vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
 
-    shape = hull_from_points(vertices)
+    shape = hull_from_points(np.concatenate(vertices))
     return shape
 
 
@@ -169,34 +323,29 @@ def triangle_hulls(shapes):
 
 
 
+def floor_hull(shapes, points=None, floor=0.0):
+    # hull_from_shapes() cut off below z = floor, None when nothing is above it.
+    vertices = [shape_points(shape) for shape in shapes]
+    if points is not None:
+        vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+    vertices = clip_points(np.concatenate(vertices), floor)
+    if len(vertices) == 0:
+        return None
+    return hull_from_points(vertices)
+
+
 def bottom_hull(p, height=0.001):
     debugprint("bottom_hull()")
-    shape = None
-    for item in p:
-        vertices = []
-        # verts = item.faces('<Z').vertices()
-        verts = item.faces().vertices()
-        for vert in verts.objects:
-            v0 = vert.toTuple()
-            v1 = [v0[0], v0[1], -10]
-            vertices.append(np.array(v0))
-            vertices.append(np.array(v1))
-
-        t_shape = hull_from_points(vertices)
-
-        # t_shape = translate(t_shape, [0, 0, height / 2 - 10])
-
-        if shape is None:
-            shape = t_shape
-
-        for shp in (*p, shape, t_shape):
-            try:
-                shp.vertices()
-            except:
-                0
-        shape = union([shape, hull_from_shapes((shape, t_shape))])
+    # The hull of every vertex of p and its drop to z = -10, in one pass, cut off at the floor (z = 0).  Same
+    # solid as hulling each item with its projection and folding that into a running hull, without the unions
+    # in between.
+    if len(p) == 0:
+        return None
+    points = np.concatenate([shape_points(item) for item in p])
+    projected = points.copy()
+    projected[:, 2] = -10
 
-    return shape
+    return floor_hull([], np.concatenate([points, projected]))
 
 
 def polyline(point_list):
@@ -220,16 +369,29 @@ def extrude_poly(outer_poly, inner_polys=None, height=1):  # vector=(0,0,1)):
         cq.Solid.extrudeLinear(outerWire=outer_wires, innerWires=inner_wires, vecNormal=cq.Vector(0, 0, height)))
 
 
+def serialize_shape(shape):
+    # The solids of the Workplane as one BRep compound, as the occ engine hands them between processes.
+    if shape is None:
+        return None
+    items = [item for item in shape.vals() if isinstance(item, cq.Shape)]
+    return brep_io.serialize_shape(cq.Compound.makeCompound(items).wrapped)
+
+
+def deserialize_shape(data):
+    if data is None:
+        return None
+    items = brep_io.compound_items(brep_io.deserialize_shape(data))
+    return cq.Workplane('XY').add([cq.Shape.cast(item) for item in items])
+
+
 def import_file(fname, convexity=None):
-    print("IMPORTING FROM {}".format(fname))
-    return cq.Workplane('XY').add(cq.importers.importShape(
-        cq.exporters.ExportTypes.STEP,
-        fname + ".step"))
+    items = brep_io.import_part(fname + ".step", engine_options['cache_dir'])
+    return cq.Workplane('XY').add([cq.Shape.cast(item) for item in items])
 
 
 def export_file(shape, fname):
     print("EXPORTING TO {}".format(fname))
-    cq.exporters.export(w=shape, fname=fname + ".step",
+    cq.exporters.export(w=solid_shape(shape), fname=fname + ".step",
                         exportType='STEP')
 
 
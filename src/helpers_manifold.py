@@ -0,0 +1,392 @@
+import manifold3d as mf
+import numpy as np
+import os
+import pickle
+import struct
+import zipfile
+
+from convex_hull import clip_points
+
+debug_trace = False
+
+engine_options = {
+    'cache_dir': None,  # STL parts load in milliseconds, nothing is cached here
+    'union_mode': 'NARY',  # 'NARY' = one batch boolean, 'TREE' = pairwise reduction, 'FOLD' = one at a time
+    'mesh_format': 'stl',  # export_file() writes 'stl' or '3mf'
+}
+
+# Segments for a full circle, matching the cadquery/OpenSCAD default of cylinder().
+sphere_segments = 100
+
+
+def configure_engine(**options):
+    engine_options.update(options)
+
+
+def debugprint(info):
+    if debug_trace:
+        print(info)
+
+
+def box(width, height, depth):
+    return mf.Manifold.cube((width, height, depth), center=True)
+
+
+def box_points(width, height, depth):
+    # Transforms are lazy and hulls read the vertices straight off the mesh, the box itself is cheap here.
+    return box(width, height, depth)
+
+
+def cylinder(radius, height, segments=100):
+    return mf.Manifold.cylinder(height, radius, -1.0, segments, center=True)
+
+
+def sphere(radius):
+    return mf.Manifold.sphere(radius, sphere_segments)
+
+
+def cone(r1, r2, height):
+    return mf.Manifold.cylinder(height, r1, r2, sphere_segments)
+
+
+def rotate(shape, angle):
+    # About x, then y, then z, as the other engines.
+    if shape is None:
+        return None
+    return shape.rotate(tuple(float(value) for value in angle))
+
+
+def translate(shape, vector):
+    if shape is None:
+        return None
+    return shape.translate(tuple(float(value) for value in vector))
+
+
+def transform(shape, matrix):
+    if shape is None:
+        return None
+    return shape.transform(np.asarray(matrix, dtype=float)[:3, :4])
+
+
+def mirror(shape, plane=None):
+    debugprint('mirror()')
+    planes = {
+        'XY': [0, 0, 1],
+        'YX': [0, 0, -1],
+        'XZ': [0, 1, 0],
+        'ZX': [0, -1, 0],
+        'YZ': [1, 0, 0],
+        'ZY': [-1, 0, 0],
+    }
+    return shape.mirror(planes[plane])
+
+
+def union(shapes, mode=None):
+    debugprint('union()')
+    shapes = [item for item in shapes if item is not None]
+    if len(shapes) == 0:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+
+    if mode is None:
+        mode = engine_options['union_mode']
+
+    if mode == 'NARY':
+        return mf.Manifold.batch_boolean(shapes, mf.OpType.Add)
+
+    if mode == 'TREE':
+        while len(shapes) > 1:
+            shapes = [
+                shapes[i] + shapes[i + 1] if i + 1 < len(shapes) else shapes[i]
+                for i in range(0, len(shapes), 2)
+            ]
+        return shapes[0]
+
+    shape = shapes[0]
+    for item in shapes[1:]:
+        shape = shape + item
+    return shape
+
+
+def add(shapes):
+    debugprint('union()')
+    # A mesh has no loose compound like cadquery's add(), the parts are unioned.
+    return union(shapes, mode='NARY')
+
+
+# Running totals for difference(), 'culled' counts tools dropped because their bounding box misses the target.
+difference_stats = {'calls': 0, 'tools': 0, 'culled': 0}
+
+
+def boxes_overlap(box1, box2, tol=1e-3):
+    return all(box1[i] <= box2[i + 3] + tol and box2[i] <= box1[i + 3] + tol for i in range(3))
+
+
+def difference(shape, shapes):
+    debugprint('difference()')
+    tools = [item for item in shapes if item is not None]
+    if len(tools) == 0:
+        return shape
+
+    target_box = shape.bounding_box()
+    kept = [tool for tool in tools if boxes_overlap(target_box, tool.bounding_box())]
+
+    difference_stats['calls'] += 1
+    difference_stats['tools'] += len(tools)
+    difference_stats['culled'] += len(tools) - len(kept)
+
+    if len(kept) == 0:
+        return shape
+    return mf.Manifold.batch_boolean([shape, *kept], mf.OpType.Subtract)
+
+
+def clip_below(shape, height=0.0):
+    # shape without what lies below z = height.
+    if shape is None:
+        return None
+    return shape.trim_by_plane((0, 0, 1), height)
+
+
+def intersect(shape1, shape2):
+    if shape2 is not None:
+        return shape1 ^ shape2
+    else:
+        return shape1
+
+
+def chamfer_top(shape, length, length2=None):
+    # Meshes have no edges to chamfer, this works on convex prisms (the plate undercuts) only: the hull
+    # of everything up to length below the top and the top outline drawn in by length2.
+    if length2 is None:
+        length2 = length
+    top = shape.bounding_box()[5]
+    outline = shape.slice(top - length).offset(-length2, mf.JoinType.Miter)
+    points = [np.column_stack([polygon, np.full(len(polygon), top)]) for polygon in outline.to_polygons()]
+    below = shape.trim_by_plane((0, 0, -1), length - top)
+    return hull_from_points(np.concatenate([shape_points(below), *points]))
+
+
+def shape_points(shape):
+    return np.asarray(shape.to_mesh64().vert_properties)[:, :3]
+
+
+def face_count(shape):
+    # Triangles, a mesh has no larger faces.
+    if isinstance(shape, mf.Manifold):
+        return shape.num_tri()
+    return None
+
+
+def solid_count(shape):
+    # Disconnected pieces.
+    if isinstance(shape, mf.Manifold):
+        return len(shape.decompose())
+    return None
+
+
+def hull_from_points(points):
+    return mf.Manifold.hull_points(np.asarray(points, dtype=float).reshape(-1, 3))
+
+
+def hull_from_shapes(shapes, points=None):
+    vertices = [shape_points(shape) for shape in shapes]
+    if points is not None:
+        vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+    return hull_from_points(np.concatenate(vertices))
+
+
+def tess_hull(shapes, sl_tol=.5, sl_angTol=1):
+    # Meshes are already tessellated.
+    return hull_from_shapes(shapes)
+
+
+def triangle_hulls(shapes):
+    debugprint('triangle_hulls()')
+    hulls = []
+    for i in range(len(shapes) - 2):
+        hulls.append(hull_from_shapes(shapes[i: (i + 3)]))
+
+    return union(hulls)
+
+
+def floor_hull(shapes, points=None, floor=0.0):
+    # hull_from_shapes() cut off below z = floor, None when nothing is above it.
+    vertices = [shape_points(shape) for shape in shapes]
+    if points is not None:
+        vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+    vertices = clip_points(np.concatenate(vertices), floor)
+    if len(vertices) == 0:
+        return None
+    return hull_from_points(vertices)
+
+
+def bottom_hull(p, height=0.001):
+    debugprint("bottom_hull()")
+    # The hull of every vertex of p and its drop to z = -10, cut off at the floor (z = 0).
+    if len(p) == 0:
+        return None
+    points = np.concatenate([shape_points(item) for item in p])
+    projected = points.copy()
+    projected[:, 2] = -10
+
+    return floor_hull([], np.concatenate([points, projected]))
+
+
+def polyline(point_list):
+    return np.asarray(point_list, dtype=float)[:, :2]
+
+
+def extrude_poly(outer_poly, inner_polys=None, height=1):
+    contours = [outer_poly]
+    if inner_polys is not None:
+        contours.extend(inner_polys)
+    return mf.Manifold.extrude(mf.CrossSection(contours, mf.FillRule.EvenOdd), height)
+
+
+def section_outlines(shape, height=0.0):
+    # Outlines of the cut through shape at z = height, as (N, 2) arrays.
+    return [np.asarray(polygon) for polygon in shape.slice(height).to_polygons()]
+
+
+def outline_points(outline):
+    return outline
+
+
+def serialize_shape(shape):
+    # Vertices and triangles, a Manifold itself does not pickle.
+    if shape is None:
+        return None
+    mesh = shape.to_mesh64()
+    return pickle.dumps((np.asarray(mesh.vert_properties)[:, :3].copy(), np.asarray(mesh.tri_verts).copy()))
+
+
+def deserialize_shape(data):
+    if data is None:
+        return None
+    vertices, triangles = pickle.loads(data)
+    return mf.Manifold(mf.Mesh64(
+        np.ascontiguousarray(vertices, dtype=np.float64), np.ascontiguousarray(triangles, dtype=np.uint64)
+    ))
+
+
+def read_stl(fname):
+    # Triangles of a binary or ASCII STL as an (N, 3, 3) array.
+    with open(fname, mode='rb') as fid:
+        data = fid.read()
+    if len(data) >= 84:
+        count = struct.unpack('<I', data[80:84])[0]
+        if len(data) == 84 + 50 * count:
+            records = np.frombuffer(data, dtype=np.dtype([
+                ('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')
+            ]), count=count, offset=84)
+            return records['vertices'].astype(float)
+
+    values = [line.split()[1:] for line in data.decode(errors='ignore').splitlines() if line.strip().startswith('vertex')]
+    return np.array(values, dtype=float).reshape(-1, 3, 3)
+
+
+# Parts library, every STL file is parsed at most once per process.
+parts_library = {}
+
+
+def load_part(fname):
+    print("IMPORTING FROM {}".format(fname))
+    triangles = read_stl(fname)
+    # STL repeats every vertex per triangle, merge them back so the mesh is closed.
+    vertices, indices = np.unique(triangles.reshape(-1, 3).round(6), axis=0, return_inverse=True)
+    shape = mf.Manifold(mf.Mesh64(
+        np.ascontiguousarray(vertices), np.ascontiguousarray(indices.reshape(-1, 3), dtype=np.uint64)
+    ))
+    if shape.status() != mf.Error.NoError:
+        print("UNABLE TO LOAD {} AS A CLOSED MESH: {}".format(fname, shape.status()))
+    return shape
+
+
+def import_file(fname, convexity=None):
+    fname = os.path.abspath(fname + ".stl")
+    if fname not in parts_library:
+        parts_library[fname] = load_part(fname)
+    # Manifolds are immutable, the library copy can be shared by every caller.
+    return parts_library[fname]
+
+
+def mesh_triangles(shape):
+    mesh = shape.to_mesh64()
+    return np.asarray(mesh.vert_properties)[:, :3], np.asarray(mesh.tri_verts)
+
+
+def write_stl(shape, fname):
+    vertices, triangles = mesh_triangles(shape)
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+    records = np.zeros(len(triangles), dtype=np.dtype([
+        ('normal', '<f4', 3), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')
+    ]))
+    records['normal'] = normals
+    records['vertices'] = corners
+    with open(fname, mode='wb') as fid:
+        fid.write(b'dactyl_manuform'.ljust(80, b' '))
+        fid.write(struct.pack('<I', len(triangles)))
+        fid.write(records.tobytes())
+
+
+def write_3mf(shape, fname):
+    vertices, triangles = mesh_triangles(shape)
+    model = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<model unit="millimeter" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">',
+        '<resources><object id="1" type="model"><mesh><vertices>',
+        ''.join('<vertex x="{:.6f}" y="{:.6f}" z="{:.6f}"/>'.format(*vertex) for vertex in vertices),
+        '</vertices><triangles>',
+        ''.join('<triangle v1="{}" v2="{}" v3="{}"/>'.format(*triangle) for triangle in triangles),
+        '</triangles></mesh></object></resources>',
+        '<build><item objectid="1"/></build>',
+        '</model>',
+    ]
+    with zipfile.ZipFile(fname, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+            '</Types>'
+        ))
+        archive.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+            'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+            '</Relationships>'
+        ))
+        archive.writestr('3D/3dmodel.model', '\n'.join(model))
+
+
+def export_file(shape, fname):
+    fname = fname + "." + engine_options['mesh_format']
+    print("EXPORTING TO {}".format(fname))
+    if engine_options['mesh_format'] == '3mf':
+        write_3mf(shape, fname)
+    else:
+        write_stl(shape, fname)
+
+
+def export_dxf(shape, fname):
+    # Outline of the shape seen from above, as DXF line segments.
+    print("EXPORTING TO {}".format(fname))
+    lines = ['0', 'SECTION', '2', 'ENTITIES']
+    # project() can leave self-intersecting outlines, the Positive fill rule cleans them up.
+    for polygon in mf.CrossSection(shape.project().to_polygons(), mf.FillRule.Positive).to_polygons():
+        polygon = np.asarray(polygon)
+        for start, end in zip(polygon, np.roll(polygon, -1, axis=0)):
+            lines.extend([
+                '0', 'LINE', '8', '0',
+                '10', '{:.6f}'.format(start[0]), '20', '{:.6f}'.format(start[1]), '30', '0.0',
+                '11', '{:.6f}'.format(end[0]), '21', '{:.6f}'.format(end[1]), '31', '0.0',
+            ])
+    lines.extend(['0', 'ENDSEC', '0', 'EOF'])
+    with open(fname + ".dxf", mode='w') as fid:
+        fid.write('\n'.join(lines) + '\n')
@@ -0,0 +1,514 @@
+from scipy.spatial import ConvexHull as sphull
+import numpy as np
+import os
+
+from brep_io import compound_items, deserialize_shape, import_part, make_compound, serialize_shape
+from convex_hull import PointCloud, clip_points, hull_facets, rotation_matrix
+
+from OCP.BRep import BRep_Tool
+from OCP.BRepAdaptor import BRepAdaptor_Curve
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Common, BRepAlgoAPI_Cut, BRepAlgoAPI_Fuse, BRepAlgoAPI_Section
+from OCP.BRepBndLib import BRepBndLib
+from OCP.BRepBuilderAPI import (
+    BRepBuilderAPI_MakeFace, BRepBuilderAPI_MakePolygon, BRepBuilderAPI_Sewing, BRepBuilderAPI_Transform
+)
+from OCP.BRepFilletAPI import BRepFilletAPI_MakeChamfer
+from OCP.BRepGProp import BRepGProp_Face
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCone, BRepPrimAPI_MakeCylinder
+from OCP.BRepPrimAPI import BRepPrimAPI_MakeHalfSpace, BRepPrimAPI_MakePrism, BRepPrimAPI_MakeSphere
+from OCP.BRepTools import BRepTools, BRepTools_WireExplorer
+from OCP.Bnd import Bnd_Box
+from OCP.GCPnts import GCPnts_TangentialDeflection
+from OCP.GeomAbs import GeomAbs_Line
+from OCP.Interface import Interface_Static
+from OCP.Message import Message, Message_Gravity
+from OCP.STEPControl import STEPControl_AsIs, STEPControl_Writer
+from OCP.ShapeAnalysis import ShapeAnalysis_FreeBounds
+from OCP.ShapeFix import ShapeFix_Face, ShapeFix_Solid
+from OCP.ShapeUpgrade import ShapeUpgrade_UnifySameDomain
+from OCP.TopAbs import TopAbs_EDGE, TopAbs_FACE, TopAbs_REVERSED, TopAbs_SOLID, TopAbs_VERTEX
+from OCP.TopExp import TopExp, TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopTools import (
+    TopTools_HSequenceOfShape, TopTools_IndexedDataMapOfShapeListOfShape, TopTools_IndexedMapOfShape,
+    TopTools_ListOfShape
+)
+from OCP.TopoDS import TopoDS, TopoDS_Compound, TopoDS_Shape, TopoDS_Wire
+from OCP.gp import gp_Ax2, gp_Dir, gp_Pln, gp_Pnt, gp_Trsf, gp_Vec
+
+
+# The cadquery engine without cadquery: every helper takes and returns a bare TopoDS_Shape.  There is no
+# Workplane per call and no parent chain, an intermediate solid is freed as soon as nothing refers to it.
+
+debug_trace = False
+
+# Only failures from OCCT, as cadquery sets it on import: STEPControl_Writer would print its transfer statistics.
+for printer in Message.DefaultMessenger_s().Printers():
+    printer.SetTraceLevel(Message_Gravity.Message_Fail)
+
+engine_options = {
+    'cache_dir': os.path.join('.', '.cache'),  # on-disk BRep copies of imported parts, shared with cadquery
+    'union_mode': 'NARY',  # 'NARY' = single general fuse, 'TREE' = pairwise reduction, 'FOLD' = one at a time
+}
+
+# Segments per full circle where a curved outline has to become a polygon (outline_points(), export_dxf()).
+sphere_segments = 100
+
+
+def configure_engine(**options):
+    engine_options.update(options)
+
+
+def debugprint(info):
+    if debug_trace:
+        print(info)
+
+
+def box(width, height, depth):
+    return BRepPrimAPI_MakeBox(gp_Pnt(-width / 2, -height / 2, -depth / 2), width, height, depth).Shape()
+
+
+def box_points(width, height, depth):
+    # The 8 corners of box(width, height, depth).
+    corners = np.array(np.meshgrid([-.5, .5], [-.5, .5], [-.5, .5], indexing='ij')).reshape(3, -1).T
+    return PointCloud(corners * (width, height, depth))
+
+
+def solid_shape(shape):
+    if isinstance(shape, PointCloud):
+        return hull_from_points(shape.points)
+    return shape
+
+
+def sub_shapes(shape, shape_type):
+    # Distinct sub-shapes, the same face reached through two solids counts once.
+    shape_map = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_s(shape, shape_type, shape_map)
+    return [shape_map.FindKey(i) for i in range(1, shape_map.Extent() + 1)]
+
+
+def shape_points(shape):
+    if isinstance(shape, PointCloud):
+        return shape.points
+    points = [BRep_Tool.Pnt_s(TopoDS.Vertex_s(item)) for item in sub_shapes(shape, TopAbs_VERTEX)]
+    return np.array([(point.X(), point.Y(), point.Z()) for point in points]).reshape(-1, 3)
+
+
+def face_count(shape):
+    if isinstance(shape, TopoDS_Shape):
+        return len(sub_shapes(shape, TopAbs_FACE))
+    return None
+
+
+def solid_count(shape):
+    if isinstance(shape, TopoDS_Shape):
+        return len(sub_shapes(shape, TopAbs_SOLID))
+    return None
+
+
+def cylinder(radius, height, segments=100):
+    return translate(BRepPrimAPI_MakeCylinder(radius, height).Shape(), (0, 0, -height / 2))
+
+
+def sphere(radius):
+    return BRepPrimAPI_MakeSphere(radius).Shape()
+
+
+def cone(r1, r2, height):
+    return BRepPrimAPI_MakeCone(r1, r2, height).Shape()
+
+
+def placed(shape, trsf):
+    # The geometry is copied, as cadquery does.  Only moving the shape's location shares the geometry, but
+    # the booleans then pay for the location on every access and the build gets slower overall.
+    return BRepBuilderAPI_Transform(shape, trsf, True).Shape()
+
+
+def rotate(shape, angle):
+    if shape is None:
+        return None
+    if isinstance(shape, PointCloud):
+        return PointCloud(shape.points @ rotation_matrix(angle).T)
+    trsf = gp_Trsf()
+    trsf.SetValues(*[float(value) for value in np.hstack([rotation_matrix(angle), np.zeros((3, 1))]).flatten()])
+    return placed(shape, trsf)
+
+
+def translate(shape, vector):
+    if shape is None:
+        return None
+    if isinstance(shape, PointCloud):
+        return PointCloud(shape.points + np.asarray(vector, dtype=float))
+    trsf = gp_Trsf()
+    trsf.SetTranslation(gp_Vec(*[float(value) for value in vector]))
+    return placed(shape, trsf)
+
+
+def transform(shape, matrix):
+    if shape is None:
+        return None
+    if isinstance(shape, PointCloud):
+        matrix = np.asarray(matrix, dtype=float)
+        return PointCloud(shape.points @ matrix[:3, :3].T + matrix[:3, 3])
+    trsf = gp_Trsf()
+    trsf.SetValues(*[float(value) for value in np.asarray(matrix)[:3, :4].flatten()])
+    return placed(shape, trsf)
+
+
+def mirror(shape, plane=None):
+    debugprint('mirror()')
+    normals = {
+        'XY': (0, 0, 1), 'YX': (0, 0, 1),
+        'XZ': (0, 1, 0), 'ZX': (0, 1, 0),
+        'YZ': (1, 0, 0), 'ZY': (1, 0, 0),
+    }
+    normal = normals[plane or 'XY']
+    if isinstance(shape, PointCloud):
+        return PointCloud(shape.points * (1 - 2 * np.array(normal)))
+    trsf = gp_Trsf()
+    trsf.SetMirror(gp_Ax2(gp_Pnt(0, 0, 0), gp_Dir(*normal)))
+    return placed(shape, trsf)
+
+
+def clean(shape):
+    upgrader = ShapeUpgrade_UnifySameDomain(shape, True, True, True)
+    upgrader.AllowInternalEdges(False)
+    upgrader.Build()
+    return upgrader.Shape()
+
+
+def shape_list(shapes):
+    items = TopTools_ListOfShape()
+    for item in shapes:
+        items.Append(item)
+    return items
+
+
+def boolean(operation, arguments, tools):
+    operation.SetArguments(shape_list(arguments))
+    operation.SetTools(shape_list(tools))
+    operation.SetRunParallel(True)
+    operation.Build()
+    return clean(operation.Shape())
+
+
+def solids(shape):
+    return sub_shapes(shape, TopAbs_SOLID)
+
+
+def fuse_all(shapes):
+    # All operands in one BRepAlgoAPI_Fuse.
+    tools = []
+    for item in shapes[1:]:
+        items = solids(item)
+        if len(items) < 1:
+            raise ValueError("Shape must have at least one solid to union!")
+        tools.extend(items)
+    return boolean(BRepAlgoAPI_Fuse(), [shapes[0]], tools)
+
+
+def union(shapes, mode=None):
+    debugprint('union()')
+    shapes = [solid_shape(item) for item in shapes if item is not None]
+    if len(shapes) == 0:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+
+    if mode is None:
+        mode = engine_options['union_mode']
+
+    if mode == 'NARY':
+        return fuse_all(shapes)
+
+    if mode == 'TREE':
+        # Balanced pairwise reduction, each boolean works on operands of similar size.
+        while len(shapes) > 1:
+            shapes = [
+                boolean(BRepAlgoAPI_Fuse(), [shapes[i]], [shapes[i + 1]]) if i + 1 < len(shapes) else shapes[i]
+                for i in range(0, len(shapes), 2)
+            ]
+        return shapes[0]
+
+    shape = shapes[0]
+    for item in shapes[1:]:
+        shape = boolean(BRepAlgoAPI_Fuse(), [shape], [item])
+    return shape
+
+
+def add(shapes):
+    debugprint('union()')
+    # Parts side by side in one compound, nothing is fused.
+    items = []
+    for item in shapes:
+        if item is not None:
+            item = solid_shape(item)
+            if isinstance(item, TopoDS_Compound):
+                items.extend(compound_items(item))
+            else:
+                items.append(item)
+    if len(items) == 0:
+        return None
+    if len(items) == 1:
+        return items[0]
+    return make_compound(items)
+
+
+# Running totals for difference(), 'culled' counts tools dropped because their bounding box misses the target.
+difference_stats = {'calls': 0, 'tools': 0, 'culled': 0}
+
+
+def bounding_box(shape):
+    bbox = Bnd_Box()
+    BRepBndLib.AddOptimal_s(shape, bbox)
+    return bbox.Get()
+
+
+def boxes_overlap(box1, box2, tol=1e-3):
+    return all(box1[i] - tol <= box2[i + 3] and box2[i] - tol <= box1[i + 3] for i in range(3))
+
+
+def difference(shape, shapes):
+    debugprint('difference()')
+    shape = solid_shape(shape)
+    tools = []
+    for item in shapes:
+        item = solid_shape(item)
+        if isinstance(item, TopoDS_Compound):
+            tools.extend(compound_items(item))
+        elif item is not None:
+            tools.append(item)
+    if len(tools) == 0:
+        return shape
+
+    target_box = bounding_box(shape)
+    kept = [tool for tool in tools if boxes_overlap(target_box, bounding_box(tool))]
+
+    difference_stats['calls'] += 1
+    difference_stats['tools'] += len(tools)
+    difference_stats['culled'] += len(tools) - len(kept)
+    debugprint('difference() {} tools, {} culled'.format(len(tools), len(tools) - len(kept)))
+
+    if len(kept) == 0:
+        return shape
+    # Every tool in one BRepAlgoAPI_Cut, the target is only rebuilt once.
+    return boolean(BRepAlgoAPI_Cut(), [shape], kept)
+
+
+def clip_below(shape, height=0.0):
+    # shape without what lies below z = height.  Nothing to do when it is all above, walls built with
+    # floor_hull() and bottom_hull() stop at the floor already.
+    if shape is None:
+        return None
+    shape = solid_shape(shape)
+    if bounding_box(shape)[2] >= height - 1e-6:
+        return shape
+    face = BRepBuilderAPI_MakeFace(gp_Pln(gp_Pnt(0, 0, height), gp_Dir(0, 0, 1))).Face()
+    below = BRepPrimAPI_MakeHalfSpace(face, gp_Pnt(0, 0, height - 1)).Solid()
+    return boolean(BRepAlgoAPI_Cut(), [shape], [below])
+
+
+def intersect(shape1, shape2):
+    if shape2 is not None:
+        return boolean(BRepAlgoAPI_Common(), [solid_shape(shape1)], [solid_shape(shape2)])
+    else:
+        return shape1
+
+
+def chamfer_top(shape, length, length2=None):
+    # Chamfers every edge of the faces pointing straight up, as cadquery's faces("+Z").chamfer().
+    edge_faces = TopTools_IndexedDataMapOfShapeListOfShape()
+    TopExp.MapShapesAndAncestors_s(shape, TopAbs_EDGE, TopAbs_FACE, edge_faces)
+
+    edges = TopTools_IndexedMapOfShape()
+    for face in sub_shapes(shape, TopAbs_FACE):
+        face = TopoDS.Face_s(face)
+        surface = BRepGProp_Face(face)
+        u_min, u_max, v_min, v_max = surface.Bounds()
+        point, normal = gp_Pnt(), gp_Vec()
+        surface.Normal((u_min + u_max) / 2, (v_min + v_max) / 2, point, normal)
+        if normal.Magnitude() > 0 and normal.Normalized().Z() > 1 - 1e-4:
+            TopExp.MapShapes_s(face, TopAbs_EDGE, edges)
+
+    chamfer = BRepFilletAPI_MakeChamfer(shape)
+    for i in range(1, edges.Extent() + 1):
+        edge = TopoDS.Edge_s(edges.FindKey(i))
+        chamfer.Add(length, length2 or length, edge, TopoDS.Face_s(edge_faces.FindFromKey(edge).First()))
+    return chamfer.Shape()
+
+
+def polygon_wire(points):
+    if isinstance(points, TopoDS_Wire):
+        return points
+    polygon = BRepBuilderAPI_MakePolygon()
+    for point in points:
+        polygon.Add(gp_Pnt(*point))
+    polygon.Close()
+    return polygon.Wire()
+
+
+def hull_from_points(points):
+    # debugprint('hull_from_points()')
+    hull_calc = sphull(points)
+
+    # The facets are already merged, so unlike cadquery there is no clean() afterwards.  Sewing orients the
+    # faces consistently and SolidFromShell turns the result outward if needed.
+    sewing = BRepBuilderAPI_Sewing()
+    for facet in hull_facets(hull_calc):
+        sewing.Add(BRepBuilderAPI_MakeFace(polygon_wire(hull_calc.points[facet].tolist()), True).Face())
+    sewing.Perform()
+
+    return ShapeFix_Solid().SolidFromShell(TopoDS.Shell_s(sewing.SewedShape()))
+
+
+def hull_from_shapes(shapes, points=None):
+    # debugprint('hull_from_shapes()')
+    vertices = [shape_points(shape) for shape in shapes]
+    if points is not None:
+        vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+
+    shape = hull_from_points(np.concatenate(vertices))
+    return shape
+
+
+def tess_hull(shapes, sl_tol=.5, sl_angTol=1):
+    # debugprint('hull_from_shapes()')
+    vertices = []
+    for shape in shapes:
+        for item in solids(shape):
+            if not BRepTools.Triangulation_s(item, sl_tol, sl_angTol):
+                BRepMesh_IncrementalMesh(item, sl_tol, True, sl_angTol)
+            explorer = TopExp_Explorer(item, TopAbs_FACE)
+            while explorer.More():
+                location = TopLoc_Location()
+                triangulation = BRep_Tool.Triangulation_s(TopoDS.Face_s(explorer.Current()), location)
+                if triangulation is not None:
+                    trsf = location.Transformation()
+                    for i in range(1, triangulation.NbNodes() + 1):
+                        point = triangulation.Node(i).Transformed(trsf)
+                        vertices.append((point.X(), point.Y(), point.Z()))
+                explorer.Next()
+
+    shape = hull_from_points(np.array(vertices))
+    return shape
+
+
+def triangle_hulls(shapes):
+    debugprint('triangle_hulls()')
+    hulls = []
+    for i in range(len(shapes) - 2):
+        hulls.append(hull_from_shapes(shapes[i: (i + 3)]))
+
+    return union(hulls)
+
+
+def floor_hull(shapes, points=None, floor=0.0):
+    # hull_from_shapes() cut off below z = floor, None when nothing is above it.
+    vertices = [shape_points(shape) for shape in shapes]
+    if points is not None:
+        vertices.append(np.asarray(points, dtype=float).reshape(-1, 3))
+    vertices = clip_points(np.concatenate(vertices), floor)
+    if len(vertices) == 0:
+        return None
+    return hull_from_points(vertices)
+
+
+def bottom_hull(p, height=0.001):
+    debugprint("bottom_hull()")
+    # The hull of every vertex of p and its drop to z = -10, cut off at the floor (z = 0).
+    if len(p) == 0:
+        return None
+    points = np.concatenate([shape_points(item) for item in p])
+    projected = points.copy()
+    projected[:, 2] = -10
+
+    return floor_hull([], np.concatenate([points, projected]))
+
+
+def polyline(point_list):
+    # Points on z = 0, without the repeated first point that closes the outline.
+    points = [(float(point[0]), float(point[1]), 0.0) for point in point_list]
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+
+def extrude_poly(outer_poly, inner_polys=None, height=1):
+    face_builder = BRepBuilderAPI_MakeFace(polygon_wire(outer_poly), True)
+    if inner_polys is not None:
+        for item in inner_polys:
+            face_builder.Add(polygon_wire(item))
+    # Holes need the opposite winding to the outline, ShapeFix_Face sorts that out.
+    fix = ShapeFix_Face(face_builder.Face())
+    fix.FixOrientation()
+    fix.Perform()
+    return BRepPrimAPI_MakePrism(fix.Result(), gp_Vec(0, 0, height)).Shape()
+
+
+def section_outlines(shape, height=0.0):
+    # Closed wires of the cut through shape at z = height.
+    section = BRepAlgoAPI_Section(shape, gp_Pln(gp_Pnt(0, 0, height), gp_Dir(0, 0, 1)), False)
+    section.Build()
+
+    edges = TopTools_HSequenceOfShape()
+    for item in sub_shapes(section.Shape(), TopAbs_EDGE):
+        edges.Append(item)
+    wires = TopTools_HSequenceOfShape()
+    ShapeAnalysis_FreeBounds.ConnectEdgesToWires_s(edges, 1e-6, False, wires)
+    return [TopoDS.Wire_s(wires.Value(i)) for i in range(1, wires.Length() + 1)]
+
+
+def outline_points(outline):
+    # An outline as an (N, 2) array of points in order around it, curved edges as polygons.
+    points = []
+    explorer = BRepTools_WireExplorer(outline)
+    while explorer.More():
+        edge = explorer.Current()
+        curve = BRepAdaptor_Curve(edge)
+        if curve.GetType() == GeomAbs_Line:
+            edge_points = [curve.Value(curve.FirstParameter()), curve.Value(curve.LastParameter())]
+        else:
+            division = GCPnts_TangentialDeflection(
+                curve, curve.FirstParameter(), curve.LastParameter(), 2 * np.pi / sphere_segments, 1e-2
+            )
+            edge_points = [division.Value(i) for i in range(1, division.NbPoints() + 1)]
+        edge_points = [(point.X(), point.Y()) for point in edge_points]
+        if edge.Orientation() == TopAbs_REVERSED:
+            edge_points.reverse()
+        # The last point starts the next edge.
+        points.extend(edge_points[:-1])
+        explorer.Next()
+    return np.array(points)
+
+
+def import_file(fname, convexity=None):
+    return add(import_part(fname + ".step", engine_options['cache_dir']))
+
+
+def export_file(shape, fname):
+    print("EXPORTING TO {}".format(fname))
+    writer = STEPControl_Writer()
+    Interface_Static.SetIVal_s("write.surfacecurve.mode", 1)
+    Interface_Static.SetIVal_s("write.precision.mode", 0)
+    Interface_Static.SetCVal_s("xstep.cascade.unit", "MM")
+    Interface_Static.SetCVal_s("write.step.unit", "MM")
+    writer.Transfer(solid_shape(shape), STEPControl_AsIs)
+    writer.Write(fname + ".step")
+
+
+def export_dxf(shape, fname):
+    # Footprint of the shape, cut just above its underside, as DXF line segments.
+    print("EXPORTING TO {}".format(fname))
+    lines = ['0', 'SECTION', '2', 'ENTITIES']
+    for outline in section_outlines(shape, bounding_box(shape)[2] + 1e-3):
+        polygon = outline_points(outline)
+        for start, end in zip(polygon, np.roll(polygon, -1, axis=0)):
+            lines.extend([
+                '0', 'LINE', '8', '0',
+                '10', '{:.6f}'.format(start[0]), '20', '{:.6f}'.format(start[1]), '30', '0.0',
+                '11', '{:.6f}'.format(end[0]), '21', '{:.6f}'.format(end[1]), '31', '0.0',
+            ])
+    lines.extend(['0', 'ENDSEC', '0', 'EOF'])
+    with open(fname + ".dxf", mode='w') as fid:
+        fid.write('\n'.join(lines) + '\n')
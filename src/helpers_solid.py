@@ -1,15 +1,41 @@
 import solid as sl
+import pickle
 
 debug_trace = False
 
+engine_options = {
+    'cache_dir': None,  # OpenSCAD loads the STL files itself, nothing is cached here
+    'union_mode': 'NARY',  # 'NARY' = one flat union(), 'TREE' = balanced nesting, 'FOLD' = nested one at a time
+}
+
+
+def configure_engine(**options):
+    engine_options.update(options)
+
+
 def debugprint(info):
     if debug_trace:
         print(info)
 
+
+def face_count(shape):
+    # OpenSCAD objects are only a CSG tree until rendered.
+    return None
+
+
+def solid_count(shape):
+    return None
+
+
 def box(width, height, depth):
     return sl.cube([width, height, depth], center=True)
 
 
+def box_points(width, height, depth):
+    # OpenSCAD hulls the cube itself, there is nothing to gain from handing it the corners.
+    return box(width, height, depth)
+
+
 def cylinder(radius, height, segments=100):
     return sl.cylinder(r=radius, h=height, segments=segments, center=True)
 
@@ -34,6 +60,12 @@ def translate(shape, vector):
     return sl.translate(tuple(vector))(shape)
 
 
+def transform(shape, matrix):
+    if shape is None:
+        return None
+    return sl.multmatrix(m=[[float(value) for value in row] for row in matrix])(shape)
+
+
 def mirror(shape, plane=None):
     debugprint('mirror()')
     planes = {
@@ -47,15 +79,31 @@ def mirror(shape, plane=None):
     return sl.mirror(planes[plane])(shape)
 
 
-def union(shapes):
+def union(shapes, mode=None):
     debugprint('union()')
-    shape = None
-    for item in shapes:
-        if item is not None:
-            if shape is None:
-                shape = item
-            else:
-                shape += item
+    shapes = [item for item in shapes if item is not None]
+    if len(shapes) == 0:
+        return None
+    if len(shapes) == 1:
+        return shapes[0]
+
+    if mode is None:
+        mode = engine_options['union_mode']
+
+    if mode == 'NARY':
+        return sl.union()(*shapes)
+
+    if mode == 'TREE':
+        while len(shapes) > 1:
+            shapes = [
+                shapes[i] + shapes[i + 1] if i + 1 < len(shapes) else shapes[i]
+                for i in range(0, len(shapes), 2)
+            ]
+        return shapes[0]
+
+    shape = shapes[0]
+    for item in shapes[1:]:
+        shape += item
     return shape
 
 
@@ -71,12 +119,30 @@ def add(shapes):
     return shape
 
 
+# Running totals for difference(), OpenSCAD has no geometry to cull against so 'culled' stays 0.
+difference_stats = {'calls': 0, 'tools': 0, 'culled': 0}
+
+
 def difference(shape, shapes):
     debugprint('difference()')
-    for item in shapes:
-        if item is not None:
-            shape -= item
-    return shape
+    tools = [item for item in shapes if item is not None]
+    if len(tools) == 0:
+        return shape
+
+    difference_stats['calls'] += 1
+    difference_stats['tools'] += len(tools)
+    return sl.difference()(shape, *tools)
+
+
+def clip_below(shape, height=0.0):
+    # shape without what lies below z = height, OpenSCAD has no half-space so a block larger than any case.
+    # A difference() takes the block as one more tool rather than nesting another difference() around it.
+    if shape is None:
+        return None
+    block = translate(box(350, 350, 40), (0, 0, height - 20))
+    if shape.name == 'difference':
+        return sl.difference()(*shape.children, block)
+    return difference(shape, [block])
 
 
 def intersect(shape1, shape2):
@@ -112,6 +178,11 @@ def triangle_hulls(shapes):
 
 
 
+def floor_hull(shapes, points=None, floor=0.0):
+    # A CSG hull cannot be cut without a boolean, clip_below() trims what floor_hull() leaves below the floor.
+    return hull_from_shapes(shapes, points)
+
+
 def bottom_hull(p, height=0.001):
     debugprint("bottom_hull()")
     shape = None
@@ -142,6 +213,15 @@ def extrude_poly(outer_poly, inner_polys=None, height=1):
         return sl.linear_extrude(height=height, twist=0, convexity=0, center=True)(outer_poly)
 
 
+def serialize_shape(shape):
+    # SolidPython trees are plain Python objects, pickling is enough to hand them between processes.
+    return pickle.dumps(shape)
+
+
+def deserialize_shape(data):
+    return pickle.loads(data)
+
+
 def import_file(fname, convexity=2):
     print("IMPORTING FROM {}".format(fname))
     return sl.import_stl(fname.replace("\\", "/") + ".stl", convexity=convexity)
@@ -0,0 +1,186 @@
+import ast
+import copy
+import inspect
+import json
+import os.path as path
+import textwrap
+
+import numpy as np
+
+import generate_configuration as cfg
+
+
+# Every configurable value, including the ones an OLED mount configuration injects.
+CONFIG_FIELDS = tuple(cfg.shape_config) + tuple(sorted(
+    {item for oled in cfg.shape_config['oled_configurations'].values() for item in oled} - set(cfg.shape_config)
+))
+
+# Fields only an OLED mount configuration sets.
+OLED_FIELDS = CONFIG_FIELDS[len(cfg.shape_config):]
+
+# Values computed once from the configuration, readable like any other field.
+DERIVED_FIELDS = (
+    'save_path', 'parts_path',
+    'centerrow', 'lastrow', 'cornerrow', 'lastcol',
+    'keyswitch_height', 'keyswitch_width',
+    'mount_width', 'mount_height', 'mount_thickness', 'double_plate_height',
+    'cap_top_height', 'row_radius', 'column_radius', 'column_x_delta', 'column_base_angle',
+)
+
+# Type of each field as given by its default, None where the default does not pin one down.
+FIELD_TYPES = {
+    item: (None if value is None else type(value)) for item, value in cfg.shape_config.items()
+}
+
+
+def coerce(value, field_type):
+    # Lenient: only numbers are converted (e.g. a JSON 2 for a float field), anything else is kept as given.
+    if value is None or field_type is None or isinstance(value, field_type):
+        return value
+    if field_type is float and isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return float(value)
+    if field_type is int and isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return int(value)
+    if field_type is bool and isinstance(value, (int, np.integer)) and value in (0, 1):
+        return bool(value)
+    return value
+
+
+class KeyboardConfig:
+    # One keyboard configuration: shape_config defaults, then data, then keyword overrides.
+    # Unknown keys are kept in extras so old configuration files keep working.
+    __slots__ = CONFIG_FIELDS + DERIVED_FIELDS + ('extras',)
+
+    def __init__(self, data=None, **overrides):
+        for item in self.__slots__:
+            setattr(self, item, None)
+        self.extras = {}
+
+        values = copy.deepcopy(cfg.shape_config)
+        if data is not None:
+            values.update(copy.deepcopy(data))
+        values.update(copy.deepcopy(overrides))
+        for item, value in values.items():
+            if item in CONFIG_FIELDS:
+                setattr(self, item, coerce(value, FIELD_TYPES.get(item)))
+            else:
+                self.extras[item] = value
+
+        self.derive()
+
+    @classmethod
+    def from_file(cls, file_name, **overrides):
+        with open(file_name, mode='r') as fid:
+            return cls(json.load(fid), **overrides)
+
+    def derive(self):
+        if self.save_dir in ['', None, '.']:
+            self.save_path = path.join(r"..", "things")
+            self.parts_path = path.join(r"..", "src", "parts")
+        else:
+            self.save_path = path.join(r"..", "things", self.save_dir)
+            self.parts_path = path.join(r"..", r"..", "src", "parts")
+
+        if self.oled_mount_type is not None and self.oled_mount_type != "NONE":
+            for item, value in self.oled_configurations[self.oled_mount_type].items():
+                setattr(self, item, value)
+
+        if self.nrows > 5:
+            self.column_style = self.column_style_gt5
+
+        self.centerrow = self.nrows - self.centerrow_offset
+
+        self.lastrow = self.nrows - 1
+        if self.reduced_outer_cols > 0 or self.reduced_inner_cols > 0:
+            self.cornerrow = self.lastrow - 1
+        else:
+            self.cornerrow = self.lastrow
+        self.lastcol = self.ncols - 1
+
+        if self.plate_style in ['NUB', 'HS_NUB']:
+            self.keyswitch_height = self.nub_keyswitch_height
+            self.keyswitch_width = self.nub_keyswitch_width
+        elif self.plate_style in ['UNDERCUT', 'HS_UNDERCUT', 'NOTCH', 'HS_NOTCH']:
+            self.keyswitch_height = self.undercut_keyswitch_height
+            self.keyswitch_width = self.undercut_keyswitch_width
+        else:
+            self.keyswitch_height = self.hole_keyswitch_height
+            self.keyswitch_width = self.hole_keyswitch_width
+
+        if 'HS_' in self.plate_style:
+            self.symmetry = "asymmetric"
+            self.plate_file = path.join(self.parts_path, r"hot_swap_plate")
+            self.plate_offset = 0.0
+
+        if (self.trackball_in_wall or ('TRACKBALL' in self.thumb_style)) and not self.ball_side == 'both':
+            self.symmetry = "asymmetric"
+
+        self.mount_width = self.keyswitch_width + 2 * self.plate_rim
+        self.mount_height = self.keyswitch_height + 2 * self.plate_rim
+        self.mount_thickness = self.plate_thickness
+
+        if self.default_1U_cluster and self.thumb_style == 'DEFAULT':
+            self.double_plate_height = (.7 * self.sa_double_length - self.mount_height) / 3
+        elif self.thumb_style == 'DEFAULT':
+            self.double_plate_height = (.95 * self.sa_double_length - self.mount_height) / 3
+        else:
+            self.double_plate_height = (self.sa_double_length - self.mount_height) / 3
+
+        if self.oled_mount_type is not None and self.oled_mount_type != "NONE":
+            self.left_wall_x_offset = self.oled_left_wall_x_offset_override
+            self.left_wall_z_offset = self.oled_left_wall_z_offset_override
+            self.left_wall_lower_y_offset = self.oled_left_wall_lower_y_offset
+            self.left_wall_lower_z_offset = self.oled_left_wall_lower_z_offset
+
+        self.cap_top_height = self.plate_thickness + self.sa_profile_key_height
+        self.row_radius = ((self.mount_height + self.extra_height) / 2) / (np.sin(self.alpha / 2)) + self.cap_top_height
+        self.column_radius = (
+                                 ((self.mount_width + self.extra_width) / 2) / (np.sin(self.beta / 2))
+                             ) + self.cap_top_height
+        self.column_x_delta = -1 - self.column_radius * np.sin(self.beta)
+        self.column_base_angle = self.beta * (self.centercol - 2)
+
+    def as_dict(self):
+        # Field values by name, extras included, in the form the model module publishes as globals.
+        values = dict(self.extras)
+        for item in CONFIG_FIELDS + DERIVED_FIELDS:
+            values[item] = getattr(self, item)
+        return values
+
+
+def derived_sources():
+    # Configuration fields each value derive() sets can depend on, read off its source: the fields in the
+    # assigned expression and in every enclosing condition, with values set earlier in derive() expanded.
+    sources = {}
+
+    def fields(node):
+        found = set()
+        for item in ast.walk(node):
+            if isinstance(item, ast.Attribute) and isinstance(item.value, ast.Name) and item.value.id == 'self':
+                found |= sources.get(item.attr, {item.attr})
+        return found
+
+    def assign(item, value_fields, conditions):
+        if conditions:
+            # The value from before survives when the branch is not taken.
+            value_fields = value_fields | sources.get(item, {item})
+        sources[item] = conditions | value_fields
+
+    def visit(statements, conditions):
+        for statement in statements:
+            if isinstance(statement, ast.If):
+                test = conditions | fields(statement.test)
+                visit(statement.body, test)
+                visit(statement.orelse, test)
+            elif isinstance(statement, ast.For):
+                visit(statement.body, conditions | fields(statement.iter))
+            elif isinstance(statement, ast.Assign):
+                for target in statement.targets:
+                    assign(target.attr, fields(statement.value), conditions)
+            elif isinstance(statement, ast.Expr):
+                # setattr(self, item, value) in the OLED loop.
+                for item in OLED_FIELDS:
+                    assign(item, fields(statement.value), conditions)
+
+    visit(ast.parse(textwrap.dedent(inspect.getsource(KeyboardConfig.derive))).body[0].body, set())
+    return {item: set(found) & set(CONFIG_FIELDS) for item, found in sources.items()}
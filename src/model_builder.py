@@ -1,6 +1,8 @@
 import os
 import copy
-import importlib
+import time
+import traceback
+import multiprocessing
 from generate_configuration import *
 
 
@@ -79,25 +81,67 @@ def create_config(config_options):
 
 
 
-def build_release(base, configurations, engines=('solid', 'cadquery')):
-    init = True
+def build_variant(shape_config):
+    # Runs in a fresh worker process, the config goes to the dactyl_manuform bootstrap in memory.
+    import generate_configuration
+    generate_configuration.run_config = shape_config
+    # spawn hands this script's options to the worker, they are not for the dactyl_manuform bootstrap.  Its
+    # --jobs would override the variant's jobs = 1 and open a pool inside this daemonic worker.
+    del sys.argv[1:]
+
+    start = time.time()
+    try:
+        import dactyl_manuform
+        dactyl_manuform.run()
+        status = 'ok'
+        error = None
+    except Exception:
+        status = 'failed'
+        error = traceback.format_exc()
+
+    return {
+        'config_name': shape_config['config_name'],
+        'engine': shape_config['ENGINE'],
+        'status': status,
+        'seconds': time.time() - start,
+        'error': error,
+    }
+
+
+def build_release(base, configurations, engines=('solid', 'cadquery'), processes=None):
+    variants = []
     for config in configurations:
         shape_config = copy.deepcopy(base)
         for item in config:
             shape_config[item] = config[item]
-    
+
         for engine in engines:
-            shape_config['ENGINE'] = engine
-            with open('run_config.json', mode='w') as fid:
-                json.dump(shape_config, fid, indent=4)
-    
-            if init:
-                import dactyl_manuform as dactyl_manuform
-                dactyl_manuform.run()
-                init = False
-            else:
-                importlib.reload(dactyl_manuform)
-                dactyl_manuform.run()
+            variant = copy.deepcopy(shape_config)
+            variant['ENGINE'] = engine
+            # The release pool already uses every worker, keep each variant to a single process.
+            variant['jobs'] = 1
+            variants.append(variant)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    # One fresh interpreter per variant (spawn, maxtasksperchild=1), nothing carries over between builds.
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(processes=min(processes, len(variants)), maxtasksperchild=1) as pool:
+        for result in pool.imap_unordered(build_variant, variants):
+            print('{status:>6} {seconds:8.1f}s  {engine:<8} {config_name}'.format(**result))
+            results.append(result)
+
+    failed = [result for result in results if result['status'] != 'ok']
+    print('{} of {} variants built, {:.1f}s total build time'.format(
+        len(results) - len(failed), len(results), sum(result['seconds'] for result in results)
+    ))
+    for result in failed:
+        print('FAILED {} ({})'.format(result['config_name'], result['engine']))
+        print(result['error'])
+
+    return results
 
 if __name__ == '__main__':
     configurations = create_config(config_options)
@@ -105,4 +149,10 @@ if __name__ == '__main__':
     ENGINES = ['solid', 'cadquery']
     # ENGINES = ['solid']
 
-    build_release(base, configurations, ENGINES)
+    processes = None
+    opts, args = getopt.getopt(sys.argv[1:], "", ["jobs="])
+    for opt, arg in opts:
+        if opt in ('--jobs'):
+            processes = int(arg)
+
+    build_release(base, configurations, ENGINES, processes=processes)
@@ -0,0 +1,168 @@
+import glob
+import hashlib
+import inspect
+import os
+import sys
+import types
+
+import numpy as np
+
+
+def code_objects(code):
+    # A function's code plus every nested comprehension, lambda and inner function.
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from code_objects(const)
+
+
+def is_local(cls, home):
+    # A class defined in a module next to the home module, i.e. part of this code base, not of a library.
+    module = sys.modules.get(cls.__module__)
+    fname = getattr(module, '__file__', None)
+    return fname is not None and os.path.dirname(fname) == os.path.dirname(home.get('__file__') or '')
+
+
+def methods(cls):
+    # The functions behind a class's methods, static and class methods and properties.
+    for value in vars(cls).values():
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            yield from (item for item in (value.fget, value.fset) if isinstance(item, types.FunctionType))
+            continue
+        if isinstance(value, types.FunctionType):
+            yield value
+
+
+def global_reads(function):
+    # Globals of the function's module that it, or any function it reaches, can read, plus a digest of the
+    # source of every reached function and of every class of this code base it reaches.  Found from the
+    # bytecode, so this over-approximates: attribute names and string constants (for globals()['name']
+    # lookups) count as reads when a global has that name.
+    home = function.__globals__
+    reached = {}
+    reads = set()
+    pending = [inspect.unwrap(function)]
+    while pending:
+        fn = pending.pop()
+        if fn in reached:
+            continue
+        reached[fn] = '{}.{}'.format(fn.__module__, fn.__qualname__)
+        if isinstance(fn, type):
+            pending.extend(inspect.unwrap(method) for method in methods(fn))
+            continue
+        namespace = fn.__globals__
+        for code in code_objects(fn.__code__):
+            names = set(code.co_names) | {const for const in code.co_consts if isinstance(const, str)}
+            for name in names:
+                if name not in namespace:
+                    continue
+                value = namespace[name]
+                if isinstance(value, types.FunctionType):
+                    pending.append(inspect.unwrap(value))
+                elif isinstance(value, type) and is_local(value, home):
+                    pending.append(value)
+                elif namespace is home:
+                    reads.add(name)
+
+    digest = hashlib.sha256()
+    for fn, qualified_name in sorted(reached.items(), key=lambda item: item[1]):
+        digest.update(qualified_name.encode())
+        digest.update(inspect.getsource(fn).encode())
+    return reads, digest.hexdigest()
+
+
+file_digests = {}
+
+
+def file_digest(fname):
+    # sha256 of a file's content, hashed again only when its size or modification time changes.
+    stat = os.stat(fname)
+    key = fname, stat.st_size, stat.st_mtime_ns
+    if key not in file_digests:
+        with open(fname, mode='rb') as fid:
+            file_digests[key] = hashlib.sha256(fid.read()).hexdigest()
+    return file_digests[key]
+
+
+def file_tokens(value):
+    # (file name, content digest) of the files a string value can name: the files of a directory, or those
+    # named value.*, as part files are given without their extension (plate_file, import_file()).
+    if not isinstance(value, str) or value in ['', '.', '..']:
+        return []
+    if os.path.isdir(value):
+        files = [os.path.join(value, item) for item in os.listdir(value)]
+    else:
+        files = glob.glob(glob.escape(value) + '.*')
+    return [(os.path.basename(item), file_digest(item)) for item in sorted(files) if os.path.isfile(item)]
+
+
+def is_data(value):
+    # Plain values whose content can go into a cache key.  Dicts are left out, at module level they are caches.
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        return True
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in 'biuf'
+    if isinstance(value, (list, tuple)):
+        return all(is_data(item) for item in value)
+    return False
+
+
+def value_token(value):
+    # Canonical, hashable form of a value: numpy scalars compare equal to Python ones, arrays by content.
+    if isinstance(value, np.ndarray):
+        return 'ndarray', value.dtype.str, value.shape, value.tobytes()
+    if isinstance(value, np.generic):
+        return value_token(value.item())
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(value_token(item) for item in value)
+    if isinstance(value, dict):
+        return 'dict', tuple(sorted((repr(item), value_token(value[item])) for item in value))
+    return repr(value)
+
+
+def cache_key(*values):
+    return hashlib.sha256(repr(value_token(values)).encode()).hexdigest()
+
+
+def read_entry(cache_path, key):
+    fname = os.path.join(cache_path, key)
+    try:
+        with open(fname, mode='rb') as fid:
+            data = fid.read()
+        # Entries are evicted least recently used first, a hit counts as a use.
+        os.utime(fname, None)
+    except OSError:
+        return None
+    return data
+
+
+def write_entry(cache_path, key, data, max_bytes):
+    os.makedirs(cache_path, exist_ok=True)
+    fname = os.path.join(cache_path, key)
+    # Write to a temporary name first so concurrent builds never read a partial entry.
+    tmp_name = "{}.{}.tmp".format(fname, os.getpid())
+    with open(tmp_name, mode='wb') as fid:
+        fid.write(data)
+    os.replace(tmp_name, fname)
+    evict(cache_path, max_bytes)
+
+
+def evict(cache_path, max_bytes):
+    entries = []
+    for entry in os.scandir(cache_path):
+        if entry.is_file() and not entry.name.endswith('.tmp'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, fname in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(fname)
+        except FileNotFoundError:
+            # Another build evicted it first.
+            pass
+        total -= size